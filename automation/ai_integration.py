@@ -326,8 +326,19 @@ class AIAssistant:
         
         return self.provider.generate_code(prompt, context)
     
-    def fix_issue(self, error_description: str, code_context: str, project_context: Dict) -> str:
-        """Generate fix for a specific issue"""
+    def patch_instructions(self, file_path: str) -> str:
+        """Prompt instruction asking for a unified diff instead of a whole file"""
+        return (
+            f"Respond with ONLY a unified diff against {file_path} "
+            f"(headers \"--- a/{file_path}\" and \"+++ b/{file_path}\", 3 lines of context per hunk, no explanation)."
+        )
+    
+    def fix_issue(self, error_description: str, code_context: str, project_context: Dict, file_path: Optional[str] = None) -> str:
+        """Generate fix for a specific issue (a unified diff when file_path is given)"""
+        instructions = (
+            self.patch_instructions(file_path) if file_path
+            else "Provide the corrected code with explanation of what was fixed."
+        )
         prompt = f"""
         Fix this issue in the Prism Writing website:
         
@@ -338,13 +349,17 @@ class AIAssistant:
         
         Project context: {json.dumps(project_context)}
         
-        Provide the corrected code with explanation of what was fixed.
+        {instructions}
         """
         
         return self.provider.generate_code(prompt, project_context)
     
-    def enhance_feature(self, feature_description: str, current_code: str, enhancement_goals: List[str], context: Dict) -> str:
-        """Enhance an existing feature"""
+    def enhance_feature(self, feature_description: str, current_code: str, enhancement_goals: List[str], context: Dict, file_path: Optional[str] = None) -> str:
+        """Enhance an existing feature (a unified diff when file_path is given)"""
+        instructions = (
+            self.patch_instructions(file_path) if file_path
+            else "Provide the enhanced code with improvements clearly marked."
+        )
         prompt = f"""
         Enhance this feature: {feature_description}
         
@@ -356,7 +371,7 @@ class AIAssistant:
         
         Context: {json.dumps(context)}
         
-        Provide the enhanced code with improvements clearly marked.
+        {instructions}
         """
         
         return self.provider.generate_code(prompt, context)
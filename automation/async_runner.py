@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Async Command Runner for Prism Writing Development Automation
+
+This module runs the automator's git, npm and tool commands as asyncio
+subprocesses on one background event loop. Commands are argv lists started
+directly, with no /bin/sh in between, so quoting cannot break a commit
+message. stdout and stderr are read concurrently as streams.
+
+Every command can have a timeout and can be cancelled. On either, its whole
+process group is terminated, because npm and npx leave children behind.
+A semaphore bounds how many commands run at once. Pipeline stages on
+different threads, and batches submitted through gather(), then share the
+machine without oversubscribing it.
+
+Results are PrismStreamResult objects (a CompletedProcess), the same as
+stream_runner.run_streaming returns.
+"""
+
+import os
+import codecs
+import signal
+import asyncio
+import threading
+import subprocess
+from collections import deque
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from stream_runner import PrismStreamResult, parse_progress, MAX_TAIL_LINE_LENGTH
+
+# Seconds a terminated process group gets before it is killed
+TERMINATE_GRACE_SECONDS = 5
+
+# Bytes read from a pipe at a time; lines may be longer than this
+READ_CHUNK = 64 * 1024
+
+_runners: Dict[int, "PrismCommandRunner"] = {}
+_runners_lock = threading.Lock()
+
+
+def default_concurrency() -> int:
+    """Like ThreadPoolExecutor: git and network-bound npm calls mostly wait, so allow more than the CPU count"""
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+class PrismCommandRunner:
+    """Bounded-concurrency asyncio subprocess runner with a sync facade"""
+
+    def __init__(self, max_concurrency: Optional[int] = None):
+        self.max_concurrency = max(1, max_concurrency or default_concurrency())
+        self.loop = asyncio.new_event_loop()
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.tasks = set()
+        self.ready = threading.Event()
+        self.thread = threading.Thread(target=self._run_loop, name="prism-command-runner", daemon=True)
+        self.thread.start()
+        self.ready.wait()
+
+    async def run_async(self, args: List[str], cwd, timeout: Optional[float] = None,
+                        log_file: Optional[Path] = None, tail_lines: Optional[int] = None,
+                        on_progress: Optional[Callable[[Dict], None]] = None,
+                        env: Optional[Dict[str, str]] = None) -> PrismStreamResult:
+        """Run one command on the loop once a concurrency slot is free
+
+        tail_lines=None keeps all output; otherwise only the last lines of
+        each stream are kept and the rest is only in log_file. Raises
+        subprocess.TimeoutExpired after timeout and asyncio.CancelledError
+        when cancelled, after terminating the process group either way.
+        """
+        args = [str(arg) for arg in args]
+        async with self.semaphore:
+            return await self._execute(args, cwd, timeout, log_file, tail_lines, on_progress, env)
+
+    def submit(self, args: List[str], cwd, **kwargs) -> Future:
+        """Start a command from any thread; future.cancel() stops it"""
+        return asyncio.run_coroutine_threadsafe(self._tracked(self.run_async(args, cwd, **kwargs)), self.loop)
+
+    def run(self, args: List[str], cwd, **kwargs) -> PrismStreamResult:
+        """Blocking run from a worker thread (the stage scheduler's or the main thread)"""
+        future = self.submit(args, cwd, **kwargs)
+        try:
+            return future.result()
+        except BaseException:
+            # KeyboardInterrupt and friends: do not leave the process running
+            future.cancel()
+            raise
+
+    def gather(self, commands: List[Dict], cwd) -> List:
+        """Run several commands at once (still bounded); returns results or exceptions in order
+
+        Each command is {"args": [...], plus any run_async keyword}.
+        """
+        futures = [
+            self.submit(command["args"], cwd, **{key: value for key, value in command.items() if key != "args"})
+            for command in commands
+        ]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except BaseException as e:
+                results.append(e)
+        return results
+
+    def cancel_all(self):
+        """Cancel every queued and running command"""
+        def cancel():
+            for task in list(self.tasks):
+                task.cancel()
+        self.loop.call_soon_threadsafe(cancel)
+
+    async def _tracked(self, coroutine):
+        task = asyncio.current_task()
+        self.tasks.add(task)
+        try:
+            return await coroutine
+        finally:
+            self.tasks.discard(task)
+
+    async def _execute(self, args, cwd, timeout, log_file, tail_lines, on_progress, env) -> PrismStreamResult:
+        if log_file is not None:
+            log_file = Path(log_file)
+            log_file.parent.mkdir(parents=True, exist_ok=True)
+
+        popen_kwargs = {}
+        if os.name == 'posix':
+            # Own process group, so npm/npx children are terminated with their parent
+            popen_kwargs["start_new_session"] = True
+        else:
+            popen_kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            cwd=str(cwd),
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            **popen_kwargs
+        )
+
+        log = open(log_file, 'w', encoding='utf-8', errors='replace') if log_file else None
+        tails = {"stdout": deque(maxlen=tail_lines), "stderr": deque(maxlen=tail_lines)}
+        counts = {"stdout": 0, "stderr": 0}
+
+        def handle_line(name: str, line: str):
+            counts[name] += 1
+            if log:
+                log.write(line + '\n')
+            if tail_lines is not None and len(line) > MAX_TAIL_LINE_LENGTH:
+                line = line[:MAX_TAIL_LINE_LENGTH] + ' …'
+            tails[name].append(line)
+            if on_progress:
+                progress = parse_progress(line)
+                if progress:
+                    on_progress(progress)
+
+        async def pump(name: str, stream: asyncio.StreamReader):
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            pending = ""
+            while True:
+                chunk = await stream.read(READ_CHUNK)
+                text = decoder.decode(chunk, final=not chunk)
+                if text:
+                    *lines, pending = (pending + text).split('\n')
+                    for line in lines:
+                        handle_line(name, line.rstrip('\r'))
+                if not chunk:
+                    break
+            if pending:
+                handle_line(name, pending.rstrip('\r'))
+
+        readers = asyncio.gather(pump("stdout", process.stdout), pump("stderr", process.stderr))
+        try:
+            await asyncio.wait_for(asyncio.shield(self._wait(process, readers)), timeout)
+        except asyncio.TimeoutError:
+            await self._terminate(process, readers)
+            raise subprocess.TimeoutExpired(args, timeout, output=self._render(tails, counts, tail_lines, log_file, "stdout"),
+                                            stderr=self._render(tails, counts, tail_lines, log_file, "stderr"))
+        except asyncio.CancelledError:
+            await self._terminate(process, readers)
+            raise
+        finally:
+            if log:
+                log.close()
+
+        truncated = tail_lines is not None and (counts["stdout"] > tail_lines or counts["stderr"] > tail_lines)
+        return PrismStreamResult(
+            args, process.returncode,
+            self._render(tails, counts, tail_lines, log_file, "stdout"),
+            self._render(tails, counts, tail_lines, log_file, "stderr"),
+            log_file, counts["stdout"] + counts["stderr"], truncated
+        )
+
+    async def _wait(self, process, readers):
+        await readers
+        await process.wait()
+
+    async def _terminate(self, process, readers):
+        """SIGTERM the process group, SIGKILL it after the grace period, then drain the pipes"""
+        self._signal(process, signal.SIGTERM if os.name == 'posix' else None)
+        try:
+            await asyncio.wait_for(process.wait(), TERMINATE_GRACE_SECONDS)
+        except asyncio.TimeoutError:
+            self._signal(process, signal.SIGKILL if os.name == 'posix' else None)
+            await process.wait()
+        try:
+            # Grandchildren holding the pipes open are in the same group and gone now
+            await asyncio.wait_for(readers, TERMINATE_GRACE_SECONDS)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            readers.cancel()
+
+    def _signal(self, process, signum):
+        if process.returncode is not None:
+            return
+        try:
+            if signum is not None:
+                os.killpg(process.pid, signum)
+            else:
+                process.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def _render(self, tails, counts, tail_lines, log_file, name: str) -> str:
+        text = '\n'.join(tails[name])
+        if tail_lines is not None and counts[name] > tail_lines:
+            skipped = counts[name] - tail_lines
+            where = f", see {log_file}" if log_file else ""
+            text = f"[... {skipped} earlier lines omitted{where}]\n" + text
+        return text + '\n' if tails[name] else text
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.ready.set()
+        self.loop.run_forever()
+
+
+def get_command_runner(max_concurrency: Optional[int] = None) -> PrismCommandRunner:
+    """Process-wide runner for a concurrency limit, so stages share one loop and one bound"""
+    limit = max(1, max_concurrency or default_concurrency())
+    with _runners_lock:
+        if limit not in _runners:
+            _runners[limit] = PrismCommandRunner(limit)
+        return _runners[limit]
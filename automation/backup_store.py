@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Backup Store for Prism Writing Development Automation
+
+This module provides a content-addressed, deduplicating backup store used by
+the file operations module. File contents are stored once per unique hash in a
+compressed blob directory, and every automation run records a manifest that
+maps project paths to the blobs that were backed up during that run.
+"""
+
+import os
+import json
+import zlib
+import shutil
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ioctl request number for FICLONE (copy-on-write clone on btrfs/xfs)
+FICLONE = 0x40049409
+
+
+class PrismBackupStore:
+    """Content-addressed backup store with per-run manifests"""
+
+    def __init__(self, backup_dir: Path, run_id: Optional[str] = None, compress: bool = True):
+        self.backup_dir = Path(backup_dir)
+        self.objects_dir = self.backup_dir / "objects"
+        self.manifests_dir = self.backup_dir / "manifests"
+        self.stat_cache_file = self.backup_dir / "stat_cache.json"
+        self.compress = compress
+
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.manifests_dir.mkdir(parents=True, exist_ok=True)
+
+        self.run_id = run_id or f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+        self.manifest_path = self.manifests_dir / f"{self.run_id}.json"
+        self.manifest = self.load_manifest(self.run_id) or {
+            "run_id": self.run_id,
+            "created_at": datetime.now().isoformat(),
+            "entries": {}
+        }
+        self.stat_cache = self._load_json(self.stat_cache_file, {})
+
+    def store(self, file_path: Path, key: str) -> Path:
+        """Back up a file and record it in the run manifest, returning the blob path"""
+        file_path = Path(file_path)
+        stat = file_path.stat()
+
+        # Unchanged files (same size and mtime as last time) skip hashing entirely
+        cached = self.stat_cache.get(key)
+        digest = None
+        if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+            if self.blob_path(cached["digest"]) is not None:
+                digest = cached["digest"]
+
+        if digest is None:
+            data = file_path.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+            if self.blob_path(digest) is None:
+                self._write_blob(digest, data, file_path)
+            self.stat_cache[key] = {
+                "digest": digest,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns
+            }
+            self._save_json(self.stat_cache_file, self.stat_cache)
+
+        versions = self.manifest["entries"].setdefault(key, [])
+        if not versions or versions[-1]["digest"] != digest:
+            versions.append({
+                "digest": digest,
+                "size": stat.st_size,
+                "mode": stat.st_mode & 0o777,
+                "backed_up_at": datetime.now().isoformat()
+            })
+            self._save_json(self.manifest_path, self.manifest)
+
+        return self.blob_path(digest)
+
+    def blob_path(self, digest: str) -> Optional[Path]:
+        """Return the path of a stored blob, or None if it is not in the store"""
+        base = self.objects_dir / digest[:2] / digest[2:]
+        compressed = base.with_name(base.name + ".z")
+        if compressed.exists():
+            return compressed
+        if base.exists():
+            return base
+        return None
+
+    def read_blob(self, digest: str) -> bytes:
+        """Read and decompress a blob by its digest"""
+        path = self.blob_path(digest)
+        if path is None:
+            raise FileNotFoundError(f"Backup blob not found: {digest}")
+
+        data = path.read_bytes()
+        if path.suffix == ".z":
+            data = zlib.decompress(data)
+        return data
+
+    def restore(self, key: str, target_path: Path, run_id: Optional[str] = None, version: int = 0) -> bool:
+        """Restore a backed-up file; version 0 is the state before the run touched it"""
+        manifest = self.manifest if run_id in (None, self.run_id) else self.load_manifest(run_id)
+        if not manifest:
+            return False
+
+        versions = manifest["entries"].get(key)
+        if not versions:
+            return False
+
+        entry = versions[version]
+        target_path = Path(target_path)
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        target_path.write_bytes(self.read_blob(entry["digest"]))
+        os.chmod(target_path, entry["mode"])
+        return True
+
+    def load_manifest(self, run_id: str) -> Optional[Dict]:
+        """Load the manifest for a run"""
+        return self._load_json(self.manifests_dir / f"{run_id}.json", None)
+
+    def list_runs(self) -> List[str]:
+        """List run ids that have a manifest, oldest first"""
+        return sorted(path.stem for path in self.manifests_dir.glob("*.json"))
+
+    def _write_blob(self, digest: str, data: bytes, source: Path):
+        """Write a new blob atomically"""
+        base = self.objects_dir / digest[:2] / digest[2:]
+        base.parent.mkdir(exist_ok=True)
+
+        if self.compress:
+            target = base.with_name(base.name + ".z")
+            tmp_path = target.with_name(target.name + ".tmp")
+            tmp_path.write_bytes(zlib.compress(data, 6))
+        else:
+            target = base
+            tmp_path = target.with_name(target.name + ".tmp")
+            if not self._reflink(source, tmp_path):
+                shutil.copyfile(source, tmp_path)
+
+        os.replace(tmp_path, target)
+
+    def _reflink(self, source: Path, target: Path) -> bool:
+        """Clone a file with copy-on-write when the filesystem supports it"""
+        if fcntl is None:
+            return False
+
+        try:
+            with open(source, 'rb') as src, open(target, 'wb') as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return True
+        except OSError:
+            target.unlink(missing_ok=True)
+            return False
+
+    def _load_json(self, path: Path, default):
+        """Load a JSON file, falling back to a default"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return default
+
+    def _save_json(self, path: Path, data):
+        """Write a JSON file atomically"""
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
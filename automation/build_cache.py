@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Build Cache for Prism Writing Development Automation
+
+This module skips `npm run build` when nothing that feeds the build changed.
+The cache key is a hash over the build inputs (source and public directories,
+Next/TypeScript/Tailwind configs, env files, the lockfile, and NEXT_PUBLIC_*
+variables). File hashes come from the persistent file index, so computing the
+key only re-reads files whose size or mtime changed. A successful build's .next
+directory (including .next/cache) is stored under .automation_cache/builds/
+and restored on a hit; when .next already holds the build for the current key
+nothing is copied at all. Hits, misses and the build time saved are recorded.
+The key is written into .next after every successful build, even when the
+cache is disabled. That way the deploy stage can tell whether .next already
+holds the tree it is about to ship.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+from pathlib import Path
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from file_index import PrismFileIndex, EXCLUDED_DIRS
+
+BUILD_CACHE_VERSION = 1
+
+# Directories whose contents end up in the Next.js build
+INPUT_DIRS = ["src", "app", "pages", "components", "lib", "public", "styles"]
+
+# Root files that change build output
+INPUT_FILES = [
+    "package.json", "package-lock.json", "yarn.lock", "pnpm-lock.yaml",
+    "next.config.js", "next.config.mjs", "next.config.ts",
+    "tsconfig.json", "middleware.ts", "middleware.js",
+    "tailwind.config.ts", "tailwind.config.js",
+    "postcss.config.js", "postcss.config.mjs",
+    ".env", ".env.production", ".env.local", ".env.production.local"
+]
+
+# Written into .next so an up-to-date build is recognized without a restore
+KEY_MARKER = ".prism-build-key"
+
+
+class PrismBuildCache:
+    """Content-keyed store of .next build outputs"""
+
+    def __init__(self, project_root: str, file_index: Optional[PrismFileIndex] = None,
+                 max_entries: int = 3, enabled: bool = True):
+        self.project_root = Path(project_root).resolve()
+        self.file_index = file_index or PrismFileIndex(str(self.project_root))
+        self.cache_dir = self.file_index.cache_dir / "builds"
+        self.manifest_file = self.cache_dir / "manifest.json"
+        self.build_dir = self.project_root / ".next"
+        self.max_entries = max_entries
+        self.enabled = enabled
+
+    @classmethod
+    def from_config(cls, project_root: str, config: Dict, file_index: Optional[PrismFileIndex] = None) -> "PrismBuildCache":
+        """Build a cache from the build_cache section of the automation config"""
+        settings = config.get("build_cache") or {}
+        return cls(
+            project_root,
+            file_index=file_index,
+            max_entries=settings.get("max_entries", 3),
+            enabled=settings.get("enabled", True)
+        )
+
+    def compute_key(self) -> str:
+        """Hash every build input (content hashes from the file index)"""
+        digest = hashlib.sha256(f"prism-build-v{BUILD_CACHE_VERSION}\n".encode())
+
+        paths = [name for name in INPUT_FILES if (self.project_root / name).is_file()]
+        for directory in INPUT_DIRS:
+            root = self.project_root / directory
+            if not root.is_dir():
+                continue
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = [name for name in dirnames if name not in EXCLUDED_DIRS]
+                relative_dir = Path(dirpath).relative_to(self.project_root).as_posix()
+                paths.extend(f"{relative_dir}/{name}" for name in filenames)
+
+        for path in sorted(paths):
+            entry = self.file_index.update(path)
+            if entry is not None:
+                digest.update(f"{path}\0{entry['hash']}\n".encode())
+
+        for name in sorted(os.environ):
+            if name.startswith("NEXT_PUBLIC_") or name == "NODE_ENV":
+                digest.update(f"env:{name}={os.environ[name]}\n".encode())
+
+        return digest.hexdigest()
+
+    def is_current(self, key: str) -> bool:
+        """Check if .next already holds the build for this key"""
+        try:
+            recorded = (self.build_dir / KEY_MARKER).read_text(encoding='utf-8').split()
+        except OSError:
+            return False
+        # `next dev` and manual builds rewrite .next without the marker; the BUILD_ID catches that
+        return recorded[:1] == [key] and recorded[1:] == self._build_id()[:1]
+
+    def _build_id(self) -> list:
+        try:
+            return (self.build_dir / "BUILD_ID").read_text(encoding='utf-8').split()
+        except OSError:
+            return []
+
+    def mark_current(self, key: str):
+        """Record in .next which tree it was built from"""
+        if self.build_dir.is_dir():
+            (self.build_dir / KEY_MARKER).write_text(' '.join([key, *self._build_id()[:1]]), encoding='utf-8')
+
+    def restore(self, key: str) -> bool:
+        """Put the cached build for key into .next; returns False on a miss"""
+        if self.is_current(key):
+            return True
+
+        entry_dir = self.cache_dir / key
+        if not (entry_dir / KEY_MARKER).is_file():
+            return False
+
+        staging = self.project_root / ".next.restore"
+        if staging.exists():
+            shutil.rmtree(staging)
+        shutil.copytree(entry_dir, staging, symlinks=True)
+
+        previous = self.project_root / ".next.previous"
+        if previous.exists():
+            shutil.rmtree(previous)
+        if self.build_dir.exists():
+            os.replace(self.build_dir, previous)
+        os.replace(staging, self.build_dir)
+        shutil.rmtree(previous, ignore_errors=True)
+        return True
+
+    def store(self, key: str, duration: float = 0):
+        """Save the current .next as the build for key and evict old entries"""
+        if not self.build_dir.is_dir():
+            return
+
+        self.mark_current(key)
+        entry_dir = self.cache_dir / key
+        staging = self.cache_dir / f"{key}.tmp"
+        for path in (staging, entry_dir):
+            if path.exists():
+                shutil.rmtree(path)
+        shutil.copytree(self.build_dir, staging, symlinks=True)
+        os.replace(staging, entry_dir)
+
+        manifest = self._load_manifest()
+        manifest["entries"][key] = {
+            "created_at": datetime.now().isoformat(),
+            "last_used": datetime.now().isoformat(),
+            "duration": duration
+        }
+        manifest["last_build"] = {"key": key, "completed_at": datetime.now().isoformat(), "cache": "miss"}
+        self._evict(manifest)
+        self._save_manifest(manifest)
+
+    def cached_build(self, build: Callable[[], Dict]) -> Dict:
+        """Run build() unless an identical tree was built before
+
+        build must return a dict with "status" and may set "duration". The
+        returned dict gains "cache" ("hit", "miss" or "disabled") and
+        "cache_key".
+        """
+        if not self.enabled:
+            result = build()
+            result["cache"] = "disabled"
+            if result.get("status") == "success":
+                # Nothing is stored, but deploys can still tell that .next matches the tree
+                key = self.compute_key()
+                self.mark_current(key)
+                result["cache_key"] = key
+            return result
+
+        key = self.compute_key()
+        manifest = self._load_manifest()
+
+        if self.restore(key):
+            entry = manifest["entries"].get(key, {})
+            entry["last_used"] = datetime.now().isoformat()
+            manifest["entries"][key] = entry
+            manifest["stats"]["hits"] += 1
+            manifest["stats"]["seconds_saved"] += entry.get("duration", 0)
+            manifest["last_build"] = {"key": key, "completed_at": datetime.now().isoformat(), "cache": "hit"}
+            self._save_manifest(manifest)
+            return {
+                "status": "success",
+                "output": f"Build inputs unchanged, reused cached build {key[:12]}",
+                "errors": [],
+                "duration": 0,
+                "cache": "hit",
+                "cache_key": key
+            }
+
+        manifest["stats"]["misses"] += 1
+        self._save_manifest(manifest)
+
+        result = build()
+        result["cache"] = "miss"
+        result["cache_key"] = key
+        if result.get("status") == "success":
+            try:
+                self.store(key, result.get("duration", 0))
+            except OSError as e:
+                result.setdefault("warnings", []).append(f"Could not store build in cache: {e}")
+        return result
+
+    def stats(self) -> Dict:
+        """Hit/miss counters, time saved, stored entries and the last successful build"""
+        manifest = self._load_manifest()
+        stats = dict(manifest["stats"])
+        stats["last_build"] = manifest.get("last_build")
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["entries"] = len(manifest["entries"])
+        return stats
+
+    def clear(self):
+        """Drop every cached build"""
+        if self.cache_dir.exists():
+            shutil.rmtree(self.cache_dir)
+
+    def _evict(self, manifest: Dict):
+        """Keep only the max_entries most recently used builds"""
+        entries = manifest["entries"]
+        by_age = sorted(entries, key=lambda key: entries[key].get("last_used", ""), reverse=True)
+        for key in by_age[self.max_entries:]:
+            shutil.rmtree(self.cache_dir / key, ignore_errors=True)
+            del entries[key]
+
+    def _load_manifest(self) -> Dict:
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get("version") == BUILD_CACHE_VERSION:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {
+            "version": BUILD_CACHE_VERSION,
+            "entries": {},
+            "stats": {"hits": 0, "misses": 0, "seconds_saved": 0}
+        }
+
+    def _save_manifest(self, manifest: Dict):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_file.with_name(self.manifest_file.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_file)
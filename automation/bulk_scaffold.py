@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Bulk Scaffolding for Prism Writing Development Automation
+
+This module creates many pages and components from one manifest instead of
+one CLI run per page. Templates are rendered in parallel, every file is
+written through a single changeset (one staged, atomic I/O pass), and
+navigation is updated once for all new pages at the end.
+
+Manifest format (YAML or JSON):
+
+    pages:
+      - pricing                       # shorthand: just the slug
+      - name: about-us
+        description: Team and company history
+        sections: [Our Story, Team]
+        layout: true                  # also write src/app/<slug>/layout.tsx
+        navigation: true              # add a link to the site navigation
+    components:
+      - name: PricingCard
+        category: pricing             # src/components/<category>/<Name>.tsx
+        props:
+          - {name: title, type: string}
+          - {name: highlighted, type: boolean, optional: true}
+    overwrite: false                  # skip files that already exist
+"""
+
+import os
+import re
+import json
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import yaml
+
+
+class PrismBulkScaffolder:
+    """Render and write a manifest of pages and components in one pass"""
+
+    def __init__(self, ai_assistant, file_ops, log: Callable[..., None] = print, max_workers: Optional[int] = None):
+        self.ai_assistant = ai_assistant
+        self.file_ops = file_ops
+        self.log = log
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) + 4)
+
+    def load_manifest(self, manifest_path: str) -> Dict:
+        """Load and normalize a YAML or JSON manifest"""
+        path = Path(manifest_path)
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.suffix.lower() == '.json':
+                data = json.load(f)
+            else:
+                data = yaml.safe_load(f)
+
+        if not isinstance(data, dict):
+            raise ValueError(f"Manifest must be a mapping with 'pages' and/or 'components': {manifest_path}")
+
+        return {
+            "pages": [self._normalize_page(entry) for entry in data.get("pages") or []],
+            "components": [self._normalize_component(entry) for entry in data.get("components") or []],
+            "overwrite": bool(data.get("overwrite", False))
+        }
+
+    def _normalize_page(self, entry) -> Dict:
+        """Expand a page entry (slug string or mapping) to a full record"""
+        if isinstance(entry, str):
+            entry = {"name": entry}
+        slug = re.sub(r'[^a-z0-9]+', '-', str(entry["name"]).lower()).strip('-')
+        if not slug:
+            raise ValueError(f"Invalid page name in manifest: {entry['name']!r}")
+
+        return {
+            "slug": slug,
+            "description": entry.get("description") or f"Create {slug.replace('-', ' ')} page",
+            "sections": entry.get("sections") or [],
+            "layout": entry.get("layout", True),
+            "navigation": entry.get("navigation", True)
+        }
+
+    def _normalize_component(self, entry) -> Dict:
+        """Expand a component entry (name string or mapping) to a full record"""
+        if isinstance(entry, str):
+            entry = {"name": entry}
+        name = str(entry["name"])
+        if not re.match(r'^[A-Z][A-Za-z0-9]*$', name):
+            raise ValueError(f"Component names must be PascalCase: {name!r}")
+
+        return {
+            "name": name,
+            "category": entry.get("category") or name.lower(),
+            "description": entry.get("description") or f"Create {name} component",
+            "props": entry.get("props") or []
+        }
+
+    def plan(self, manifest: Dict) -> List[Dict]:
+        """Turn a manifest into render jobs with their target paths"""
+        jobs = []
+
+        for page in manifest["pages"]:
+            page_context = {
+                "page_name": page["slug"].replace('-', ' ').title().replace(' ', ''),
+                "page_slug": page["slug"],
+                "sections": page["sections"]
+            }
+            jobs.append({
+                "kind": "page",
+                "path": f"src/app/{page['slug']}/page.tsx",
+                "description": page["description"],
+                "context": page_context
+            })
+            if page["layout"]:
+                jobs.append({
+                    "kind": "layout",
+                    "path": f"src/app/{page['slug']}/layout.tsx",
+                    "description": page["description"],
+                    "context": {"page_name": page["slug"]}
+                })
+
+        for component in manifest["components"]:
+            jobs.append({
+                "kind": "component",
+                "path": f"src/components/{component['category']}/{component['name']}.tsx",
+                "description": component["description"],
+                "context": {"component_name": component["name"], "props": component["props"]}
+            })
+
+        return jobs
+
+    def render(self, jobs: List[Dict]) -> List[str]:
+        """Render all jobs on a thread pool, preserving job order"""
+        def render_job(job: Dict) -> str:
+            return self.ai_assistant.generate_code(job["kind"], job["description"], job["context"])
+
+        if len(jobs) < 2:
+            return [render_job(job) for job in jobs]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(render_job, jobs))
+
+    def run(self, manifest: Dict, update_navigation: Optional[Callable[[List[str]], Dict]] = None) -> Dict:
+        """Render the manifest, write it in one changeset and update navigation once"""
+        result = {
+            "status": "success",
+            "files_created": [],
+            "files_modified": [],
+            "files_skipped": [],
+            "errors": [],
+            "warnings": []
+        }
+
+        jobs = self.plan(manifest)
+        if not manifest["overwrite"]:
+            for job in jobs:
+                if self.file_ops.file_exists(job["path"]):
+                    result["files_skipped"].append(job["path"])
+            jobs = [job for job in jobs if job["path"] not in result["files_skipped"]]
+
+        self.log(f"Rendering {len(jobs)} files from manifest ({len(result['files_skipped'])} existing skipped)")
+        contents = self.render(jobs)
+
+        new_pages = [
+            page["slug"] for page in manifest["pages"]
+            if page["navigation"] and f"src/app/{page['slug']}/page.tsx" not in result["files_skipped"]
+        ]
+
+        try:
+            with self.file_ops.changeset():
+                for job, content in zip(jobs, contents):
+                    file_result = self.file_ops.create_file(job["path"], content)
+                    if file_result["status"] != "success":
+                        raise IOError(f"Failed to stage {job['path']}: {file_result['error']}")
+                    result["files_created"].append(job["path"])
+
+                if update_navigation and new_pages:
+                    nav_result = update_navigation(new_pages)
+                    result["files_modified"].extend(nav_result.get("files_modified", []))
+                    result["errors"].extend(nav_result.get("errors", []))
+        except Exception as e:
+            result["status"] = "failed"
+            result["files_created"] = []
+            result["files_modified"] = []
+            result["errors"].append(str(e))
+            return result
+
+        if result["files_skipped"]:
+            result["warnings"].append(
+                f"Skipped {len(result['files_skipped'])} existing files (set overwrite: true to replace them)"
+            )
+        return result
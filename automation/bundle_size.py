@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Bundle Size Tracking for Prism Writing Development Automation
+
+This module measures the client JavaScript of a Next.js build straight from
+the manifests in .next instead of scraping `next build` output. First-load JS
+per route is the gzipped size of every chunk the route needs on a cold load:
+the shared root chunks, the route's page entry and the entries of the layouts
+above it (app router), or the page plus _app (pages router). The total is the
+uncompressed size of all client chunks under .next/static.
+
+Each measurement is stored with the git commit it was taken at, and compared
+with the previous distinct build, so growth caused by a change (for example a
+freshly generated component pulling in a large dependency) shows up on the
+routes it affects. quality_gates.max_bundle_size_mb and the optional
+quality_gates.max_first_load_kb are enforced.
+"""
+
+import os
+import re
+import gzip
+import json
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Optional
+
+BUNDLE_HISTORY_VERSION = 1
+
+# Measurements kept in .automation_cache/bundles.json
+MAX_HISTORY = 50
+
+# Route group segments such as "(marketing)" do not appear in URLs
+ROUTE_GROUP = re.compile(r'/\([^/]+\)')
+
+
+def format_kb(size: float) -> str:
+    """Bytes as kB with one decimal, the way `next build` prints them"""
+    return f"{size / 1000:.1f} kB"
+
+
+def app_route_name(entry: str) -> Optional[str]:
+    """URL path for an app-build-manifest page entry, or None if it is not a page"""
+    if not entry.endswith("/page"):
+        return None
+    route = ROUTE_GROUP.sub('', entry[:-len("/page")])
+    if route.startswith("/_"):
+        # Framework routes such as /_not-found
+        return None
+    return route or "/"
+
+
+class PrismBundleTracker:
+    """Per-route first-load JS and total client bundle size, with history"""
+
+    def __init__(self, project_root: str, cache_dir: Optional[str] = None, max_history: int = MAX_HISTORY):
+        self.project_root = Path(project_root).resolve()
+        self.build_dir = self.project_root / ".next"
+        self.cache_dir = Path(cache_dir) if cache_dir else self.project_root / ".automation_cache"
+        self.history_file = self.cache_dir / "bundles.json"
+        self.max_history = max_history
+        self._gzip_sizes: Dict[str, int] = {}
+
+    def analyze(self) -> Dict:
+        """Measure the current .next build
+
+        Returns {"build_id", "total_bytes", "total_gzip_bytes", "routes":
+        {route: {"first_load_bytes", "chunks"}}}. Raises FileNotFoundError when
+        there is no build to measure.
+        """
+        build_manifest = self._read_manifest("build-manifest.json")
+        if build_manifest is None:
+            raise FileNotFoundError(f"No Next.js build found in {self.build_dir} (run the build first)")
+        self._gzip_sizes = {}
+        app_manifest = self._read_manifest("app-build-manifest.json") or {}
+
+        shared = [*build_manifest.get("polyfillFiles", []), *build_manifest.get("rootMainFiles", [])]
+        routes = {}
+
+        app_pages = app_manifest.get("pages", {})
+        for entry, files in app_pages.items():
+            route = app_route_name(entry)
+            if route is None:
+                continue
+            chunks = set(shared) | set(files)
+            # Layouts wrap the page and load with it: "/layout", "/blog/layout", ...
+            segments = entry.split('/')[1:-1]
+            for depth in range(len(segments) + 1):
+                chunks.update(app_pages.get('/' + '/'.join(segments[:depth] + ["layout"]), []))
+            routes[route] = self._route_size(chunks)
+
+        pages = build_manifest.get("pages", {})
+        app_files = pages.get("/_app", [])
+        for route, files in pages.items():
+            if route.startswith("/_"):
+                continue
+            routes[route] = self._route_size(set(shared) | set(app_files) | set(files))
+
+        total_bytes, total_gzip = 0, 0
+        static_dir = self.build_dir / "static"
+        for dirpath, _, filenames in os.walk(static_dir):
+            for name in filenames:
+                if name.endswith(".js"):
+                    relative = (Path(dirpath) / name).relative_to(self.build_dir).as_posix()
+                    total_bytes += (Path(dirpath) / name).stat().st_size
+                    total_gzip += self._gzip_size(relative)
+
+        return {
+            "build_id": self._build_id(),
+            "total_bytes": total_bytes,
+            "total_gzip_bytes": total_gzip,
+            "routes": dict(sorted(routes.items()))
+        }
+
+    def diff(self, current: Dict, previous: Optional[Dict]) -> Dict:
+        """Per-route and total size changes between two measurements"""
+        if previous is None:
+            return {"compared": False, "baseline": None, "total_delta": 0, "routes": {}, "added": [], "removed": []}
+
+        before_routes, after_routes = previous.get("routes", {}), current["routes"]
+        changes = {}
+        for route in sorted(set(before_routes) & set(after_routes)):
+            before = before_routes[route]["first_load_bytes"]
+            after = after_routes[route]["first_load_bytes"]
+            if before != after:
+                changes[route] = {"before": before, "after": after, "delta": after - before}
+
+        return {
+            "compared": True,
+            "baseline": previous.get("commit"),
+            "total_delta": current["total_bytes"] - previous.get("total_bytes", 0),
+            "routes": changes,
+            "added": sorted(set(after_routes) - set(before_routes)),
+            "removed": sorted(set(before_routes) - set(after_routes))
+        }
+
+    def check(self, current: Dict, changes: Dict, quality_gates: Dict) -> Dict:
+        """Budget failures and growth warnings for a measurement"""
+        gate = {"failures": [], "warnings": []}
+
+        max_total_mb = quality_gates.get("max_bundle_size_mb")
+        if max_total_mb is not None and current["total_bytes"] > max_total_mb * 1024 * 1024:
+            gate["failures"].append(
+                f"Client bundle is {current['total_bytes'] / (1024 * 1024):.2f} MB, over the {max_total_mb} MB budget"
+            )
+
+        max_route_kb = quality_gates.get("max_first_load_kb")
+        if max_route_kb is not None:
+            for route, sizes in current["routes"].items():
+                if sizes["first_load_bytes"] > max_route_kb * 1000:
+                    gate["failures"].append(
+                        f"{route} first-load JS is {format_kb(sizes['first_load_bytes'])}, over the {max_route_kb} kB budget"
+                    )
+
+        growth_kb = quality_gates.get("bundle_growth_warning_kb", 10)
+        for route, change in changes["routes"].items():
+            if change["delta"] > growth_kb * 1000:
+                gate["warnings"].append(
+                    f"{route} first-load JS grew {format_kb(change['delta'])} "
+                    f"({format_kb(change['before'])} → {format_kb(change['after'])})"
+                )
+        return gate
+
+    def previous(self, build_id: Optional[str]) -> Optional[Dict]:
+        """Latest stored measurement of a different build"""
+        for entry in reversed(self._load_history()):
+            if entry.get("build_id") != build_id:
+                return entry
+        return None
+
+    def record(self, current: Dict, revision: Optional[Dict] = None):
+        """Store a measurement (a restored cached build replaces its own earlier entry)"""
+        revision = revision or {}
+        entry = dict(current)
+        entry.update({
+            "commit": revision.get("commit"),
+            "dirty": revision.get("dirty", False),
+            "measured_at": datetime.now().isoformat()
+        })
+
+        history = [item for item in self._load_history() if item.get("build_id") != current.get("build_id")]
+        history.append(entry)
+        history = history[-self.max_history:]
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.history_file.with_name(self.history_file.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": BUNDLE_HISTORY_VERSION, "history": history}, f, indent=2)
+        os.replace(tmp_path, self.history_file)
+
+    def run(self, quality_gates: Dict, revision: Optional[Dict] = None) -> Dict:
+        """Measure, compare, gate and record; returns a stage result"""
+        result = {
+            "status": "success",
+            "output": "",
+            "errors": [],
+            "warnings": []
+        }
+
+        try:
+            current = self.analyze()
+        except FileNotFoundError as e:
+            # Nothing was built (build stage disabled); not a failure of the change
+            result["status"] = "skipped"
+            result["errors"].append(str(e))
+            return result
+        except ValueError as e:
+            result["status"] = "failed"
+            result["errors"].append(f"Unreadable build manifest: {e}")
+            return result
+
+        changes = self.diff(current, self.previous(current["build_id"]))
+        gate = self.check(current, changes, quality_gates)
+        result["errors"].extend(gate["failures"])
+        result["warnings"].extend(gate["warnings"])
+        if gate["failures"]:
+            result["status"] = "failed"
+
+        result["bundle"] = {
+            "total_bytes": current["total_bytes"],
+            "total_gzip_bytes": current["total_gzip_bytes"],
+            "routes": {route: sizes["first_load_bytes"] for route, sizes in current["routes"].items()},
+            "diff": changes
+        }
+        result["output"] = self.render(current, changes)
+
+        try:
+            self.record(current, revision)
+        except OSError as e:
+            result["warnings"].append(f"Could not store bundle sizes: {e}")
+        return result
+
+    def render(self, current: Dict, changes: Dict) -> str:
+        """Route table with first-load JS and the change since the baseline"""
+        width = max([len("Route")] + [len(route) for route in current["routes"]])
+        lines = [f"{'Route'.ljust(width)}  {'First Load JS':>13}  {'Change':>10}"]
+        for route, sizes in current["routes"].items():
+            if route in changes["routes"]:
+                delta = changes["routes"][route]["delta"]
+                change = ("+" if delta > 0 else "-") + format_kb(abs(delta))
+            elif route in changes["added"]:
+                change = "new"
+            else:
+                change = ""
+            lines.append(f"{route.ljust(width)}  {format_kb(sizes['first_load_bytes']):>13}  {change:>10}")
+
+        total = f"Client JS total: {current['total_bytes'] / (1024 * 1024):.2f} MB ({format_kb(current['total_gzip_bytes'])} gzipped)"
+        if changes["compared"]:
+            sign = "+" if changes["total_delta"] >= 0 else "-"
+            total += f", {sign}{format_kb(abs(changes['total_delta']))} since {(changes['baseline'] or 'previous build')[:12]}"
+        lines.append(total)
+        for route in changes["removed"]:
+            lines.append(f"Removed: {route}")
+        return '\n'.join(lines)
+
+    def _route_size(self, chunks) -> Dict:
+        js_chunks = sorted(chunk for chunk in chunks if chunk.endswith(".js"))
+        return {
+            "first_load_bytes": sum(self._gzip_size(chunk) for chunk in js_chunks),
+            "chunks": len(js_chunks)
+        }
+
+    def _gzip_size(self, chunk: str) -> int:
+        """Gzipped size of a chunk (memoized; chunks are shared between routes)"""
+        if chunk not in self._gzip_sizes:
+            try:
+                data = (self.build_dir / chunk).read_bytes()
+                self._gzip_sizes[chunk] = len(gzip.compress(data, compresslevel=9))
+            except OSError:
+                self._gzip_sizes[chunk] = 0
+        return self._gzip_sizes[chunk]
+
+    def _read_manifest(self, name: str) -> Optional[Dict]:
+        try:
+            with open(self.build_dir / name, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _build_id(self) -> Optional[str]:
+        try:
+            return (self.build_dir / "BUILD_ID").read_text(encoding='utf-8').strip()
+        except OSError:
+            return None
+
+    def _load_history(self) -> List[Dict]:
+        try:
+            with open(self.history_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == BUNDLE_HISTORY_VERSION:
+                return data.get("history", [])
+        except (OSError, ValueError):
+            pass
+        return []
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Changesets for Prism Writing Development Automation
+
+This module groups the file writes of one automation step into a single
+changeset. Writes are staged in a temporary area inside the project, then
+committed together with atomic renames and one batched fsync, or rolled back
+from the changeset manifest without leaving partially modified files behind.
+"""
+
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional
+from datetime import datetime
+
+
+class PrismChangeset:
+    """A set of staged file writes that is committed or rolled back as a unit"""
+
+    def __init__(self, project_root: Path, backup_store, changeset_id: Optional[str] = None):
+        self.project_root = Path(project_root)
+        self.backup_store = backup_store
+        self.changeset_id = changeset_id or f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{os.getpid()}"
+        self.staging_dir = self.project_root / ".automation_staging" / self.changeset_id
+        self.staged: Dict[str, Path] = {}
+        self.manifest: List[Dict] = []
+        self.status = "open"
+
+    def stage(self, file_path: str, content: str) -> Path:
+        """Stage new content for a project-relative path"""
+        if self.status != "open":
+            raise RuntimeError(f"Changeset is {self.status}")
+
+        key = Path(file_path).as_posix()
+        staged_path = self.staged.get(key)
+        if staged_path is None:
+            self.staging_dir.mkdir(parents=True, exist_ok=True)
+            staged_path = self.staging_dir / f"{len(self.staged):05d}"
+            self.staged[key] = staged_path
+
+        with open(staged_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return staged_path
+
+    def read_staged(self, file_path: str) -> Optional[str]:
+        """Return the staged content for a path, or None if it is not staged"""
+        staged_path = self.staged.get(Path(file_path).as_posix())
+        if staged_path is None:
+            return None
+
+        with open(staged_path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def is_staged(self, file_path: str) -> bool:
+        """Check if a path has staged content"""
+        return Path(file_path).as_posix() in self.staged
+
+    def commit(self) -> Dict:
+        """Apply all staged writes with atomic renames"""
+        result = {
+            "status": "success",
+            "changeset_id": self.changeset_id,
+            "files_written": [],
+            "error": None
+        }
+
+        if self.status != "open":
+            result["status"] = "failed"
+            result["error"] = f"Changeset is {self.status}"
+            return result
+
+        try:
+            # Flush every staged file to disk before anything becomes visible
+            for staged_path in self.staged.values():
+                fd = os.open(staged_path, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+
+            # Back up the current version of every target so the whole set can be undone
+            for key in self.staged:
+                target = self.project_root / key
+                entry = {"path": key, "existed": target.exists(), "digest": None, "mode": None}
+                if entry["existed"]:
+                    self.backup_store.store(target, key)
+                    version = self.backup_store.manifest["entries"][key][-1]
+                    entry["digest"] = version["digest"]
+                    entry["mode"] = version["mode"]
+                self.manifest.append(entry)
+
+            directories = set()
+            for entry in self.manifest:
+                target = self.project_root / entry["path"]
+                staged_path = self.staged[entry["path"]]
+                target.parent.mkdir(parents=True, exist_ok=True)
+                if entry["mode"] is not None:
+                    os.chmod(staged_path, entry["mode"])
+                os.replace(staged_path, target)
+                entry["applied"] = True
+                directories.add(target.parent)
+                result["files_written"].append(entry["path"])
+
+            self._fsync_directories(directories)
+            self.status = "committed"
+
+        except Exception as e:
+            self._undo_applied()
+            self.status = "rolled_back"
+            result["status"] = "failed"
+            result["error"] = str(e)
+            result["files_written"] = []
+
+        self._cleanup()
+        return result
+
+    def rollback(self) -> Dict:
+        """Discard staged writes, or undo them if the changeset was already committed"""
+        result = {
+            "status": "success",
+            "changeset_id": self.changeset_id,
+            "files_restored": [],
+            "files_removed": [],
+            "error": None
+        }
+
+        try:
+            if self.status == "committed":
+                restored, removed = self._undo_applied()
+                result["files_restored"] = restored
+                result["files_removed"] = removed
+        except Exception as e:
+            result["status"] = "failed"
+            result["error"] = str(e)
+
+        self.status = "rolled_back"
+        self._cleanup()
+        return result
+
+    def _undo_applied(self):
+        """Restore every applied entry from the manifest"""
+        restored = []
+        removed = []
+
+        for entry in reversed(self.manifest):
+            if not entry.get("applied"):
+                continue
+
+            target = self.project_root / entry["path"]
+            if entry["existed"]:
+                target.write_bytes(self.backup_store.read_blob(entry["digest"]))
+                os.chmod(target, entry["mode"])
+                restored.append(entry["path"])
+            else:
+                target.unlink(missing_ok=True)
+                removed.append(entry["path"])
+            entry["applied"] = False
+
+        return restored, removed
+
+    def _fsync_directories(self, directories):
+        """Persist the renames by syncing each touched directory once"""
+        if os.name == "nt":
+            return
+
+        for directory in directories:
+            fd = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def _cleanup(self):
+        """Remove the staging area"""
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+        try:
+            self.staging_dir.parent.rmdir()
+        except OSError:
+            pass
+
+
+class PrismPreviewChangeset(PrismChangeset):
+    """A changeset that keeps staged writes in memory and can never be committed"""
+
+    def __init__(self, project_root: Path, backup_store, changeset_id: Optional[str] = None):
+        super().__init__(project_root, backup_store, changeset_id)
+        self.contents: Dict[str, str] = {}
+
+    def stage(self, file_path: str, content: str) -> Path:
+        """Record new content for a path without touching the disk"""
+        if self.status != "open":
+            raise RuntimeError(f"Changeset is {self.status}")
+
+        key = Path(file_path).as_posix()
+        self.contents[key] = content
+        return self.project_root / key
+
+    def read_staged(self, file_path: str) -> Optional[str]:
+        return self.contents.get(Path(file_path).as_posix())
+
+    def is_staged(self, file_path: str) -> bool:
+        return Path(file_path).as_posix() in self.contents
+
+    def commit(self) -> Dict:
+        """Previews are never applied"""
+        return {
+            "status": "failed",
+            "changeset_id": self.changeset_id,
+            "files_written": [],
+            "error": "Preview changesets cannot be committed"
+        }
+
+    def rollback(self) -> Dict:
+        """Drop the in-memory writes"""
+        self.contents = {}
+        self.status = "rolled_back"
+        return {
+            "status": "success",
+            "changeset_id": self.changeset_id,
+            "files_restored": [],
+            "files_removed": [],
+            "error": None
+        }
@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+Dependency Graph for Prism Writing Development Automation
+
+This module builds a project-wide import/export graph over the source tree.
+Import specifiers are parsed from static, multi-line, re-export, side-effect,
+dynamic import() and require() forms, and resolved through relative paths and
+the tsconfig "paths" aliases (e.g. @/components/...). Parse results are cached
+per file content hash under .automation_cache/, so a warm rebuild only re-reads
+files that changed.
+"""
+
+import os
+import re
+import json
+from pathlib import Path, PurePosixPath
+from collections import deque
+from typing import Dict, List, Optional, Set
+
+from file_index import PrismFileIndex
+from ts_lexer import scan_source
+
+GRAPH_CACHE_VERSION = 2
+
+SOURCE_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs')
+RESOLVE_EXTENSIONS = SOURCE_EXTENSIONS + ('.d.ts', '.json')
+
+# Next.js files that are loaded by the framework rather than imported
+ENTRY_POINT_NAMES = {
+    'page', 'layout', 'loading', 'error', 'not-found', 'template', 'default',
+    'route', 'middleware', 'global-error', 'opengraph-image', 'icon', 'sitemap', 'robots'
+}
+
+# Strings and template literals are kept so that comment markers inside them survive
+COMMENT_PATTERN = re.compile(
+    r'("(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|`(?:\\.|[^`\\])*`)|//[^\n]*|/\*[\s\S]*?\*/'
+)
+# A string right after one of these is a module specifier and is kept readable
+SPECIFIER_CONTEXT = re.compile(r'(?:\b(?:from|import)|\b(?:import|require)\s*\()\s*\Z')
+STATIC_IMPORT_PATTERN = re.compile(
+    r'\b(import|export)\s+(?:type\s+)?'
+    r'((?:[\w$]+\s*,?\s*)?(?:\*\s*(?:as\s+[\w$]+\s*)?|\{[^{}]*\}\s*)?)'
+    r'from\s*[\'"]([^\'"\n]+)[\'"]'
+)
+SIDE_EFFECT_IMPORT_PATTERN = re.compile(r'\bimport\s*[\'"]([^\'"\n]+)[\'"]')
+DYNAMIC_IMPORT_PATTERN = re.compile(r'\bimport\s*\(\s*[\'"]([^\'"\n]+)[\'"]\s*\)')
+REQUIRE_PATTERN = re.compile(r'\brequire\s*\(\s*[\'"]([^\'"\n]+)[\'"]\s*\)')
+EXPORT_DECLARATION_PATTERN = re.compile(
+    r'\bexport\s+(default\s+)?(?:declare\s+)?(?:async\s+)?'
+    r'(?:function\s*\*?|class|const|let|var|interface|type|enum|abstract\s+class)\s+([\w$]+)'
+)
+EXPORT_DEFAULT_PATTERN = re.compile(r'\bexport\s+default\b')
+EXPORT_LIST_PATTERN = re.compile(r'\bexport\s+(?:type\s+)?\{([^}]*)\}')
+
+
+def strip_comments(content: str) -> str:
+    """Blank out comments while keeping offsets and line numbers intact"""
+    def replace(match):
+        if match.group(1):
+            return match.group(1)
+        return re.sub(r'[^\n]', ' ', match.group(0))
+    return COMMENT_PATTERN.sub(replace, content)
+
+
+def mask_source(content: str, file_path: Optional[str] = None) -> str:
+    """Blank out comments, strings, template text and JSX text, except module specifiers
+
+    Offsets and line numbers are kept, so text such as `import a from 'b'`
+    inside a template literal is not matched as an import.
+    """
+    pieces = []
+    last = 0
+    for start, end, kind in scan_source(content, file_path, record_literals=True)["literals"]:
+        if kind == "string" and SPECIFIER_CONTEXT.search(content, max(0, start - 64), start - 1):
+            continue
+        pieces.append(content[last:start])
+        pieces.append(re.sub(r'[^\n]', ' ', content[start:end]))
+        last = end
+    pieces.append(content[last:])
+    return ''.join(pieces)
+
+
+def parse_module(content: str, file_path: Optional[str] = None) -> Dict:
+    """Extract import and export records from TS/JS source"""
+    code = mask_source(content, file_path)
+    imports = []
+    exports = []
+
+    def line_of(offset: int) -> int:
+        return code.count('\n', 0, offset) + 1
+
+    def statement_at(start: int, end: int) -> str:
+        return ' '.join(content[start:end].split())
+
+    def line_text(offset: int) -> str:
+        end = content.find('\n', offset)
+        return content[offset:end if end != -1 else len(content)].strip()
+
+    for match in STATIC_IMPORT_PATTERN.finditer(code):
+        keyword, clause, specifier = match.groups()
+        record = {
+            "specifier": specifier,
+            "kind": "import" if keyword == "import" else "reexport",
+            "line": line_of(match.start()),
+            "statement": statement_at(match.start(), match.end())
+        }
+        imports.append(record)
+        if keyword == "export":
+            exports.append({
+                "names": _split_names(clause),
+                "line": record["line"],
+                "statement": record["statement"]
+            })
+
+    for kind, pattern in (("side_effect", SIDE_EFFECT_IMPORT_PATTERN),
+                          ("dynamic", DYNAMIC_IMPORT_PATTERN),
+                          ("require", REQUIRE_PATTERN)):
+        for match in pattern.finditer(code):
+            imports.append({
+                "specifier": match.group(1),
+                "kind": kind,
+                "line": line_of(match.start()),
+                "statement": statement_at(match.start(), match.end())
+            })
+
+    declared = set()
+    for match in EXPORT_DECLARATION_PATTERN.finditer(code):
+        declared.add(match.start())
+        names = ["default", match.group(2)] if match.group(1) else [match.group(2)]
+        exports.append({
+            "names": names,
+            "line": line_of(match.start()),
+            "statement": line_text(match.start())
+        })
+
+    for match in EXPORT_DEFAULT_PATTERN.finditer(code):
+        if match.start() not in declared:
+            exports.append({
+                "names": ["default"],
+                "line": line_of(match.start()),
+                "statement": line_text(match.start())
+            })
+
+    for match in EXPORT_LIST_PATTERN.finditer(code):
+        # "export { a } from 'x'" was already recorded as a re-export
+        if re.match(r'\s*from\b', code[match.end():]):
+            continue
+        exports.append({
+            "names": _split_names(match.group(1)),
+            "line": line_of(match.start()),
+            "statement": statement_at(match.start(), match.end())
+        })
+
+    imports.sort(key=lambda record: record["line"])
+    exports.sort(key=lambda record: record["line"])
+    return {"imports": imports, "exports": exports}
+
+
+def _split_names(clause: str) -> List[str]:
+    """Return the exported names of an export clause ("a as b" exports b)"""
+    names = []
+    for part in clause.strip().strip('{}').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        names.append(part.split(' as ')[-1].strip())
+    return names
+
+
+class PrismDependencyGraph:
+    """Project-wide module graph with forward, reverse and transitive queries"""
+
+    def __init__(self, project_root: str, file_index: Optional[PrismFileIndex] = None,
+                 source_dirs: Optional[List[str]] = None):
+        self.project_root = Path(project_root).resolve()
+        self.file_index = file_index or PrismFileIndex(str(self.project_root))
+        self.source_dirs = source_dirs or ["src"]
+        self.cache_file = self.file_index.cache_dir / "dependency_graph.json"
+        self.aliases = self.load_path_aliases()
+
+        self.modules: Dict[str, Dict] = {}
+        self.forward: Dict[str, Set[str]] = {}
+        self.reverse: Dict[str, Set[str]] = {}
+        self.external: Dict[str, Set[str]] = {}
+        self.unresolved: Dict[str, Set[str]] = {}
+        self.built = False
+        # Deleted files treated as present while looking for their importers
+        self._assumed_present: Set[str] = set()
+
+    def load_path_aliases(self) -> List[Dict]:
+        """Read compilerOptions.paths from tsconfig.json"""
+        aliases = []
+        tsconfig = self.project_root / "tsconfig.json"
+        options = {}
+
+        try:
+            with open(tsconfig, 'r', encoding='utf-8') as f:
+                text = strip_comments(f.read())
+            options = json.loads(re.sub(r',(\s*[}\]])', r'\1', text)).get("compilerOptions", {})
+        except (OSError, ValueError):
+            pass
+
+        base_url = options.get("baseUrl", ".")
+        for alias, targets in options.get("paths", {}).items():
+            aliases.append({
+                "prefix": alias.rstrip('*'),
+                "wildcard": alias.endswith('*'),
+                "targets": [os.path.normpath(os.path.join(base_url, target)) for target in targets]
+            })
+
+        # Longest prefix wins, as in TypeScript
+        aliases.sort(key=lambda alias: len(alias["prefix"]), reverse=True)
+        return aliases
+
+    def build(self, force: bool = False) -> Dict:
+        """Build or incrementally rebuild the graph"""
+        self.file_index.ensure_fresh()
+        cache = {} if force else self._load_cache()
+        stats = {"files": 0, "parsed": 0, "cached": 0, "edges": 0}
+
+        self.modules = {}
+        for source_dir in self.source_dirs:
+            for path in self.file_index.list(source_dir, "**/*"):
+                if not path.endswith(SOURCE_EXTENSIONS):
+                    continue
+                entry = self.file_index.get(path)
+                cached = cache.get(path)
+                if cached and cached["hash"] == entry["hash"]:
+                    self.modules[path] = cached
+                    stats["cached"] += 1
+                    continue
+
+                try:
+                    with open(self.project_root / path, 'r', encoding='utf-8') as f:
+                        parsed = parse_module(f.read(), path)
+                except (OSError, UnicodeDecodeError):
+                    parsed = {"imports": [], "exports": []}
+                self.modules[path] = {"hash": entry["hash"], **parsed}
+                stats["parsed"] += 1
+
+        stats["files"] = len(self.modules)
+        self._link()
+        stats["edges"] = sum(len(targets) for targets in self.forward.values())
+
+        if stats["parsed"] or len(cache) != len(self.modules):
+            self._save_cache()
+        self.built = True
+        return stats
+
+    def ensure_built(self):
+        """Build the graph once per session"""
+        if not self.built:
+            self.build()
+
+    def get_module(self, path: str) -> Optional[Dict]:
+        """Return the parsed record for a module"""
+        self.ensure_built()
+        return self.modules.get(self._key(path))
+
+    def dependencies(self, path: str) -> Set[str]:
+        """Project files imported directly by a module"""
+        self.ensure_built()
+        return set(self.forward.get(self._key(path), ()))
+
+    def dependents(self, path: str) -> Set[str]:
+        """Project files that import a module directly"""
+        self.ensure_built()
+        return set(self.reverse.get(self._key(path), ()))
+
+    def transitive_dependencies(self, paths) -> Set[str]:
+        """Every project file reachable from the given modules"""
+        self.ensure_built()
+        return self._closure(paths, self.forward)
+
+    def transitive_dependents(self, paths) -> Set[str]:
+        """Every project file that (indirectly) imports one of the given modules"""
+        self.ensure_built()
+        return self._closure(paths, self.reverse)
+
+    def affected_files(self, paths) -> Set[str]:
+        """The given files plus everything that depends on them"""
+        keys = {self._key(path) for path in self._as_list(paths)}
+        return keys | self.transitive_dependents(keys)
+
+    def removed_dependents(self, paths) -> Set[str]:
+        """Modules that still import one of the given deleted files
+
+        Their imports no longer resolve, so the edges are gone from the
+        graph; they are found by resolving again as if the files existed.
+        """
+        self.ensure_built()
+        removed = {self._key(path) for path in self._as_list(paths)}
+        removed = {path for path in removed if path.endswith(RESOLVE_EXTENSIONS) and not self.file_index.contains(path)}
+        if not removed:
+            return set()
+
+        importers = set()
+        self._assumed_present = removed
+        try:
+            for path, module in self.modules.items():
+                for record in module["imports"]:
+                    if self.resolve(path, record["specifier"]) in removed:
+                        importers.add(path)
+                        break
+        finally:
+            self._assumed_present = set()
+        return importers
+
+    def external_packages(self, path: Optional[str] = None) -> Set[str]:
+        """npm packages imported by one module, or by the whole graph"""
+        self.ensure_built()
+        if path is not None:
+            return set(self.external.get(self._key(path), ()))
+        packages = set()
+        for names in self.external.values():
+            packages.update(names)
+        return packages
+
+    def orphans(self) -> List[str]:
+        """Modules nobody imports, excluding framework entry points"""
+        self.ensure_built()
+        return sorted(
+            path for path in self.modules
+            if not self.reverse.get(path)
+            and PurePosixPath(path).stem not in ENTRY_POINT_NAMES
+            and not path.endswith('.d.ts')
+        )
+
+    def resolve(self, importer: str, specifier: str) -> Optional[str]:
+        """Resolve an import specifier to a project-relative path"""
+        if specifier.startswith('.'):
+            base = os.path.normpath(os.path.join(os.path.dirname(importer), specifier))
+            return self._resolve_candidates([base])
+
+        for alias in self.aliases:
+            if alias["wildcard"] and specifier.startswith(alias["prefix"]):
+                rest = specifier[len(alias["prefix"]):]
+            elif not alias["wildcard"] and specifier == alias["prefix"]:
+                rest = ""
+            else:
+                continue
+
+            candidates = [
+                os.path.normpath(target.replace('*', rest)) if alias["wildcard"] else target
+                for target in alias["targets"]
+            ]
+            resolved = self._resolve_candidates(candidates)
+            if resolved:
+                return resolved
+
+        if specifier.startswith('@/'):
+            # Next.js src/ layout when tsconfig maps @/ to the project root
+            for source_dir in self.source_dirs:
+                resolved = self._resolve_candidates([os.path.join(source_dir, specifier[2:])])
+                if resolved:
+                    return resolved
+
+        return None
+
+    def _resolve_candidates(self, candidates: List[str]) -> Optional[str]:
+        """Try a list of extensionless paths against the file index"""
+        for candidate in candidates:
+            candidate = PurePosixPath(candidate.replace(os.sep, '/')).as_posix()
+            if candidate.startswith('..'):
+                continue
+            if self._exists(candidate) and candidate.endswith(RESOLVE_EXTENSIONS):
+                return candidate
+            for extension in RESOLVE_EXTENSIONS:
+                if self._exists(candidate + extension):
+                    return candidate + extension
+            for extension in RESOLVE_EXTENSIONS:
+                if self._exists(f"{candidate}/index{extension}"):
+                    return f"{candidate}/index{extension}"
+        return None
+
+    def _exists(self, path: str) -> bool:
+        return self.file_index.contains(path) or path in self._assumed_present
+
+    def _link(self):
+        """Resolve every import into forward and reverse edges"""
+        self.forward = {path: set() for path in self.modules}
+        self.reverse = {path: set() for path in self.modules}
+        self.external = {}
+        self.unresolved = {}
+
+        for path, module in self.modules.items():
+            for record in module["imports"]:
+                specifier = record["specifier"]
+                resolved = self.resolve(path, specifier)
+                if resolved:
+                    self.forward[path].add(resolved)
+                    self.reverse.setdefault(resolved, set()).add(path)
+                elif specifier.startswith('.') or specifier.startswith('@/'):
+                    self.unresolved.setdefault(path, set()).add(specifier)
+                else:
+                    self.external.setdefault(path, set()).add(self._package_name(specifier))
+
+    def _package_name(self, specifier: str) -> str:
+        """Reduce a bare specifier to its npm package name"""
+        parts = specifier.split('/')
+        if specifier.startswith('@') and len(parts) > 1:
+            return '/'.join(parts[:2])
+        return parts[0]
+
+    def _closure(self, paths, edges: Dict[str, Set[str]]) -> Set[str]:
+        """Breadth-first closure over a set of edges, excluding the start nodes"""
+        start = {self._key(path) for path in self._as_list(paths)}
+        seen = set(start)
+        queue = deque(start)
+        while queue:
+            for neighbour in edges.get(queue.popleft(), ()):
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    queue.append(neighbour)
+        return seen - start
+
+    def _as_list(self, paths) -> List[str]:
+        return [paths] if isinstance(paths, str) else list(paths)
+
+    def _key(self, path: str) -> str:
+        path = Path(path)
+        if path.is_absolute():
+            try:
+                path = path.resolve().relative_to(self.project_root)
+            except ValueError:
+                pass
+        return path.as_posix()
+
+    def _load_cache(self) -> Dict:
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == GRAPH_CACHE_VERSION:
+                return data.get("modules", {})
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _save_cache(self):
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_file.with_name(self.cache_file.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": GRAPH_CACHE_VERSION, "modules": self.modules}, f)
+        os.replace(tmp_path, self.cache_file)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Dependency Installation for Prism Writing Development Automation
+
+This module installs the npm packages a request needs in a single batched
+`npm install a b c` call, not one `npm install` per package. Each separate
+call re-resolves the whole dependency tree and rewrites package-lock.json.
+Packages are first checked against an index of package.json and the
+lockfile. A package that is already declared, locked and present in
+node_modules (lucide-react and zod for most requests) is skipped. If
+everything requested is already there, npm is not run at all.
+
+The index is cached in .automation_cache/dependency_index.json and keyed
+by a hash of package.json and the lockfile. It is rebuilt only after one
+of them changes.
+"""
+
+import os
+import json
+import shlex
+import hashlib
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from toolchain import get_toolchain
+
+DEPENDENCY_INDEX_VERSION = 1
+
+# package.json sections that make a package a direct dependency
+DEPENDENCY_SECTIONS = ["dependencies", "devDependencies", "optionalDependencies", "peerDependencies"]
+
+LOCKFILE = "package-lock.json"
+
+
+def parse_spec(spec: str) -> Tuple[str, Optional[str]]:
+    """Split "name@range" into (name, range); scoped names keep their leading @"""
+    spec = spec.strip()
+    at = spec.find("@", 1)
+    if at == -1:
+        return spec, None
+    return spec[:at], spec[at + 1:] or None
+
+
+class PrismDependencyInstaller:
+    """Lockfile-aware, batched npm installs"""
+
+    def __init__(self, project_root: str, cache_dir: Optional[str] = None):
+        self.project_root = Path(project_root).resolve()
+        self.cache_dir = Path(cache_dir) if cache_dir else self.project_root / ".automation_cache"
+        self.index_file = self.cache_dir / "dependency_index.json"
+        self.toolchain = get_toolchain(str(self.project_root))
+        self._index: Optional[Dict] = None
+
+    def index(self) -> Dict:
+        """Declared specs and locked versions of the direct dependencies
+
+        Returns {"key", "declared": {name: spec}, "dev": [names], "locked":
+        {name: version}}. The cache is reused while package.json and the
+        lockfile hash the same.
+        """
+        key = self._state_key()
+        if self._index is not None and self._index["key"] == key:
+            return self._index
+
+        cached = self._load_index()
+        if cached is not None and cached.get("key") == key:
+            self._index = cached
+            return cached
+
+        self._index = self._build_index(key)
+        self._save_index(self._index)
+        return self._index
+
+    def plan(self, requested: List[str]) -> Dict:
+        """Split requested package specs into the ones to install and the ones already satisfied"""
+        index = self.index()
+        plan = {"install": [], "satisfied": [], "reasons": {}}
+
+        for spec in dict.fromkeys(item.strip() for item in requested if item and item.strip()):
+            name, wanted = parse_spec(spec)
+            declared = index["declared"].get(name)
+            locked = index["locked"].get(name)
+
+            if declared is None:
+                reason = "not in package.json"
+            elif locked is None:
+                reason = f"not in {LOCKFILE}"
+            elif not (self.project_root / "node_modules" / name / "package.json").is_file():
+                reason = "not in node_modules"
+            elif wanted is not None and wanted not in (declared, locked):
+                reason = f"{declared} declared, {wanted} requested"
+            else:
+                plan["satisfied"].append(spec)
+                continue
+
+            plan["install"].append(spec)
+            plan["reasons"][spec] = reason
+        return plan
+
+    def command(self, packages: List[str], dev: bool = False) -> List[str]:
+        """argv of the single npm invocation that installs every package"""
+        argv = self.toolchain.npm("install", "--no-audit", "--no-fund")
+        if dev:
+            argv.append("--save-dev")
+        return argv + packages
+
+    def install(self, requested: List[str], run: Callable[[List[str]], object], dev: bool = False) -> Dict:
+        """Install what the project does not already have, in one npm call
+
+        run(argv) executes the command and raises on failure (the
+        automator's run_command). Returns {"status": "success"|"skipped"|
+        "failed", "success", "installed", "satisfied", "reasons",
+        "command"?, "error"?}.
+        """
+        plan = self.plan(requested)
+        result = {
+            "status": "skipped",
+            "success": True,
+            "installed": [],
+            "satisfied": plan["satisfied"],
+            "reasons": plan["reasons"]
+        }
+        if not plan["install"]:
+            return result
+
+        argv = self.command(plan["install"], dev=dev)
+        result["command"] = ' '.join(shlex.quote(arg) for arg in argv)
+        try:
+            run(argv)
+        except Exception as e:
+            result.update({"status": "failed", "success": False, "error": str(e)})
+        else:
+            result.update({"status": "success", "installed": plan["install"]})
+        finally:
+            # npm may have touched package.json or the lockfile even when it failed
+            self._index = None
+        return result
+
+    def _state_key(self) -> str:
+        digest = hashlib.sha256(f"prism-deps-v{DEPENDENCY_INDEX_VERSION}\n".encode())
+        for name in ("package.json", LOCKFILE):
+            try:
+                digest.update(name.encode() + b"\0" + (self.project_root / name).read_bytes() + b"\n")
+            except FileNotFoundError:
+                digest.update(f"{name}\0missing\n".encode())
+        return digest.hexdigest()
+
+    def _build_index(self, key: str) -> Dict:
+        declared, dev = {}, []
+        package = self._read_json(self.project_root / "package.json") or {}
+        for section in DEPENDENCY_SECTIONS:
+            for name, spec in (package.get(section) or {}).items():
+                declared.setdefault(name, spec)
+                if section == "devDependencies":
+                    dev.append(name)
+
+        locked = {}
+        lockfile = self._read_json(self.project_root / LOCKFILE) or {}
+        if "packages" in lockfile:
+            # lockfileVersion 2 and 3: top-level installs live at "node_modules/<name>"
+            for path, entry in lockfile["packages"].items():
+                if path.startswith("node_modules/") and "/node_modules/" not in path and "version" in entry:
+                    locked[path[len("node_modules/"):]] = entry["version"]
+        else:
+            for name, entry in (lockfile.get("dependencies") or {}).items():
+                if "version" in entry:
+                    locked[name] = entry["version"]
+
+        return {"key": key, "declared": declared, "dev": sorted(dev), "locked": locked}
+
+    def _load_index(self) -> Optional[Dict]:
+        data = self._read_json(self.index_file)
+        if data and data.get("version") == DEPENDENCY_INDEX_VERSION:
+            return data.get("index")
+        return None
+
+    def _save_index(self, index: Dict):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_file.with_name(self.index_file.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": DEPENDENCY_INDEX_VERSION, "index": index}, f)
+            os.replace(tmp_path, self.index_file)
+        except OSError:
+            # The index is only a cache; it is rebuilt next time
+            pass
+
+    def _read_json(self, path: Path) -> Optional[Dict]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
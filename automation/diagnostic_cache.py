@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Diagnostic Cache for Prism Writing Development Automation
+
+This module turns ESLint and tsc output into structured diagnostic records
+and caches them per file. A file's cache key combines its content hash with
+a hash of the tool's configuration (and, for tsc, the content hashes of
+everything the file imports, since types flow through imports, and of every
+.d.ts file, since ambient declarations apply without an import). On re-runs
+only files whose key changed are handed to the tool; the rest reuse their
+cached records, which also go straight into the session log without being
+re-parsed from stdout.
+
+Record format:
+    {"file", "line", "column", "end_line", "end_column",
+     "severity": "error"|"warning", "rule", "message", "tool"}
+"""
+
+import os
+import json
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from file_index import PrismFileIndex
+from ts_session import TSC_DIAGNOSTIC
+
+DIAGNOSTIC_CACHE_VERSION = 1
+
+# Files whose content changes what a tool reports for every file
+TOOL_CONFIG_FILES = {
+    "eslint": [
+        ".eslintrc", ".eslintrc.json", ".eslintrc.js", ".eslintrc.cjs", ".eslintrc.yml", ".eslintrc.yaml",
+        "eslint.config.js", "eslint.config.mjs", "eslint.config.cjs", ".eslintignore",
+        "package.json", "package-lock.json", "tsconfig.json"
+    ],
+    "tsc": ["tsconfig.json", "next-env.d.ts", "package.json", "package-lock.json"],
+    "prettier": [
+        ".prettierrc", ".prettierrc.json", ".prettierrc.js", ".prettierrc.cjs", ".prettierrc.mjs",
+        ".prettierrc.yml", ".prettierrc.yaml", "prettier.config.js", "prettier.config.cjs", "prettier.config.mjs",
+        ".prettierignore", ".editorconfig", "package.json", "package-lock.json"
+    ]
+}
+
+
+def parse_eslint_json(text: str, project_root: Path) -> Dict[str, List[Dict]]:
+    """Parse `eslint --format json` output into records keyed by relative path"""
+    results = {}
+    for file_report in json.loads(text or "[]"):
+        path = Path(file_report["filePath"])
+        try:
+            path = path.resolve().relative_to(project_root)
+        except ValueError:
+            pass
+        records = results.setdefault(path.as_posix(), [])
+        for message in file_report.get("messages", []):
+            records.append({
+                "file": path.as_posix(),
+                "line": message.get("line", 0),
+                "column": message.get("column", 0),
+                "end_line": message.get("endLine"),
+                "end_column": message.get("endColumn"),
+                "severity": "error" if message.get("severity") == 2 or message.get("fatal") else "warning",
+                "rule": message.get("ruleId") or ("parse-error" if message.get("fatal") else None),
+                "message": message.get("message", ""),
+                "tool": "eslint"
+            })
+    return results
+
+
+def parse_tsc_output(lines: Iterable[str]) -> Dict[str, List[Dict]]:
+    """Parse `tsc --pretty false` output (continuation lines are joined to their diagnostic)"""
+    results: Dict[str, List[Dict]] = {}
+    current: Optional[Dict] = None
+
+    for raw_line in lines:
+        line = raw_line.rstrip('\n')
+        match = TSC_DIAGNOSTIC.match(line.strip())
+        if match:
+            path = Path(match.group("file")).as_posix()
+            current = {
+                "file": path,
+                "line": int(match.group("line")),
+                "column": int(match.group("column")),
+                "end_line": None,
+                "end_column": None,
+                "severity": match.group("category"),
+                "rule": match.group("code"),
+                "message": match.group("message"),
+                "tool": "tsc"
+            }
+            results.setdefault(path, []).append(current)
+        elif current is not None and line.startswith(' ') and line.strip():
+            # Message chains ("Type 'x' is not assignable ... \n  Property 'y' is missing")
+            current["message"] += "\n" + line.strip()
+        else:
+            current = None
+    return results
+
+
+def format_diagnostic(record: Dict) -> str:
+    """Render a record the way the tool itself would on one line"""
+    rule = f" [{record['rule']}]" if record.get("rule") else ""
+    return f"{record['file']}:{record['line']}:{record['column']}: {record['severity']}{rule} {record['message']}"
+
+
+class PrismDiagnosticCache:
+    """Per-file diagnostic records keyed by content, dependency and config hashes"""
+
+    def __init__(self, project_root: str, file_index: Optional[PrismFileIndex] = None, dependency_graph=None):
+        self.project_root = Path(project_root).resolve()
+        self.file_index = file_index or PrismFileIndex(str(self.project_root))
+        self.dependency_graph = dependency_graph
+        self.cache_file = self.file_index.cache_dir / "diagnostics.json"
+        self.lock = threading.Lock()
+        self.tools: Dict[str, Dict] = {}
+        self.load()
+
+    def load(self):
+        """Load cached diagnostics from disk"""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == DIAGNOSTIC_CACHE_VERSION:
+                self.tools = data.get("tools", {})
+        except (OSError, ValueError):
+            self.tools = {}
+
+    def save(self):
+        """Write cached diagnostics to disk"""
+        with self.lock:
+            self.file_index.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_file.with_name(self.cache_file.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": DIAGNOSTIC_CACHE_VERSION, "tools": self.tools}, f)
+            os.replace(tmp_path, self.cache_file)
+
+    def config_hash(self, tool: str) -> str:
+        """Hash of the configuration files that affect a tool"""
+        digest = hashlib.sha256(tool.encode())
+        for name in TOOL_CONFIG_FILES.get(tool, []):
+            entry = self.file_index.update(name)
+            if entry is not None:
+                digest.update(f"{name}\0{entry['hash']}\n".encode())
+        if tool == "tsc":
+            # Ambient declarations reach every file without being imported
+            for name in self.file_index.list("", "**/*.d.ts"):
+                entry = self.file_index.get(name)
+                if entry is not None:
+                    digest.update(f"{name}\0{entry['hash']}\n".encode())
+        return digest.hexdigest()
+
+    def file_key(self, tool: str, path: str, config_hash: Optional[str] = None) -> Optional[str]:
+        """Cache key of a file for a tool, or None if the file does not exist"""
+        entry = self.file_index.update(path)
+        if entry is None:
+            return None
+
+        config_hash = config_hash or self.config_hash(tool)
+        digest = hashlib.sha256(f"{config_hash}\0{entry['hash']}\n".encode())
+        if tool == "tsc" and self.dependency_graph is not None:
+            for dependency in sorted(self.dependency_graph.transitive_dependencies(path)):
+                dependency_entry = self.file_index.update(dependency)
+                if dependency_entry is not None:
+                    digest.update(f"{dependency}\0{dependency_entry['hash']}\n".encode())
+        return digest.hexdigest()
+
+    def lookup(self, tool: str, paths: List[str]) -> Dict:
+        """Split paths into cached records and files that need the tool
+
+        Returns {"cached": {path: [records]}, "stale": [paths], "keys": {path: key}}.
+        """
+        files = self.tools.get(tool, {})
+        config_hash = self.config_hash(tool)
+        result = {"cached": {}, "stale": [], "keys": {}}
+        for path in paths:
+            key = self.file_key(tool, path, config_hash)
+            if key is None:
+                continue
+            result["keys"][path] = key
+            cached = files.get(path)
+            if cached and cached["key"] == key:
+                result["cached"][path] = cached["diagnostics"]
+            else:
+                result["stale"].append(path)
+        return result
+
+    def store(self, tool: str, keys: Dict[str, str], diagnostics: Dict[str, List[Dict]]):
+        """Record fresh results for every checked file (files without findings get [])"""
+        with self.lock:
+            files = self.tools.setdefault(tool, {})
+            for path, key in keys.items():
+                files[path] = {"key": key, "diagnostics": diagnostics.get(path, [])}
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Diff Engine for Prism Writing Development Automation
+
+This module computes line diffs for the confirmation preview. Lines are
+interned to integers, the common prefix and suffix are stripped, and the
+remaining region is split recursively on patience anchors (lines unique on
+both sides). Regions without unique lines go through a linear-space Myers
+bisection with a cost cap; when that cap is hit, the region is split on its
+rarest shared line instead (the histogram heuristic). That keeps
+multi-thousand-line files interactive where difflib's quadratic matcher
+stalls.
+"""
+
+import os
+import sys
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+# Lines occurring more often than this are never used as histogram anchors
+HISTOGRAM_LIMIT = 64
+# Myers edit distance past which the exact search gives way to heuristic splits
+MAX_MYERS_COST = 512
+
+COLORS = {
+    "header": "\033[1m",
+    "hunk": "\033[36m",
+    "delete": "\033[31m",
+    "insert": "\033[32m",
+    "reset": "\033[0m",
+}
+
+
+def _intern(old_lines: List[str], new_lines: List[str]) -> Tuple[List[int], List[int]]:
+    """Map lines to integer ids so comparisons are cheap"""
+    ids: Dict[str, int] = {}
+    a = [ids.setdefault(line, len(ids)) for line in old_lines]
+    b = [ids.setdefault(line, len(ids)) for line in new_lines]
+    return a, b
+
+
+def _longest_increasing(pairs: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Patience sort: longest chain of pairs increasing in both coordinates"""
+    tails: List[int] = []
+    tail_index: List[int] = []
+    previous = [-1] * len(pairs)
+
+    for index, (_, j) in enumerate(pairs):
+        slot = bisect_left(tails, j)
+        if slot:
+            previous[index] = tail_index[slot - 1]
+        if slot == len(tails):
+            tails.append(j)
+            tail_index.append(index)
+        else:
+            tails[slot] = j
+            tail_index[slot] = index
+
+    chain = []
+    index = tail_index[-1] if tail_index else -1
+    while index != -1:
+        chain.append(pairs[index])
+        index = previous[index]
+    chain.reverse()
+    return chain
+
+
+class PrismDiffEngine:
+    """Line diff with unified, optionally colored, hunk rendering"""
+
+    def __init__(self, context: int = 3, color: Optional[bool] = None):
+        self.context = context
+        if color is None:
+            color = sys.stdout.isatty() and "NO_COLOR" not in os.environ
+        self.color = color
+
+    def diff(self, old: str, new: str) -> Dict:
+        """Diff two texts; returns lines, opcodes and insertion/deletion counts"""
+        old_lines = old.splitlines()
+        new_lines = new.splitlines()
+        opcodes = self.opcodes(old_lines, new_lines)
+
+        insertions = sum(j2 - j1 for tag, _, _, j1, j2 in opcodes if tag in ("insert", "replace"))
+        deletions = sum(i2 - i1 for tag, i1, i2, _, _ in opcodes if tag in ("delete", "replace"))
+        return {
+            "old_lines": old_lines,
+            "new_lines": new_lines,
+            "opcodes": opcodes,
+            "insertions": insertions,
+            "deletions": deletions
+        }
+
+    def opcodes(self, old_lines: List[str], new_lines: List[str]) -> List[Tuple[str, int, int, int, int]]:
+        """difflib-compatible opcodes (equal/replace/delete/insert)"""
+        a, b = _intern(old_lines, new_lines)
+        blocks = sorted(self._matching_blocks(a, b))
+
+        opcodes = []
+        i = j = 0
+        for ai, bj, size in blocks + [(len(a), len(b), 0)]:
+            if i < ai and j < bj:
+                opcodes.append(("replace", i, ai, j, bj))
+            elif i < ai:
+                opcodes.append(("delete", i, ai, j, j))
+            elif j < bj:
+                opcodes.append(("insert", i, i, j, bj))
+            if size:
+                if opcodes and opcodes[-1][0] == "equal":
+                    # Merge adjacent anchors into one run
+                    _, ei1, _, ej1, _ = opcodes.pop()
+                    opcodes.append(("equal", ei1, ai + size, ej1, bj + size))
+                else:
+                    opcodes.append(("equal", ai, ai + size, bj, bj + size))
+            i, j = ai + size, bj + size
+        return opcodes
+
+    def _matching_blocks(self, a: List[int], b: List[int]) -> List[Tuple[int, int, int]]:
+        """Collect (a_start, b_start, length) runs using an explicit work stack"""
+        blocks = []
+        stack = [(0, len(a), 0, len(b))]
+
+        while stack:
+            alo, ahi, blo, bhi = stack.pop()
+
+            # Common prefix and suffix
+            start = 0
+            while alo + start < ahi and blo + start < bhi and a[alo + start] == b[blo + start]:
+                start += 1
+            if start:
+                blocks.append((alo, blo, start))
+                alo += start
+                blo += start
+            end = 0
+            while alo < ahi - end and blo < bhi - end and a[ahi - end - 1] == b[bhi - end - 1]:
+                end += 1
+            if end:
+                blocks.append((ahi - end, bhi - end, end))
+                ahi -= end
+                bhi -= end
+
+            if alo == ahi or blo == bhi:
+                continue
+
+            anchors = self._patience_anchors(a, b, alo, ahi, blo, bhi)
+            if anchors:
+                previous_a, previous_b = alo, blo
+                for i, j in anchors:
+                    blocks.append((i, j, 1))
+                    stack.append((previous_a, i, previous_b, j))
+                    previous_a, previous_b = i + 1, j + 1
+                stack.append((previous_a, ahi, previous_b, bhi))
+                continue
+
+            if set(a[alo:ahi]).isdisjoint(b[blo:bhi]):
+                # Nothing in common: a plain replacement
+                continue
+
+            split, exact = self._myers_split(a, b, alo, ahi, blo, bhi)
+            if not exact:
+                # Too costly for an exact split: prefer a rare shared line, else the Myers frontier
+                split = self._histogram_split(a, b, alo, ahi, blo, bhi) or split
+            if split is None:
+                continue
+
+            i, j, size = split
+            if size:
+                blocks.append((i, j, size))
+            stack.append((alo, i, blo, j))
+            stack.append((i + size, ahi, j + size, bhi))
+
+        return blocks
+
+    def _patience_anchors(self, a, b, alo, ahi, blo, bhi) -> List[Tuple[int, int]]:
+        """Lines that occur exactly once on each side, in a consistent order"""
+        counts: Dict[int, List[int]] = {}
+        for i in range(alo, ahi):
+            entry = counts.get(a[i])
+            if entry is None:
+                counts[a[i]] = [1, i, 0, -1]
+            else:
+                entry[0] += 1
+        for j in range(blo, bhi):
+            entry = counts.get(b[j])
+            if entry is not None:
+                entry[2] += 1
+                entry[3] = j
+
+        pairs = [(i, j) for count_a, i, count_b, j in counts.values() if count_a == 1 and count_b == 1]
+        if not pairs:
+            return []
+        pairs.sort()
+        return _longest_increasing(pairs)
+
+    def _histogram_split(self, a, b, alo, ahi, blo, bhi) -> Optional[Tuple[int, int, int]]:
+        """Split on the longest run through the rarest line shared by both sides"""
+        positions_b: Dict[int, List[int]] = {}
+        for j in range(blo, bhi):
+            positions_b.setdefault(b[j], []).append(j)
+
+        positions_a: Dict[int, List[int]] = {}
+        for i in range(alo, ahi):
+            if a[i] in positions_b:
+                positions_a.setdefault(a[i], []).append(i)
+        if not positions_a:
+            return None
+
+        rarest = min(positions_a, key=lambda line: len(positions_a[line]) + len(positions_b[line]))
+        if len(positions_a[rarest]) > HISTOGRAM_LIMIT or len(positions_b[rarest]) > HISTOGRAM_LIMIT:
+            return None
+
+        # Among equally long runs prefer the one nearest the region's diagonal
+        n, m = ahi - alo, bhi - blo
+        best = None
+        best_key = None
+        for i in positions_a[rarest]:
+            for j in positions_b[rarest]:
+                start_i, start_j = i, j
+                while start_i > alo and start_j > blo and a[start_i - 1] == b[start_j - 1]:
+                    start_i -= 1
+                    start_j -= 1
+                end_i, end_j = i + 1, j + 1
+                while end_i < ahi and end_j < bhi and a[end_i] == b[end_j]:
+                    end_i += 1
+                    end_j += 1
+                key = (end_i - start_i, -abs((start_i - alo) * m - (start_j - blo) * n))
+                if best_key is None or key > best_key:
+                    best_key = key
+                    best = (start_i, start_j, end_i - start_i)
+        return best
+
+    def _myers_split(self, a, b, alo, ahi, blo, bhi):
+        """Linear-space Myers bisection; returns (split, exact)
+
+        Past MAX_MYERS_COST the furthest point reached by either search is
+        returned instead (GNU diff's "too expensive" heuristic), so the
+        region still shrinks. The split is None when nothing is in common.
+        """
+        n = ahi - alo
+        m = bhi - blo
+        max_d = min((n + m + 1) // 2, MAX_MYERS_COST)
+        offset = max_d + 1
+        size = 2 * offset + 1
+        forward = [-1] * size
+        backward = [-1] * size
+        forward[offset + 1] = 0
+        backward[offset + 1] = 0
+        delta = n - m
+        odd = delta % 2 != 0
+        k1_start = k1_end = k2_start = k2_end = 0
+
+        for d in range(max_d):
+            for k1 in range(-d + k1_start, d + 1 - k1_end, 2):
+                index = offset + k1
+                if k1 == -d or (k1 != d and forward[index - 1] < forward[index + 1]):
+                    x1 = forward[index + 1]
+                else:
+                    x1 = forward[index - 1] + 1
+                y1 = x1 - k1
+                while x1 < n and y1 < m and a[alo + x1] == b[blo + y1]:
+                    x1 += 1
+                    y1 += 1
+                forward[index] = x1
+                if x1 > n:
+                    k1_end += 2
+                elif y1 > m:
+                    k1_start += 2
+                elif odd:
+                    other = offset + delta - k1
+                    if 0 <= other < size and backward[other] != -1 and x1 >= n - backward[other]:
+                        return (alo + x1, blo + y1, 0), True
+
+            for k2 in range(-d + k2_start, d + 1 - k2_end, 2):
+                index = offset + k2
+                if k2 == -d or (k2 != d and backward[index - 1] < backward[index + 1]):
+                    x2 = backward[index + 1]
+                else:
+                    x2 = backward[index - 1] + 1
+                y2 = x2 - k2
+                while x2 < n and y2 < m and a[ahi - x2 - 1] == b[bhi - y2 - 1]:
+                    x2 += 1
+                    y2 += 1
+                backward[index] = x2
+                if x2 > n:
+                    k2_end += 2
+                elif y2 > m:
+                    k2_start += 2
+                elif not odd:
+                    other = offset + delta - k2
+                    if 0 <= other < size and forward[other] != -1:
+                        x1 = forward[other]
+                        y1 = x1 - (other - offset)
+                        if x1 >= n - x2:
+                            return (alo + x1, blo + y1, 0), True
+
+        if max_d == (n + m + 1) // 2:
+            # Searched the full edit graph without overlap: no common lines
+            return None, True
+        return self._frontier_split(forward, backward, offset, n, m, alo, blo), False
+
+    def _frontier_split(self, forward, backward, offset, n, m, alo, blo) -> Optional[Tuple[int, int, int]]:
+        """The furthest-reaching point of the forward or backward Myers search"""
+        best = None
+        best_progress = 0
+        for index, x in enumerate(forward):
+            y = x - (index - offset)
+            if x > 0 and 0 <= y <= m and x <= n and x + y > best_progress and x + y < n + m:
+                best_progress = x + y
+                best = (alo + x, blo + y, 0)
+        for index, x in enumerate(backward):
+            y = x - (index - offset)
+            if x > 0 and 0 <= y <= m and x <= n and x + y > best_progress and x + y < n + m:
+                best_progress = x + y
+                best = (alo + n - x, blo + m - y, 0)
+        return best
+
+    def hunks(self, opcodes: List[Tuple[str, int, int, int, int]]) -> List[List[Tuple[str, int, int, int, int]]]:
+        """Group opcodes into hunks with self.context lines of context"""
+        context = self.context
+        if not opcodes or all(tag == "equal" for tag, *_ in opcodes):
+            return []
+
+        codes = list(opcodes)
+        tag, i1, i2, j1, j2 = codes[0]
+        if tag == "equal":
+            codes[0] = (tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2)
+        tag, i1, i2, j1, j2 = codes[-1]
+        if tag == "equal":
+            codes[-1] = (tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context))
+
+        groups = []
+        group = []
+        for tag, i1, i2, j1, j2 in codes:
+            if tag == "equal" and i2 - i1 > 2 * context and group:
+                group.append((tag, i1, i1 + context, j1, j1 + context))
+                groups.append(group)
+                group = []
+                i1, j1 = i2 - context, j2 - context
+            group.append((tag, i1, i2, j1, j2))
+        if group and not (len(group) == 1 and group[0][0] == "equal"):
+            groups.append(group)
+        return groups
+
+    def render(self, path: str, old: Optional[str], new: str) -> Dict:
+        """Render a unified diff for one file; old is None for new files"""
+        result = self.diff(old or "", new)
+        old_label = "/dev/null" if old is None else f"a/{path}"
+
+        out = [
+            self._paint("header", f"--- {old_label}"),
+            self._paint("header", f"+++ b/{path}")
+        ]
+        old_lines, new_lines = result["old_lines"], result["new_lines"]
+        for group in self.hunks(result["opcodes"]):
+            i1, i2 = group[0][1], group[-1][2]
+            j1, j2 = group[0][3], group[-1][4]
+            out.append(self._paint("hunk", f"@@ -{self._range(i1, i2)} +{self._range(j1, j2)} @@"))
+            for tag, a1, a2, b1, b2 in group:
+                if tag == "equal":
+                    out.extend(f" {line}" for line in old_lines[a1:a2])
+                    continue
+                out.extend(self._paint("delete", f"-{line}") for line in old_lines[a1:a2])
+                out.extend(self._paint("insert", f"+{line}") for line in new_lines[b1:b2])
+
+        return {
+            "path": path,
+            "action": "create" if old is None else "modify",
+            "insertions": result["insertions"],
+            "deletions": result["deletions"],
+            "text": '\n'.join(out)
+        }
+
+    def _range(self, start: int, stop: int) -> str:
+        """Unified diff range notation"""
+        length = stop - start
+        first = start + 1 if length else start
+        return f"{first}" if length == 1 else f"{first},{length}"
+
+    def _paint(self, kind: str, text: str) -> str:
+        if not self.color:
+            return text
+        return f"{COLORS[kind]}{text}{COLORS['reset']}"
@@ -14,13 +14,16 @@ from typing import Dict, List, Optional, Tuple
 import subprocess
 import yaml
 
+from template_engine import PrismTemplateEngine
+
 class PrismAIAssistant:
     """Enhanced AI assistant for development automation"""
     
-    def __init__(self, config: Dict, project_root: str):
+    def __init__(self, config: Dict, project_root: str, templates: Optional[Dict[str, str]] = None):
         self.config = config
         self.project_root = Path(project_root)
         self.context_cache = {}
+        self.templates = PrismTemplateEngine(templates)
         
     def analyze_request(self, request: str) -> Dict:
         """Analyze development request and create implementation plan"""
@@ -434,89 +437,40 @@ class PrismAIAssistant:
     def generate_page_code(self, description: str, context: Dict) -> str:
         """Generate Next.js page component code"""
         page_name = context.get("page_name", "NewPage")
-        
-        template = f'''import {{ Metadata }} from 'next'
+        page_slug = context.get("page_slug", re.sub(r'(?<=[a-z0-9])(?=[A-Z])', '-', page_name).lower())
 
-export const metadata: Metadata = {{
-  title: '{page_name} | Prism Writing Services',
-  description: 'Professional writing services for {page_name.lower()}',
-}}
-
-export default function {page_name}Page() {{
-  return (
-    <div className="min-h-screen bg-white dark:bg-gray-900">
-      <div className="container mx-auto px-4 py-8">
-        <h1 className="text-4xl font-bold text-gray-900 dark:text-white mb-8">
-          {page_name}
-        </h1>
-        
-        {{/* TODO: Add {page_name.lower()} content based on: {description} */}}
-        <div className="space-y-6">
-          <p className="text-lg text-gray-600 dark:text-gray-300">
-            Content for {page_name.lower()} page will be implemented here.
-          </p>
-        </div>
-      </div>
-    </div>
-  )
-}}
-'''
-        return template
+        return self.render_template("page", description, {
+            **context,
+            "page_name": page_name,
+            "page_slug": page_slug,
+            "PageName": page_name,
+            "page-slug": page_slug,
+            "sections": context.get("sections", []),
+        })
     
     def generate_component_code(self, description: str, context: Dict) -> str:
         """Generate React component code"""
         component_name = context.get("component_name", "NewComponent")
-        
-        template = f'''interface {component_name}Props {{
-  // TODO: Define props based on: {description}
-}}
 
-export default function {component_name}({{ }}: {component_name}Props) {{
-  return (
-    <div className="bg-white dark:bg-gray-800 rounded-lg shadow-md p-6">
-      <h2 className="text-2xl font-semibold text-gray-900 dark:text-white mb-4">
-        {component_name}
-      </h2>
-      
-      {{/* TODO: Implement {component_name.lower()} functionality based on: {description} */}}
-      <div className="space-y-4">
-        <p className="text-gray-600 dark:text-gray-300">
-          {component_name} content will be implemented here.
-        </p>
-      </div>
-    </div>
-  )
-}}
-'''
-        return template
+        return self.render_template("component", description, {
+            **context,
+            "component_name": component_name,
+            "ComponentName": component_name,
+            "props": context.get("props", []),
+        })
     
     def generate_layout_code(self, description: str, context: Dict) -> str:
         """Generate Next.js layout code"""
-        page_name = context.get("page_name", "page")
-        
-        template = f'''import {{ Metadata }} from 'next'
-
-export const metadata: Metadata = {{
-  title: {{
-    template: '%s | Prism Writing Services',
-    default: '{page_name.title()} | Prism Writing Services',
-  }},
-  description: 'Professional writing services - {description}',
-}}
-
-export default function {page_name.title()}Layout({{
-  children,
-}}: {{
-  children: React.ReactNode
-}}) {{
-  return (
-    <div className="min-h-screen bg-gray-50 dark:bg-gray-900">
-      {{children}}
-    </div>
-  )
-}}
-'''
-        return template
+        return self.render_template("layout", description, {
+            **context,
+            "page_name": context.get("page_name", "page"),
+        })
+    
+    def render_template(self, name: str, description: str, context: Dict) -> str:
+        """Render a file_templates entry, falling back to generic code if it is not configured"""
+        if not self.templates.has_template(name):
+            return self.generate_generic_code(description, context)
+        return self.templates.render(name, {**context, "description": description})
     
     def generate_generic_code(self, description: str, context: Dict) -> str:
         """Generate generic code based on description"""
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+File Index for Prism Writing Development Automation
+
+This module keeps a persistent index of every project file under
+.automation_cache/ with its size, mtime, line count, content hash and type.
+On startup the index is refreshed incrementally: files whose size and mtime
+are unchanged keep their cached record, so only new or edited files are read.
+When watchdog is installed the index can also follow filesystem events
+(inotify on Linux) and stay current without rescanning.
+"""
+
+import os
+import re
+import json
+import atexit
+import hashlib
+import threading
+from stat import S_ISREG
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+INDEX_VERSION = 1
+
+# Directories that are never indexed (dependencies, build output, tool caches, automation state)
+EXCLUDED_DIRS = {
+    ".git",
+    ".next",
+    ".vercel",
+    "node_modules",
+    "__pycache__",
+    ".venv",
+    "venv",
+    ".pytest_cache",
+    ".mypy_cache",
+    ".automation_backups",
+    ".automation_cache",
+    ".automation_staging",
+}
+
+
+def classify_file_type(path: str) -> str:
+    """Determine the file type from its suffix"""
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix in ['.tsx', '.ts']:
+        return "typescript"
+    elif suffix in ['.jsx', '.js']:
+        return "javascript"
+    elif suffix in ['.css', '.scss']:
+        return "stylesheet"
+    elif suffix == '.json':
+        return "json"
+    elif suffix == '.md':
+        return "markdown"
+    return "other"
+
+
+def glob_to_regex(pattern: str) -> re.Pattern:
+    """Translate a pathlib-style glob pattern into a regex over POSIX paths"""
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 1:]:
+            end = pattern.index("]", i + 1)
+            body = pattern[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            parts.append(f"[{body}]")
+            i = end + 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(parts) + r"\Z")
+
+
+class _IndexEventHandler(FileSystemEventHandler):
+    """Forward filesystem events to the index"""
+
+    def __init__(self, index: "PrismFileIndex"):
+        self.index = index
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        for path in (event.src_path, getattr(event, "dest_path", None)):
+            if path:
+                self.index.update_absolute(path)
+
+
+class PrismFileIndex:
+    """Persistent, incrementally refreshed index of project files"""
+
+    def __init__(self, project_root: str, cache_dir: Optional[Path] = None):
+        self.project_root = Path(project_root).resolve()
+        self.cache_dir = Path(cache_dir) if cache_dir else self.project_root / ".automation_cache"
+        self.index_file = self.cache_dir / "file_index.json"
+        self.entries: Dict[str, Dict] = {}
+        self.refreshed = False
+        self.dirty = False
+        self.observer = None
+        self.lock = threading.RLock()
+
+        self.load()
+        atexit.register(self.save)
+
+    def load(self):
+        """Load the index from disk"""
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                self.entries = data.get("files", {})
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self):
+        """Write the index to disk if it changed"""
+        with self.lock:
+            if not self.dirty:
+                return
+
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_file.with_name(self.index_file.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": INDEX_VERSION, "files": self.entries}, f)
+            os.replace(tmp_path, self.index_file)
+            self.dirty = False
+
+    def ensure_fresh(self):
+        """Refresh the index once per session"""
+        if not self.refreshed:
+            self.refresh()
+
+    def refresh(self) -> Dict:
+        """Walk the project and re-index files whose size or mtime changed"""
+        stats = {"scanned": 0, "updated": 0, "removed": 0}
+        seen = set()
+
+        with self.lock:
+            stack = [self.project_root]
+            while stack:
+                directory = stack.pop()
+                try:
+                    with os.scandir(directory) as it:
+                        for entry in it:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name not in EXCLUDED_DIRS:
+                                    stack.append(entry.path)
+                            elif entry.is_file():
+                                key = Path(entry.path).relative_to(self.project_root).as_posix()
+                                seen.add(key)
+                                stats["scanned"] += 1
+                                if self._index_file(key, entry.path, entry.stat()):
+                                    stats["updated"] += 1
+                except OSError:
+                    continue
+
+            for key in list(self.entries):
+                if key not in seen:
+                    del self.entries[key]
+                    self.dirty = True
+                    stats["removed"] += 1
+
+            self.refreshed = True
+
+        self.save()
+        return stats
+
+    def update(self, file_path: str) -> Optional[Dict]:
+        """Re-check one project-relative path and return its record"""
+        key = Path(file_path).as_posix()
+        full_path = self.project_root / key
+
+        with self.lock:
+            try:
+                stat = full_path.stat()
+            except OSError:
+                if self.entries.pop(key, None) is not None:
+                    self.dirty = True
+                return None
+
+            if not S_ISREG(stat.st_mode):
+                return None
+
+            self._index_file(key, str(full_path), stat)
+            return self.entries.get(key)
+
+    def update_absolute(self, path: str):
+        """Re-check an absolute path if it belongs to the indexed tree"""
+        try:
+            relative = Path(path).resolve().relative_to(self.project_root)
+        except ValueError:
+            return
+        if any(part in EXCLUDED_DIRS for part in relative.parts):
+            return
+        self.update(relative.as_posix())
+
+    def get(self, file_path: str) -> Optional[Dict]:
+        """Look up the record of a project-relative path"""
+        self.ensure_fresh()
+        return self.entries.get(Path(file_path).as_posix())
+
+    def contains(self, file_path: str) -> bool:
+        """Check if a path is in the index"""
+        return self.get(file_path) is not None
+
+    def is_indexed_path(self, file_path: str) -> bool:
+        """Check if a path lies inside the indexed (non-excluded) tree"""
+        path = Path(file_path)
+        if path.is_absolute():
+            return False
+        return not any(part in EXCLUDED_DIRS for part in path.parts)
+
+    def list(self, directory: str, pattern: str = "*") -> List[str]:
+        """List indexed files under a directory matching a glob pattern"""
+        self.ensure_fresh()
+
+        prefix = Path(directory).as_posix().strip("/")
+        prefix = "" if prefix in ("", ".") else prefix + "/"
+        matcher = glob_to_regex(pattern)
+
+        with self.lock:
+            return sorted(
+                key for key in self.entries
+                if key.startswith(prefix) and matcher.match(key[len(prefix):])
+            )
+
+    def watch(self) -> bool:
+        """Follow filesystem events when watchdog is installed"""
+        if Observer is None or self.observer is not None:
+            return self.observer is not None
+
+        self.ensure_fresh()
+        self.observer = Observer()
+        self.observer.schedule(_IndexEventHandler(self), str(self.project_root), recursive=True)
+        self.observer.daemon = True
+        self.observer.start()
+        return True
+
+    def stop_watching(self):
+        """Stop following filesystem events"""
+        if self.observer is not None:
+            self.observer.stop()
+            self.observer.join()
+            self.observer = None
+        self.save()
+
+    def _index_file(self, key: str, path: str, stat: os.stat_result) -> bool:
+        """Store a record for a file, reading it only when size or mtime changed"""
+        cached = self.entries.get(key)
+        if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+            return False
+
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return False
+
+        lines = data.count(b'\n')
+        if data and not data.endswith(b'\n'):
+            lines += 1
+
+        self.entries[key] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "lines": lines,
+            "hash": hashlib.sha256(data).hexdigest(),
+            "type": classify_file_type(key)
+        }
+        self.dirty = True
+        return True
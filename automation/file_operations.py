@@ -7,13 +7,21 @@ backup, and validation for the automation system.
 """
 
 import os
-import shutil
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
+from contextlib import contextmanager
 import json
 import re
 from datetime import datetime
 
+from backup_store import PrismBackupStore
+from changeset import PrismChangeset, PrismPreviewChangeset
+from file_index import PrismFileIndex, classify_file_type
+from dependency_graph import PrismDependencyGraph, parse_module
+from ts_lexer import scan_source
+from modification_engine import PrismModificationPlan
+from patch_engine import parse_unified_diff, apply_hunks
+
 class PrismFileOperations:
     """Enhanced file operations for development automation"""
     
@@ -21,7 +29,84 @@ class PrismFileOperations:
         self.project_root = Path(project_root)
         self.backup_dir = self.project_root / ".automation_backups"
         self.backup_dir.mkdir(exist_ok=True)
+        self.backup_store = PrismBackupStore(self.backup_dir)
+        self.active_changeset: Optional[PrismChangeset] = None
+        self.file_index = PrismFileIndex(str(self.project_root))
+        self._dependency_graph: Optional[PrismDependencyGraph] = None
+    
+    @property
+    def dependency_graph(self) -> PrismDependencyGraph:
+        """Project-wide import graph, built on first use"""
+        if self._dependency_graph is None:
+            self._dependency_graph = PrismDependencyGraph(str(self.project_root), self.file_index)
+        return self._dependency_graph
+    
+    def begin_changeset(self) -> PrismChangeset:
+        """Start staging create_file/modify_file writes into a changeset"""
+        if self.active_changeset is not None:
+            raise RuntimeError("A changeset is already active")
+        
+        self.active_changeset = PrismChangeset(self.project_root, self.backup_store)
+        return self.active_changeset
+    
+    def end_changeset(self, commit: bool = True) -> Dict:
+        """Commit or roll back the active changeset"""
+        changeset = self.active_changeset
+        self.active_changeset = None
+        if changeset is None:
+            return {"status": "skipped", "error": None}
+        
+        if commit:
+            result = changeset.commit()
+            touched = result["files_written"]
+        else:
+            result = changeset.rollback()
+            touched = result["files_restored"] + result["files_removed"]
+        
+        for path in touched:
+            self.file_index.update(path)
+        self.file_index.save()
+        return result
+    
+    @contextmanager
+    def changeset(self):
+        """Stage writes for the duration of a block; commit on success, roll back on error"""
+        if self.active_changeset is not None:
+            # Nested blocks join the outer changeset
+            yield self.active_changeset
+            return
+        
+        changeset = self.begin_changeset()
+        try:
+            yield changeset
+        except BaseException:
+            self.end_changeset(commit=False)
+            raise
+        
+        if self.active_changeset is changeset:
+            commit_result = self.end_changeset(commit=True)
+            if commit_result["status"] != "success":
+                raise IOError(f"Changeset commit failed: {commit_result['error']}")
         
+    @property
+    def previewing(self) -> bool:
+        """Whether writes are being captured by a dry-run preview"""
+        return isinstance(self.active_changeset, PrismPreviewChangeset)
+    
+    @contextmanager
+    def preview(self):
+        """Capture create_file/modify_file writes in memory; nothing reaches the disk"""
+        if self.active_changeset is not None:
+            raise RuntimeError("A changeset is already active")
+        
+        changeset = PrismPreviewChangeset(self.project_root, self.backup_store)
+        self.active_changeset = changeset
+        try:
+            yield changeset
+        finally:
+            self.active_changeset = None
+            changeset.rollback()
+    
     def create_file(self, file_path: str, content: str, backup_existing: bool = True) -> Dict:
         """Create a new file with content"""
         full_path = self.project_root / file_path
@@ -34,6 +119,14 @@ class PrismFileOperations:
         }
         
         try:
+            if self.active_changeset is not None:
+                if self.file_exists(file_path):
+                    result["action"] = "replaced"
+                self.active_changeset.stage(file_path, content)
+                result["staged"] = True
+                result["size"] = len(content)
+                return result
+            
             # Create directory if it doesn't exist
             full_path.parent.mkdir(parents=True, exist_ok=True)
             
@@ -46,6 +139,7 @@ class PrismFileOperations:
             # Write the content
             with open(full_path, 'w', encoding='utf-8') as f:
                 f.write(content)
+            self.file_index.update(self._relative_key(full_path))
             
             result["size"] = len(content)
             
@@ -68,51 +162,50 @@ class PrismFileOperations:
         }
         
         try:
-            if not full_path.exists():
+            if not self.file_exists(file_path):
                 result["status"] = "failed"
                 result["error"] = "File does not exist"
                 return result
             
-            # Backup existing file
-            if backup_existing:
+            # Backup existing file (changesets back up their targets on commit)
+            if backup_existing and self.active_changeset is None:
                 backup_path = self.backup_file(full_path)
                 result["backup_path"] = str(backup_path)
             
             # Read current content
-            with open(full_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self.read_file(file_path)
+            if content is None:
+                if not full_path.exists():
+                    raise FileNotFoundError(str(full_path))
+                raise IOError("File could not be read")
             
-            # Apply modifications
-            modified_content = content
-            for modification in modifications:
-                if modification["type"] == "replace":
-                    modified_content = modified_content.replace(
-                        modification["search"],
-                        modification["replacement"]
-                    )
-                elif modification["type"] == "insert_after":
-                    modified_content = self.insert_after_pattern(
-                        modified_content,
-                        modification["pattern"],
-                        modification["content"]
-                    )
-                elif modification["type"] == "insert_before":
-                    modified_content = self.insert_before_pattern(
-                        modified_content,
-                        modification["pattern"],
-                        modification["content"]
-                    )
-                elif modification["type"] == "append":
-                    modified_content += modification["content"]
-                elif modification["type"] == "prepend":
-                    modified_content = modification["content"] + modified_content
-                
-                result["modifications_applied"] += 1
+            # Apply all modifications in a single compiled pass
+            plan = PrismModificationPlan(modifications)
+            modified_content = plan.apply(content)
+            if plan.hunks_applied:
+                result["hunks_applied"] = plan.hunks_applied
+            if plan.conflicts:
+                # Never write a partially applied patch
+                result["status"] = "failed"
+                result["conflicts"] = plan.conflicts
+                result["error"] = f"Patch conflicts in {len(plan.conflicts)} hunk(s)"
+                return result
+            result["modifications_applied"] = len(modifications)
             
             # Write modified content
-            with open(full_path, 'w', encoding='utf-8') as f:
-                f.write(modified_content)
+            if self.active_changeset is not None:
+                self.active_changeset.stage(file_path, modified_content)
+                result["staged"] = True
+            else:
+                with open(full_path, 'w', encoding='utf-8') as f:
+                    f.write(modified_content)
+                self.file_index.update(self._relative_key(full_path))
             
+        except FileNotFoundError:
+            # Deleted outside the automation; drop the stale index record
+            self.file_index.update(self._relative_key(full_path))
+            result["status"] = "failed"
+            result["error"] = "File does not exist"
         except Exception as e:
             result["status"] = "failed"
             result["error"] = str(e)
@@ -121,54 +214,106 @@ class PrismFileOperations:
     
     def insert_after_pattern(self, content: str, pattern: str, insert_content: str) -> str:
         """Insert content after a specific pattern"""
-        lines = content.split('\n')
-        new_lines = []
-        
-        for line in lines:
-            new_lines.append(line)
-            if pattern in line:
-                # Maintain indentation
-                indent = len(line) - len(line.lstrip())
-                indented_content = '\n'.join([
-                    ' ' * indent + line.strip() if line.strip() else ''
-                    for line in insert_content.split('\n')
-                ])
-                new_lines.append(indented_content)
-        
-        return '\n'.join(new_lines)
+        return PrismModificationPlan([{
+            "type": "insert_after",
+            "pattern": pattern,
+            "content": insert_content
+        }]).apply(content)
     
     def insert_before_pattern(self, content: str, pattern: str, insert_content: str) -> str:
         """Insert content before a specific pattern"""
-        lines = content.split('\n')
-        new_lines = []
-        
-        for line in lines:
-            if pattern in line:
-                # Maintain indentation
-                indent = len(line) - len(line.lstrip())
-                indented_content = '\n'.join([
-                    ' ' * indent + line.strip() if line.strip() else ''
-                    for line in insert_content.split('\n')
-                ])
-                new_lines.append(indented_content)
-            new_lines.append(line)
-        
-        return '\n'.join(new_lines)
+        return PrismModificationPlan([{
+            "type": "insert_before",
+            "pattern": pattern,
+            "content": insert_content
+        }]).apply(content)
     
-    def backup_file(self, file_path: Path) -> Path:
-        """Create a backup of an existing file"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_name = f"{file_path.name}.{timestamp}.backup"
-        backup_path = self.backup_dir / backup_name
+    def apply_patch(self, diff_text: str, fuzz: int = 2) -> Dict:
+        """Apply a (multi-file) unified diff atomically; any conflict leaves the tree untouched"""
+        result = {
+            "status": "success",
+            "files_created": [],
+            "files_modified": [],
+            "conflicts": {},
+            "error": None
+        }
+        
+        try:
+            files = parse_unified_diff(diff_text)
+            if not files:
+                raise ValueError("Diff contains no file changes")
+        
+            with self.changeset():
+                for file_patch in files:
+                    old_path, new_path = file_patch["old_path"], file_patch["new_path"]
+                    if new_path is None:
+                        raise ValueError(f"File deletion is not supported: {old_path}")
+                    if old_path is not None and old_path != new_path:
+                        raise ValueError(f"File renames are not supported: {old_path} -> {new_path}")
+        
+                    if old_path is None:
+                        report = apply_hunks("", file_patch["hunks"], fuzz=0)
+                        if report["conflicts"]:
+                            result["conflicts"][new_path] = report["conflicts"]
+                            continue
+                        file_result = self.create_file(new_path, report["content"])
+                        target_list = result["files_created"]
+                    else:
+                        file_result = self.modify_file(new_path, [{
+                            "type": "patch",
+                            "hunks": file_patch["hunks"],
+                            "fuzz": fuzz
+                        }])
+                        if file_result.get("conflicts"):
+                            result["conflicts"][new_path] = file_result["conflicts"]
+                            continue
+                        target_list = result["files_modified"]
+        
+                    if file_result["status"] != "success":
+                        raise IOError(f"{new_path}: {file_result['error']}")
+                    target_list.append(new_path)
+        
+                if result["conflicts"]:
+                    total = sum(len(conflicts) for conflicts in result["conflicts"].values())
+                    raise ValueError(f"Patch conflicts in {total} hunk(s) across {len(result['conflicts'])} file(s)")
+        
+        except Exception as e:
+            result["status"] = "failed"
+            result["error"] = str(e)
+            result["files_created"] = []
+            result["files_modified"] = []
         
-        shutil.copy2(file_path, backup_path)
-        return backup_path
+        return result
+    
+    def backup_file(self, file_path: Path) -> Path:
+        """Create a backup of an existing file in the content-addressed store"""
+        file_path = Path(file_path)
+        return self.backup_store.store(file_path, self._relative_key(file_path))
+    
+    def restore_backup(self, file_path: str, run_id: Optional[str] = None) -> bool:
+        """Restore a file to its state before the given (default: current) run"""
+        full_path = self.project_root / file_path
+        key = self._relative_key(full_path)
+        restored = self.backup_store.restore(key, full_path, run_id)
+        if restored:
+            self.file_index.update(key)
+        return restored
+    
+    def _relative_key(self, file_path: Path) -> str:
+        """Return the project-relative POSIX path used to key backups"""
+        try:
+            return file_path.resolve().relative_to(self.project_root.resolve()).as_posix()
+        except ValueError:
+            return file_path.resolve().as_posix()
     
     def read_file(self, file_path: str) -> Optional[str]:
         """Read content of a file"""
         full_path = self.project_root / file_path
         
         try:
+            if self.active_changeset is not None and self.active_changeset.is_staged(file_path):
+                return self.active_changeset.read_staged(file_path)
+            
             if full_path.exists():
                 with open(full_path, 'r', encoding='utf-8') as f:
                     return f.read()
@@ -179,12 +324,23 @@ class PrismFileOperations:
     
     def file_exists(self, file_path: str) -> bool:
         """Check if a file exists"""
+        if self.active_changeset is not None and self.active_changeset.is_staged(file_path):
+            return True
+        
         full_path = self.project_root / file_path
+        if self.file_index.contains(self._relative_key(full_path)):
+            return True
+        
+        # Paths outside the index (e.g. node_modules) still hit the filesystem
         return full_path.exists()
     
     def list_files(self, directory: str, pattern: str = "*") -> List[str]:
         """List files in a directory matching a pattern"""
         dir_path = self.project_root / directory
+        relative_dir = self._relative_key(dir_path)
+        
+        if self.file_index.is_indexed_path(relative_dir):
+            return self.file_index.list(relative_dir, pattern)
         
         if not dir_path.exists():
             return []
@@ -212,32 +368,11 @@ class PrismFileOperations:
                 result["errors"].append("File not found or empty")
                 return result
             
-            # Basic syntax checks
-            # Check for matching braces
-            if content.count('{') != content.count('}'):
+            # Structural check with a real lexer (strings, templates, regexes, comments, JSX)
+            scan = scan_source(content, file_path)
+            for error in scan["errors"]:
                 result["valid"] = False
-                result["errors"].append("Mismatched braces")
-            
-            # Check for matching parentheses
-            if content.count('(') != content.count(')'):
-                result["valid"] = False
-                result["errors"].append("Mismatched parentheses")
-            
-            # Check for missing semicolons (basic check)
-            lines = content.split('\n')
-            for i, line in enumerate(lines, 1):
-                stripped = line.strip()
-                if (stripped and 
-                    not stripped.startswith('//') and 
-                    not stripped.startswith('/*') and
-                    not stripped.endswith('{') and
-                    not stripped.endswith('}') and
-                    not stripped.endswith(',') and
-                    not stripped.endswith(';') and
-                    not stripped.startswith('import') and
-                    not stripped.startswith('export') and
-                    '=' in stripped):
-                    result["warnings"].append(f"Line {i}: Missing semicolon?")
+                result["errors"].append(f"Line {error['line']}, column {error['column']}: {error['message']}")
             
             # Check for React import
             if 'React' in content and 'import React' not in content:
@@ -259,9 +394,12 @@ class PrismFileOperations:
         }
         
         try:
-            self._create_structure_recursive(structure, self.project_root, result)
+            # Files are staged and applied together in one changeset
+            with self.changeset():
+                self._create_structure_recursive(structure, self.project_root, result)
         except Exception as e:
             result["status"] = "failed"
+            result["files_created"] = []
             result["errors"].append(str(e))
         
         return result
@@ -281,8 +419,10 @@ class PrismFileOperations:
             
             elif isinstance(value, str):
                 # It's a file with content
-                with open(current_path, 'w', encoding='utf-8') as f:
-                    f.write(value)
+                relative_path = self._relative_key(current_path)
+                file_result = self.create_file(relative_path, value)
+                if file_result["status"] != "success":
+                    raise IOError(f"Failed to create {relative_path}: {file_result['error']}")
                 result["files_created"].append(str(current_path.relative_to(self.project_root)))
     
     def get_file_info(self, file_path: str) -> Dict:
@@ -296,74 +436,61 @@ class PrismFileOperations:
             "last_modified": None
         }
         
-        if full_path.exists():
+        # One stat; the file is only re-read when its size or mtime changed
+        entry = self.file_index.update(self._relative_key(full_path))
+        if entry:
             info["exists"] = True
-            info["size"] = full_path.stat().st_size
-            info["last_modified"] = datetime.fromtimestamp(full_path.stat().st_mtime).isoformat()
-            
-            # Determine file type
-            suffix = full_path.suffix.lower()
-            if suffix in ['.tsx', '.ts']:
-                info["type"] = "typescript"
-            elif suffix in ['.jsx', '.js']:
-                info["type"] = "javascript"
-            elif suffix in ['.css', '.scss']:
-                info["type"] = "stylesheet"
-            elif suffix == '.json':
-                info["type"] = "json"
-            elif suffix == '.md':
-                info["type"] = "markdown"
-            else:
-                info["type"] = "other"
-            
-            # Count lines
-            try:
-                with open(full_path, 'r', encoding='utf-8') as f:
-                    info["lines"] = sum(1 for _ in f)
-            except Exception:
-                pass
+            info["size"] = entry["size"]
+            info["lines"] = entry["lines"]
+            info["type"] = entry["type"]
+            info["hash"] = entry["hash"]
+            info["last_modified"] = datetime.fromtimestamp(entry["mtime_ns"] / 1e9).isoformat()
+        elif full_path.exists():
+            # Directories are not indexed
+            stat = full_path.stat()
+            info["exists"] = True
+            info["size"] = stat.st_size
+            info["type"] = classify_file_type(full_path.name)
+            info["last_modified"] = datetime.fromtimestamp(stat.st_mtime).isoformat()
         
         return info
     
-    def find_imports(self, file_path: str) -> List[str]:
-        """Find all imports in a TypeScript/JavaScript file"""
-        content = self.read_file(file_path)
-        if not content:
-            return []
-        
-        imports = []
-        lines = content.split('\n')
+    def parse_module(self, file_path: str) -> Dict:
+        """Parse imports and exports of a file, reusing the graph cache when unchanged"""
+        full_path = self.project_root / file_path
+        key = self._relative_key(full_path)
         
-        for line in lines:
-            stripped = line.strip()
-            if stripped.startswith('import '):
-                imports.append(stripped)
+        if self.active_changeset is None or not self.active_changeset.is_staged(file_path):
+            entry = self.file_index.update(key)
+            graph = self._dependency_graph
+            if entry and graph is not None and graph.built:
+                module = graph.modules.get(key)
+                if module and module["hash"] == entry["hash"]:
+                    return module
         
-        return imports
+        content = self.read_file(file_path)
+        if not content:
+            return {"imports": [], "exports": []}
+        return parse_module(content, str(file_path))
+    
+    def find_imports(self, file_path: str) -> List[str]:
+        """Find all imports (including multi-line and dynamic ones) in a TypeScript/JavaScript file"""
+        return [record["statement"] for record in self.parse_module(file_path)["imports"]]
     
     def find_exports(self, file_path: str) -> List[str]:
         """Find all exports in a TypeScript/JavaScript file"""
-        content = self.read_file(file_path)
-        if not content:
-            return []
-        
-        exports = []
-        lines = content.split('\n')
-        
-        for line in lines:
-            stripped = line.strip()
-            if stripped.startswith('export '):
-                exports.append(stripped)
-        
-        return exports
+        return [record["statement"] for record in self.parse_module(file_path)["exports"]]
+    
+    def find_dependents(self, file_path: str, transitive: bool = False) -> List[str]:
+        """Find project files that import a file"""
+        graph = self.dependency_graph
+        if transitive:
+            return sorted(graph.transitive_dependents(file_path))
+        return sorted(graph.dependents(file_path))
     
     def analyze_dependencies(self, file_path: str) -> Dict:
         """Analyze dependencies used in a file"""
-        content = self.read_file(file_path)
-        if not content:
-            return {"react_imports": [], "external_imports": [], "local_imports": []}
-        
-        imports = self.find_imports(file_path)
+        module = self.parse_module(file_path)
         analysis = {
             "react_imports": [],
             "next_imports": [],
@@ -371,14 +498,15 @@ class PrismFileOperations:
             "local_imports": []
         }
         
-        for import_line in imports:
-            if "from 'react'" in import_line or 'from "react"' in import_line:
-                analysis["react_imports"].append(import_line)
-            elif "from 'next" in import_line or 'from "next' in import_line:
-                analysis["next_imports"].append(import_line)
-            elif "from './" in import_line or 'from "../' in import_line or 'from "./' in import_line:
-                analysis["local_imports"].append(import_line)
+        for record in module["imports"]:
+            specifier = record["specifier"]
+            if specifier == "react" or specifier.startswith("react/"):
+                analysis["react_imports"].append(record["statement"])
+            elif specifier == "next" or specifier.startswith("next/"):
+                analysis["next_imports"].append(record["statement"])
+            elif specifier.startswith(".") or specifier.startswith("@/"):
+                analysis["local_imports"].append(record["statement"])
             else:
-                analysis["external_imports"].append(import_line)
+                analysis["external_imports"].append(record["statement"])
         
         return analysis
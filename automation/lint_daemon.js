@@ -0,0 +1,161 @@
+#!/usr/bin/env node
+/**
+ * Lint Daemon for Prism Writing Development Automation
+ *
+ * Keeps the project's ESLint and Prettier loaded in one long-lived Node
+ * process so repeated lint and format checks skip Node start-up, module
+ * loading and config resolution. Started by lint_daemon.py, it listens on
+ * 127.0.0.1 and records its port and an access token in a state file that
+ * only the current user can read.
+ *
+ * Protocol: one JSON object per line in each direction. Requests carry
+ * {"token", "command", ...}. Commands:
+ *   ping                      -> {"ok": true, "pid"}
+ *   eslint   {"files": [...]} -> {"ok": true, "results": [...]}  (eslint --format json shape)
+ *   prettier {"files": [...]} -> {"ok": true, "unformatted": [...]}
+ *   shutdown                  -> {"ok": true}
+ *
+ * Usage: node lint_daemon.js <project_root> <state_file> <config_hash> [idle_minutes]
+ */
+
+'use strict';
+
+const fs = require('fs');
+const net = require('net');
+const path = require('path');
+const crypto = require('crypto');
+const { createRequire } = require('module');
+
+const [projectRoot, stateFile, configHash, idleMinutes = '15'] = process.argv.slice(2);
+const projectRequire = createRequire(path.join(projectRoot, 'package.json'));
+const token = crypto.randomBytes(24).toString('hex');
+
+let eslint = null;
+let prettier = null;
+let idleTimer = null;
+
+async function getESLint() {
+  if (!eslint) {
+    const eslintModule = projectRequire('eslint');
+    // loadESLint picks flat or legacy config the way the eslint CLI does (ESLint >= 8.57)
+    const ESLintClass = eslintModule.loadESLint
+      ? await eslintModule.loadESLint({ cwd: projectRoot })
+      : eslintModule.ESLint;
+    eslint = new ESLintClass({ cwd: projectRoot });
+  }
+  return eslint;
+}
+
+async function lintFiles(files) {
+  const engine = await getESLint();
+  const results = await engine.lintFiles(files.map((file) => path.resolve(projectRoot, file)));
+  return results.map(({ filePath, messages, errorCount, warningCount }) => ({
+    filePath,
+    messages,
+    errorCount,
+    warningCount,
+  }));
+}
+
+async function checkFormatting(files) {
+  if (!prettier) {
+    prettier = projectRequire('prettier');
+  }
+  const ignorePath = path.join(projectRoot, '.prettierignore');
+  const unformatted = [];
+  for (const file of files) {
+    const filepath = path.resolve(projectRoot, file);
+    const info = await prettier.getFileInfo(filepath, { ignorePath });
+    if (info.ignored || !info.inferredParser) {
+      continue;
+    }
+    const options = (await prettier.resolveConfig(filepath)) || {};
+    const source = fs.readFileSync(filepath, 'utf8');
+    if (!(await prettier.check(source, { ...options, filepath }))) {
+      unformatted.push(file);
+    }
+  }
+  return unformatted;
+}
+
+function resetIdleTimer() {
+  clearTimeout(idleTimer);
+  idleTimer = setTimeout(shutdown, Number(idleMinutes) * 60 * 1000);
+}
+
+async function handle(line) {
+  resetIdleTimer();
+  let request;
+  try {
+    request = JSON.parse(line);
+  } catch (error) {
+    return { ok: false, error: 'Request is not valid JSON' };
+  }
+  const id = request.id;
+  if (request.token !== token) {
+    return { id, ok: false, error: 'Invalid token' };
+  }
+
+  try {
+    switch (request.command) {
+      case 'ping':
+        return { id, ok: true, pid: process.pid };
+      case 'eslint':
+        return { id, ok: true, results: await lintFiles(request.files || []) };
+      case 'prettier':
+        return { id, ok: true, unformatted: await checkFormatting(request.files || []) };
+      case 'shutdown':
+        setImmediate(shutdown);
+        return { id, ok: true };
+      default:
+        return { id, ok: false, error: `Unknown command: ${request.command}` };
+    }
+  } catch (error) {
+    return { id, ok: false, error: String((error && error.stack) || error) };
+  }
+}
+
+function shutdown() {
+  try {
+    const state = JSON.parse(fs.readFileSync(stateFile, 'utf8'));
+    if (state.pid === process.pid) {
+      fs.unlinkSync(stateFile);
+    }
+  } catch (error) {
+    // Already replaced or removed
+  }
+  process.exit(0);
+}
+
+const server = net.createServer((socket) => {
+  let buffer = '';
+  socket.setEncoding('utf8');
+  socket.on('data', (chunk) => {
+    buffer += chunk;
+    let newline;
+    while ((newline = buffer.indexOf('\n')) >= 0) {
+      const line = buffer.slice(0, newline);
+      buffer = buffer.slice(newline + 1);
+      handle(line).then((reply) => socket.write(JSON.stringify(reply) + '\n'));
+    }
+  });
+  socket.on('error', () => {});
+});
+
+server.listen(0, '127.0.0.1', () => {
+  const state = {
+    pid: process.pid,
+    port: server.address().port,
+    token,
+    config_hash: configHash,
+    project_root: projectRoot,
+    started_at: new Date().toISOString(),
+  };
+  const tmpFile = `${stateFile}.${process.pid}.tmp`;
+  fs.writeFileSync(tmpFile, JSON.stringify(state), { mode: 0o600 });
+  fs.renameSync(tmpFile, stateFile);
+  resetIdleTimer();
+});
+
+process.on('SIGTERM', shutdown);
+process.on('SIGINT', shutdown);
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Lint Daemon Client for Prism Writing Development Automation
+
+This module talks to lint_daemon.js, a long-lived Node process that keeps
+the project's ESLint and Prettier loaded (the approach of eslint_d). The
+first request of a session starts the daemon, or reuses the one a previous
+session left running. Later requests cost a socket round trip plus the lint
+work itself, with no Node start-up or config loading. The daemon is
+replaced when the tool configuration hash changes, and it exits by itself
+after a period of inactivity.
+"""
+
+import os
+import json
+import time
+import shutil
+import socket
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DAEMON_SCRIPT = Path(__file__).with_name("lint_daemon.js")
+
+
+class LintDaemonError(RuntimeError):
+    """Raised when the daemon cannot be started or a request fails"""
+
+
+class PrismLintDaemon:
+    """Client for the warm ESLint/Prettier worker process"""
+
+    def __init__(self, project_root: str, cache_dir: Optional[str] = None, startup_timeout: float = 20,
+                 request_timeout: float = 600, idle_minutes: int = 15):
+        self.project_root = Path(project_root).resolve()
+        self.cache_dir = Path(cache_dir) if cache_dir else self.project_root / ".automation_cache"
+        self.state_file = self.cache_dir / "lint-daemon.json"
+        self.log_file = self.cache_dir / "logs" / "lint-daemon.log"
+        self.startup_timeout = startup_timeout
+        self.request_timeout = request_timeout
+        self.idle_minutes = idle_minutes
+        self.lock = threading.Lock()
+        self.state: Optional[Dict] = None
+        self.enabled = True
+        self.broken = False
+
+    def can_run(self, package: str) -> bool:
+        """Whether requests for a tool ("eslint", "prettier") should go to the daemon instead of its CLI"""
+        return (
+            self.enabled and not self.broken
+            and shutil.which("node") is not None
+            and (self.project_root / "node_modules" / package).is_dir()
+        )
+
+    def eslint(self, files: List[str], config_hash: str) -> str:
+        """Lint project-relative files; returns `eslint --format json` text"""
+        reply = self.request({"command": "eslint", "files": files}, config_hash)
+        return json.dumps(reply["results"])
+
+    def prettier_check(self, files: List[str], config_hash: str) -> List[str]:
+        """Files (of those given) that Prettier would reformat"""
+        reply = self.request({"command": "prettier", "files": files}, config_hash)
+        return reply["unformatted"]
+
+    def request(self, payload: Dict, config_hash: str) -> Dict:
+        """Send one request, (re)starting the daemon when needed"""
+        state = self._ensure(config_hash)
+        try:
+            return self._send(state, payload)
+        except socket.timeout:
+            raise LintDaemonError(f"Lint daemon did not answer '{payload['command']}' within {self.request_timeout}s")
+        except OSError:
+            # The daemon exited (idle timeout, killed) after the ping; start a fresh one once
+            with self.lock:
+                self.state = None
+            return self._send(self._ensure(config_hash), payload)
+
+    def stop(self):
+        """Shut down the daemon this project is using, if any"""
+        with self.lock:
+            state = self.state or self._read_state()
+            self.state = None
+            if state:
+                self._shutdown(state)
+
+    def _ensure(self, config_hash: str) -> Dict:
+        with self.lock:
+            state = self.state or self._read_state()
+            if state and state.get("config_hash") == config_hash and self._ping(state):
+                self.state = state
+                return state
+            if state:
+                # Stale configuration or an unresponsive process
+                self._shutdown(state)
+            try:
+                self.state = self._spawn(config_hash)
+            except LintDaemonError:
+                self.broken = True
+                raise
+            return self.state
+
+    def _spawn(self, config_hash: str) -> Dict:
+        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self.state_file.unlink()
+        except FileNotFoundError:
+            pass
+
+        popen_kwargs = {}
+        if os.name == 'posix':
+            # Outlives this session and is not hit by the stage scheduler's process-group kills
+            popen_kwargs["start_new_session"] = True
+        else:
+            popen_kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS
+
+        with open(self.log_file, 'a', encoding='utf-8') as log:
+            try:
+                process = subprocess.Popen(
+                    ["node", str(DAEMON_SCRIPT), str(self.project_root), str(self.state_file),
+                     config_hash, str(self.idle_minutes)],
+                    cwd=self.project_root,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=log,
+                    **popen_kwargs
+                )
+            except OSError as e:
+                raise LintDaemonError(f"Could not start lint daemon: {e}")
+
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            state = self._read_state()
+            if state and state.get("pid") == process.pid:
+                return state
+            if process.poll() is not None:
+                raise LintDaemonError(f"Lint daemon exited with {process.returncode}, see {self.log_file}")
+            time.sleep(0.05)
+
+        process.kill()
+        raise LintDaemonError(f"Lint daemon did not start within {self.startup_timeout}s")
+
+    def _send(self, state: Dict, payload: Dict, timeout: Optional[float] = None) -> Dict:
+        message = dict(payload, token=state["token"])
+        with socket.create_connection(("127.0.0.1", state["port"]), timeout=timeout or self.request_timeout) as sock:
+            sock.sendall((json.dumps(message) + "\n").encode('utf-8'))
+            with sock.makefile('r', encoding='utf-8') as stream:
+                line = stream.readline()
+        if not line:
+            raise ConnectionResetError("Lint daemon closed the connection")
+
+        reply = json.loads(line)
+        if not reply.get("ok"):
+            raise LintDaemonError(reply.get("error", "Lint daemon request failed"))
+        return reply
+
+    def _ping(self, state: Dict) -> bool:
+        try:
+            return self._send(state, {"command": "ping"}, timeout=2).get("pid") == state.get("pid")
+        except (OSError, ValueError, LintDaemonError):
+            return False
+
+    def _shutdown(self, state: Dict):
+        try:
+            self._send(state, {"command": "shutdown"}, timeout=2)
+        except (OSError, ValueError, LintDaemonError):
+            pass
+
+    def _read_state(self) -> Optional[Dict]:
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return state if Path(state.get("project_root", "")).resolve() == self.project_root else None
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Modification Engine for Prism Writing Development Automation
+
+This module compiles the modification lists accepted by
+PrismFileOperations.modify_file into a plan that is applied in a single pass
+over the file. The distinct literal patterns of a pass are located up front,
+so only the lines that contain at least one pattern are touched, and the
+result is assembled with a single join. The edit semantics are identical to
+applying the modifications one after another.
+
+A "patch" modification carries a unified diff (or pre-parsed hunks) and is
+applied by patch_engine; hunks that do not fit are collected in
+plan.conflicts rather than raising.
+"""
+
+from typing import Dict, List
+
+from patch_engine import parse_unified_diff, apply_hunks
+
+
+def indent_content(line: str, insert_content: str) -> List[str]:
+    """Indent inserted content to match the line it is anchored to"""
+    indent = len(line) - len(line.lstrip())
+    return [
+        ' ' * indent + inserted.strip() if inserted.strip() else ''
+        for inserted in insert_content.split('\n')
+    ]
+
+
+class PrismModificationPlan:
+    """A modification list compiled into single-pass line stages"""
+
+    LINE_TYPES = ("replace", "insert_after", "insert_before", "append", "prepend")
+
+    def __init__(self, modifications: List[Dict]):
+        self.stages = self.compile(modifications)
+        self.conflicts: List[Dict] = []
+        self.hunks_applied: List[Dict] = []
+
+    def compile(self, modifications: List[Dict]) -> List[Dict]:
+        """Group consecutive line-local modifications into single-pass stages"""
+        stages = []
+        current = None
+
+        for modification in modifications:
+            mod_type = modification["type"]
+            if mod_type == "patch":
+                stages.append({"kind": "patch", "hunks": self._patch_hunks(modification),
+                               "fuzz": modification.get("fuzz", 2)})
+                current = None
+                continue
+            if mod_type not in self.LINE_TYPES:
+                # Unknown modification types are ignored, as before
+                continue
+
+            if mod_type == "replace":
+                op = ("replace", modification["search"], modification["replacement"])
+                if '\n' in op[1]:
+                    # Multi-line searches cannot be matched per line
+                    stages.append({"kind": "text", "ops": [op]})
+                    current = None
+                    continue
+            elif mod_type in ("insert_after", "insert_before"):
+                op = (mod_type, modification["pattern"], modification["content"])
+                if '\n' in op[1]:
+                    # A single line never contains a newline, so this can never match
+                    continue
+            else:
+                op = (mod_type, None, modification["content"])
+
+            if current is None:
+                current = {"kind": "lines", "ops": [], "patterns": set(), "edges": False}
+                stages.append(current)
+            current["ops"].append(op)
+            if op[1] is None:
+                current["edges"] = True
+            else:
+                current["patterns"].add(op[1])
+
+        return stages
+
+    def _patch_hunks(self, modification: Dict) -> List[Dict]:
+        """Return the hunks of a patch modification, parsing its diff if needed"""
+        if "hunks" in modification:
+            return modification["hunks"]
+        files = parse_unified_diff(modification["diff"])
+        if len(files) > 1:
+            raise ValueError("Diff touches several files; use apply_patch for multi-file diffs")
+        if not files or not files[0]["hunks"]:
+            raise ValueError("Diff contains no hunks")
+        return files[0]["hunks"]
+
+    def apply(self, content: str) -> str:
+        """Apply the compiled plan to content"""
+        self.conflicts = []
+        self.hunks_applied = []
+        for stage in self.stages:
+            if stage["kind"] == "patch":
+                report = apply_hunks(content, stage["hunks"], fuzz=stage["fuzz"])
+                self.conflicts.extend(report["conflicts"])
+                self.hunks_applied.extend(report["applied"])
+                content = report["content"]
+            elif stage["kind"] == "text":
+                _, search, replacement = stage["ops"][0]
+                content = content.replace(search, replacement)
+            else:
+                content = self._apply_line_stage(stage, content)
+        return content
+
+    def _find_hit_lines(self, patterns, content: str) -> set:
+        """Return the indexes of lines that contain at least one pattern"""
+        offsets = []
+        for pattern in patterns:
+            position = content.find(pattern)
+            while position != -1:
+                offsets.append(position)
+                # One hit per line is enough; resume at the next line
+                line_end = content.find('\n', position)
+                if line_end == -1:
+                    break
+                position = content.find(pattern, line_end + 1)
+
+        hit_lines = set()
+        line_number = 0
+        previous = 0
+        for offset in sorted(offsets):
+            line_number += content.count('\n', previous, offset)
+            previous = offset
+            hit_lines.add(line_number)
+        return hit_lines
+
+    def _apply_line_stage(self, stage: Dict, content: str) -> str:
+        """Apply a stage of line-local modifications in one pass"""
+        lines = content.split('\n')
+        last = len(lines) - 1
+
+        if '' in stage["patterns"]:
+            # An empty pattern matches every line
+            hit_lines = set(range(len(lines)))
+        else:
+            hit_lines = self._find_hit_lines(stage["patterns"], content)
+
+        if stage["edges"]:
+            hit_lines.update((0, last))
+
+        for index in sorted(hit_lines):
+            fragments = self._apply_ops(stage["ops"], lines[index], index == 0, index == last)
+            lines[index] = '\n'.join(fragments)
+
+        return '\n'.join(lines)
+
+    def _apply_ops(self, ops: List, line: str, is_first: bool, is_last: bool) -> List[str]:
+        """Run one original line through every operation of a stage"""
+        fragments = [line]
+
+        for op_type, pattern, value in ops:
+            if op_type == "replace":
+                if any(pattern in fragment for fragment in fragments):
+                    replaced = []
+                    for fragment in fragments:
+                        replaced.extend(fragment.replace(pattern, value).split('\n'))
+                    fragments = replaced
+
+            elif op_type == "insert_after":
+                inserted = []
+                for fragment in fragments:
+                    inserted.append(fragment)
+                    if pattern in fragment:
+                        inserted.extend(indent_content(fragment, value))
+                fragments = inserted
+
+            elif op_type == "insert_before":
+                inserted = []
+                for fragment in fragments:
+                    if pattern in fragment:
+                        inserted.extend(indent_content(fragment, value))
+                    inserted.append(fragment)
+                fragments = inserted
+
+            elif op_type == "append" and is_last:
+                fragments[-1:] = (fragments[-1] + value).split('\n')
+
+            elif op_type == "prepend" and is_first:
+                fragments[:1] = (value + fragments[0]).split('\n')
+
+        return fragments
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Patch Engine for Prism Writing Development Automation
+
+This module parses unified diffs and applies their hunks to file content in
+one forward pass. Each hunk is located near the line its header names; if
+the file has drifted, the search widens outward (offset), then drops outer
+context lines (fuzz), then compares lines ignoring whitespace. Hunks that
+still cannot be placed are reported as conflicts instead of being guessed.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+HUNK_HEADER = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@(.*)$')
+
+
+def _strip_path(path: str) -> Optional[str]:
+    """Normalize a ---/+++ header path (drop timestamps and a/ b/ prefixes)"""
+    path = path.split('\t')[0].strip()
+    if path == '/dev/null':
+        return None
+    if path.startswith(('a/', 'b/')):
+        path = path[2:]
+    return path
+
+
+def parse_unified_diff(diff_text: str) -> List[Dict]:
+    """Parse a unified diff into per-file records with their hunks"""
+    files: List[Dict] = []
+    current: Optional[Dict] = None
+    lines = diff_text.split('\n')
+    if lines and lines[-1] == '':
+        lines.pop()
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+
+        if line.startswith('--- ') and i + 1 < len(lines) and lines[i + 1].startswith('+++ '):
+            current = {
+                "old_path": _strip_path(line[4:]),
+                "new_path": _strip_path(lines[i + 1][4:]),
+                "hunks": []
+            }
+            files.append(current)
+            i += 2
+            continue
+
+        header = HUNK_HEADER.match(line)
+        if not header:
+            # Prose, "diff --git" and "index" lines between files are ignored
+            i += 1
+            continue
+
+        if current is None:
+            # Bare hunks without file headers apply to whatever file is being modified
+            current = {"old_path": None, "new_path": None, "hunks": []}
+            files.append(current)
+
+        hunk = {
+            "old_start": int(header.group(1)),
+            "old_count": int(header.group(2)) if header.group(2) is not None else 1,
+            "new_start": int(header.group(3)),
+            "new_count": int(header.group(4)) if header.group(4) is not None else 1,
+            "header": line,
+            "lines": [],
+            "old_no_newline": False,
+            "new_no_newline": False
+        }
+        i = _read_hunk_body(lines, i + 1, hunk)
+        current["hunks"].append(hunk)
+
+    return files
+
+
+def _read_hunk_body(lines: List[str], i: int, hunk: Dict) -> int:
+    """Collect hunk lines; trust the header counts but stop early at the next header"""
+    old_left = hunk["old_count"]
+    new_left = hunk["new_count"]
+
+    while i < len(lines) and (old_left > 0 or new_left > 0 or lines[i].startswith('\\')):
+        line = lines[i]
+        if line.startswith('\\'):
+            # Marker applies to the line just read
+            if hunk["lines"]:
+                op = hunk["lines"][-1][0]
+                if op in (' ', '-'):
+                    hunk["old_no_newline"] = True
+                if op in (' ', '+'):
+                    hunk["new_no_newline"] = True
+            i += 1
+            continue
+        if HUNK_HEADER.match(line) or (line.startswith('--- ') and i + 1 < len(lines) and lines[i + 1].startswith('+++ ')):
+            break
+
+        # Some tools strip the single space of blank context lines
+        op, text = (line[0], line[1:]) if line else (' ', '')
+        if op not in (' ', '-', '+'):
+            break
+        hunk["lines"].append((op, text))
+        if op != '+':
+            old_left -= 1
+        if op != '-':
+            new_left -= 1
+        i += 1
+
+    return i
+
+
+def _split_content(content: str):
+    """Split content into lines plus a trailing-newline flag"""
+    if content == '':
+        # Lines added to an empty file end with a newline unless the diff says otherwise
+        return [], True
+    lines = content.split('\n')
+    if lines[-1] == '':
+        lines.pop()
+        return lines, True
+    return lines, False
+
+
+def _trim_context(hunk_lines: List, fuzz: int):
+    """Drop up to fuzz leading and trailing context lines (GNU patch style)"""
+    start = 0
+    while start < fuzz and start < len(hunk_lines) and hunk_lines[start][0] == ' ':
+        start += 1
+    end = len(hunk_lines)
+    while len(hunk_lines) - end < fuzz and end > start and hunk_lines[end - 1][0] == ' ':
+        end -= 1
+    return start, hunk_lines[start:end]
+
+
+def _matches(lines: List[str], position: int, old_lines: List[str], loose: bool) -> bool:
+    if position + len(old_lines) > len(lines):
+        return False
+    if not old_lines:
+        return True
+    if not loose:
+        if lines[position] != old_lines[0]:
+            return False
+        return lines[position:position + len(old_lines)] == old_lines
+    return all(
+        lines[position + k].split() == old_lines[k].split()
+        for k in range(len(old_lines))
+    )
+
+
+def _locate(lines: List[str], old_lines: List[str], expected: int, lower: int, loose: bool, max_offset: Optional[int]) -> Optional[int]:
+    """Find old_lines at or after lower, searching outward from expected"""
+    upper = len(lines) - len(old_lines)
+    if upper < lower:
+        return None
+    expected = min(max(expected, lower), upper)
+    reach = max(expected - lower, upper - expected)
+    if max_offset is not None:
+        reach = min(reach, max_offset)
+
+    for offset in range(reach + 1):
+        for position in ((expected - offset, expected + offset) if offset else (expected,)):
+            if lower <= position <= upper and _matches(lines, position, old_lines, loose):
+                return position
+    return None
+
+
+def apply_hunks(content: str, hunks: List[Dict], fuzz: int = 2, max_offset: Optional[int] = None) -> Dict:
+    """Apply parsed hunks to content in a single forward pass"""
+    lines, trailing_newline = _split_content(content)
+    output: List[str] = []
+    cursor = 0
+    drift = 0
+    report = {"applied": [], "conflicts": []}
+
+    for number, hunk in enumerate(hunks, start=1):
+        # A pure addition (old count 0) inserts after its header line, not at it
+        base = hunk["old_start"] - 1 if hunk["old_count"] else hunk["old_start"]
+        placement = None
+        previous_size = None
+
+        for level in range(fuzz + 1):
+            lead, hunk_lines = _trim_context(hunk["lines"], level)
+            if len(hunk_lines) == previous_size:
+                # No more context left to drop
+                break
+            previous_size = len(hunk_lines)
+            old_lines = [text for op, text in hunk_lines if op != '+']
+
+            for loose in (False, True):
+                position = _locate(lines, old_lines, base + drift + lead, cursor, loose, max_offset)
+                if position is not None:
+                    placement = (position, lead, hunk_lines, level, loose)
+                    break
+            if placement:
+                break
+
+        if placement is None:
+            report["conflicts"].append({
+                "hunk": number,
+                "header": hunk["header"],
+                "expected_line": hunk["old_start"],
+                "reason": "context not found",
+                "context": [text for op, text in hunk["lines"] if op != '+'][:3]
+            })
+            continue
+
+        position, lead, hunk_lines, level, loose = placement
+        output.extend(lines[cursor:position])
+        source = position
+        for op, text in hunk_lines:
+            if op == ' ':
+                # Keep the file's own text for context lines (matters for whitespace matches)
+                output.append(lines[source])
+                source += 1
+            elif op == '-':
+                source += 1
+            else:
+                output.append(text)
+
+        if source == len(lines) and (hunk["old_no_newline"] or hunk["new_no_newline"]):
+            trailing_newline = not hunk["new_no_newline"]
+
+        offset = position - lead - base
+        report["applied"].append({
+            "hunk": number,
+            "line": position + 1,
+            "offset": offset,
+            "fuzz": level,
+            "whitespace": loose
+        })
+        drift = offset
+        cursor = source
+
+    output.extend(lines[cursor:])
+    text = '\n'.join(output)
+    if output and trailing_newline:
+        text += '\n'
+
+    report["content"] = text
+    return report
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Pipeline Engine for Prism Writing Development Automation
+
+This module runs the request workflow (analyze → implement → test → commit →
+deploy → docs) as a dependency graph instead of a fixed sequence. Each stage
+declares the values it reads (its inputs) and produces one value under its
+own name. The engine derives the edges from those declarations and hands the
+graph to the stage scheduler. Stages that do not depend on each other, such
+as documentation and tests, then run at the same time. Every stage's status,
+start and end times and duration are recorded as it runs.
+"""
+
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from stage_scheduler import PrismStage, PrismStageScheduler
+
+# Result statuses that stop the stages depending on a critical stage
+FAILED_STATUSES = ("failed", "cancelled")
+
+
+def result_status(result: Optional[Dict]) -> str:
+    """Status of a stage result (test results report "overall_status")"""
+    if not isinstance(result, dict):
+        return "success"
+    return result.get("status") or result.get("overall_status") or "success"
+
+
+class PrismPipelineStage:
+    """One workflow stage: reads named inputs, produces the value named after itself"""
+
+    def __init__(self, name: str, run: Callable[..., Dict], inputs: Optional[List[str]] = None,
+                 after: Optional[List[str]] = None, critical: bool = True):
+        self.name = name
+        self.run = run
+        # Values passed to run() positionally, from the initial context or earlier stages
+        self.inputs = list(inputs or [])
+        # Stages that must finish first without their values being passed
+        self.after = list(after or [])
+        # A failed non-critical stage does not stop the stages after it
+        self.critical = critical
+
+
+class PrismPipeline:
+    """Run pipeline stages as a DAG derived from their inputs"""
+
+    def __init__(self, stages: List[PrismPipelineStage]):
+        self.stages = stages
+        names = [stage.name for stage in stages]
+        duplicates = {name for name in names if names.count(name) > 1}
+        if duplicates:
+            raise ValueError(f"Duplicate pipeline stages: {', '.join(sorted(duplicates))}")
+
+    def run(self, context: Dict, on_start: Optional[Callable[[str], None]] = None,
+            on_complete: Optional[Callable[[str, Dict], None]] = None) -> Dict:
+        """Run every stage whose value is not already in context
+
+        on_start(name) and on_complete(name, step) are called as stages start
+        and finish. Returns {"status", "error"?, "warnings", "started_at",
+        "completed_at", "duration", "steps": {name: step}, "timings":
+        {name: seconds}} where a step is {"status": "completed"|"failed"|
+        "skipped", "result", "duration", "started_at"?, "completed_at"?,
+        "error"?}. Failed non-critical stages only add warnings.
+        """
+        context = dict(context)
+        lock = threading.Lock()
+        producers = {stage.name for stage in self.stages}
+        pending = [stage for stage in self.stages if stage.name not in context]
+        pending_names = {stage.name for stage in pending}
+
+        for stage in pending:
+            missing = [name for name in stage.inputs if name not in context and name not in producers]
+            if missing:
+                raise ValueError(f"Pipeline stage '{stage.name}' needs {', '.join(missing)}, which nothing provides")
+
+        steps: Dict[str, Dict] = {}
+        started = datetime.now()
+
+        def make_runner(stage: PrismPipelineStage) -> Callable[[], Dict]:
+            def run() -> Dict:
+                with lock:
+                    arguments = [context[name] for name in stage.inputs]
+                stage_started = datetime.now()
+                try:
+                    result = stage.run(*arguments)
+                except Exception as e:
+                    result = {"status": "failed", "error": str(e)}
+                with lock:
+                    steps[stage.name] = {"started_at": stage_started.isoformat(), "completed_at": datetime.now().isoformat()}
+                    context[stage.name] = result
+
+                status = result_status(result)
+                failed = status in FAILED_STATUSES
+                error = None
+                if isinstance(result, dict):
+                    error = result.get("error") or next(iter(result.get("failures") or []), None)
+                return {
+                    # Only critical failures reach the scheduler, which skips the dependents
+                    "status": "failed" if failed and stage.critical else "success",
+                    "output": "",
+                    "errors": [error or f"{stage.name} {status}"] if failed else [],
+                    "result": result,
+                    "own_status": "failed" if failed else "skipped" if status == "skipped" else "completed"
+                }
+            return run
+
+        def finish(name: str, scheduled: Dict):
+            step = steps.setdefault(name, {})
+            step.update({
+                "status": scheduled.get("own_status") or ("failed" if scheduled["status"] == "failed" else "skipped"),
+                "result": scheduled.get("result"),
+                "duration": scheduled.get("duration", 0)
+            })
+            if scheduled["errors"] and step["status"] != "completed":
+                step["error"] = scheduled["errors"][0]
+            if on_complete:
+                on_complete(name, step)
+
+        scheduler_stages = [
+            PrismStage(
+                stage.name,
+                make_runner(stage),
+                # Values already in the context are satisfied up front
+                depends_on=[name for name in stage.inputs + stage.after if name in pending_names],
+                blocking=stage.critical,
+                # Workflow stages are mostly waiting on subprocesses; they manage their own parallelism
+                cpu=0,
+                memory_mb=0
+            )
+            for stage in pending
+        ]
+        scheduler = PrismStageScheduler(max_memory_mb=0, fail_fast=False, on_start=on_start, on_complete=finish)
+        scheduler.run(scheduler_stages)
+
+        # Report in declaration order
+        ordered = {stage.name: steps[stage.name] for stage in pending}
+        critical = {stage.name for stage in pending if stage.critical}
+        failures = [step for name, step in ordered.items() if step["status"] == "failed" and name in critical]
+        warnings = [f"{name}: {step.get('error')}" for name, step in ordered.items()
+                    if step["status"] == "failed" and name not in critical]
+        completed = datetime.now()
+        result = {
+            "status": "failed" if failures else "success",
+            "started_at": started.isoformat(),
+            "completed_at": completed.isoformat(),
+            "duration": (completed - started).total_seconds(),
+            "steps": ordered,
+            "timings": {name: round(step["duration"], 3) for name, step in ordered.items()},
+            "warnings": warnings
+        }
+        if failures:
+            result["error"] = failures[0].get("error", "A pipeline stage failed")
+        return result
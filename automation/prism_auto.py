@@ -116,9 +116,12 @@ class PrismAutoCLI:
             print()
         
         if analysis.get('dependencies'):
+            plan = self.automator.dependency_installer.plan(analysis['dependencies'])
             print("📦 Dependencies to install:")
-            for dep in analysis['dependencies']:
+            for dep in plan['install']:
                 print(f"   • {dep}")
+            for dep in plan['satisfied']:
+                print(f"   • {dep} (already installed)")
             print()
         
         print(f"🚀 Deployment Impact: {analysis['deployment_impact'].get('impact_level', 'unknown')}")
@@ -149,29 +152,30 @@ class PrismAutoCLI:
         print("=" * 50)
         
         try:
-            # Run the automation
-            result = self.automator.automate_request(request)
+            # The analysis shown for confirmation is reused, so the pipeline starts at implementation
+            result = self.automator.automate_request(
+                request,
+                analysis=analysis,
+                on_start=lambda stage: print(f"▶️  {stage.title()} started", flush=True)
+            )
             
             if result["status"] == "success":
                 print("\n✅ AUTOMATION COMPLETED SUCCESSFULLY!")
                 print("=" * 50)
                 
                 # Show what was accomplished
-                steps = result.get("steps", {})
-                for step_name, step_data in steps.items():
-                    status = step_data.get("status", "unknown")
-                    emoji = "✅" if status == "completed" else "❌"
-                    print(f"{emoji} {step_name.title()}: {status}")
+                self.print_steps(result)
                 
                 print(f"\n🕒 Total Time: {self.calculate_duration(result)}")
                 
                 # Show URLs if deployed
+                steps = result.get("steps", {})
                 if "deployment" in steps and steps["deployment"]["status"] == "completed":
                     deploy_result = steps["deployment"]["result"]
-                    if "output" in deploy_result:
-                        print(f"\n🌐 Deployed to: {self.automator.config['deployment']['production_url']}")
+                    print(f"\n🌐 Deployed to: {deploy_result.get('url') or self.automator.config['deployment']['production_url']}")
                 
-                print(f"\n📋 Workflow saved to: workflow_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+                if result.get("workflow_file"):
+                    print(f"\n📋 Workflow saved to: {Path(result['workflow_file']).name}")
                 
             else:
                 print("\n❌ AUTOMATION FAILED")
@@ -179,11 +183,7 @@ class PrismAutoCLI:
                 print(f"Error: {result.get('error', 'Unknown error')}")
                 
                 # Show which steps completed
-                steps = result.get("steps", {})
-                for step_name, step_data in steps.items():
-                    status = step_data.get("status", "unknown")
-                    emoji = "✅" if status == "completed" else "❌"
-                    print(f"{emoji} {step_name.title()}: {status}")
+                self.print_steps(result)
                 
                 return False
             
@@ -196,6 +196,16 @@ class PrismAutoCLI:
         
         return True
     
+    def print_steps(self, result: dict):
+        """Show each pipeline step with its status and duration"""
+        icons = {"completed": "✅", "skipped": "⏭️", "failed": "❌"}
+        for step_name, step_data in result.get("steps", {}).items():
+            status = step_data.get("status", "unknown")
+            emoji = icons.get(status, "⚠️")
+            print(f"{emoji} {step_name.title()}: {status} ({step_data.get('duration', 0):.1f}s)")
+            if step_data.get("error") and status != "completed":
+                print(f"    {step_data['error']}")
+    
     def calculate_duration(self, result: dict) -> str:
         """Calculate automation duration"""
         if "started_at" in result and "completed_at" in result:
@@ -10,6 +10,7 @@ Usage:
     python prism_auto_complete.py "create a new about page with team information"
     python prism_auto_complete.py "fix the mobile navigation menu" --skip-deploy
     python prism_auto_complete.py "add a contact form with validation" --analyze-only
+    python prism_auto_complete.py "create a pricing page" --dry-run
 """
 
 import sys
@@ -26,14 +27,22 @@ sys.path.insert(0, str(automation_dir))
 
 try:
     from prism_dev_automator import PrismDevAutomator
-    from test_runner import PrismTestRunner
     from enhanced_ai_integration import PrismAIAssistant
     from file_operations import PrismFileOperations
+    from diff_engine import PrismDiffEngine
 except ImportError as e:
     print(f"Error importing automation modules: {e}")
     print("Make sure all automation modules are in the same directory")
     sys.exit(1)
 
+# Pipeline stages run after implementation: title, start icon, session log event, result printer
+PIPELINE_STAGES = {
+    "testing": {"title": "Testing", "icon": "🧪", "event": "tests", "printer": "print_test_results"},
+    "documentation": {"title": "Documentation", "icon": "📚", "event": "docs", "printer": "print_documentation_results"},
+    "commit": {"title": "Git commit", "icon": "📝", "event": "commit", "printer": "print_commit_results"},
+    "deployment": {"title": "Deployment", "icon": "🚀", "event": "deploy", "printer": "print_deploy_results"}
+}
+
 class PrismAutoComplete:
     """Complete automation interface for Prism Writing development"""
     
@@ -42,6 +51,7 @@ class PrismAutoComplete:
         self.automator = None
         self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.session_log = []
+        self.preview_cache = None
         
     def find_project_root(self) -> Path:
         """Find the project root directory"""
@@ -212,7 +222,9 @@ class PrismAutoComplete:
         if analysis.get('files_to_modify'):
             print(f"  ✏️  Modify {len(analysis['files_to_modify'])} existing files")
         if analysis.get('dependencies'):
-            print(f"  📦 Install {len(analysis['dependencies'])} dependencies")
+            missing = self.automator.dependency_installer.plan(analysis['dependencies'])['install']
+            if missing:
+                print(f"  📦 Install {len(missing)} dependencies in one npm call")
         
         if not args.skip_tests:
             print("  🧪 Run tests and validation")
@@ -224,7 +236,7 @@ class PrismAutoComplete:
         print()
         
         while True:
-            response = input("Proceed with implementation? [Y/n/details]: ").strip().lower()
+            response = input("Proceed with implementation? [Y/n/details/preview]: ").strip().lower()
             
             if response in ['', 'y', 'yes']:
                 return True
@@ -234,8 +246,11 @@ class PrismAutoComplete:
             elif response in ['d', 'details']:
                 self.show_detailed_plan(analysis)
                 continue
+            elif response in ['p', 'preview']:
+                self.print_diff_preview(analysis)
+                continue
             else:
-                print("Please enter 'y' for yes, 'n' for no, or 'd' for details")
+                print("Please enter 'y' for yes, 'n' for no, 'd' for details or 'p' for preview")
     
     def show_detailed_plan(self, analysis: dict):
         """Show detailed implementation plan"""
@@ -251,8 +266,49 @@ class PrismAutoComplete:
                 for file_path in step['files']:
                     print(f"  - {file_path}")
         
+        preview = self.get_diff_preview(analysis)
+        if preview["files"]:
+            print("\nPlanned changes:")
+            for entry in preview["files"]:
+                print(f"  {entry['path']} | +{entry['insertions']} -{entry['deletions']}")
+        
         print("\n" + "=" * 50)
     
+    def get_diff_preview(self, analysis: dict) -> dict:
+        """Dry-run the plan once and render a diff for every planned write"""
+        if self.preview_cache is None:
+            preview = self.automator.preview_request(analysis)
+            engine = PrismDiffEngine()
+            files = [engine.render(entry["path"], entry["old"], entry["new"]) for entry in preview["files"]]
+            self.preview_cache = {
+                "files": files,
+                "insertions": sum(entry["insertions"] for entry in files),
+                "deletions": sum(entry["deletions"] for entry in files),
+                "errors": preview["errors"]
+            }
+        return self.preview_cache
+    
+    def print_diff_preview(self, analysis: dict):
+        """Print the unified diff of everything the implementation would write"""
+        preview = self.get_diff_preview(analysis)
+        
+        print("\n🔍 DIFF PREVIEW")
+        print("=" * 50)
+        for entry in preview["files"]:
+            print(entry["text"], end="" if entry["text"].endswith("\n") else "\n")
+        
+        if not preview["files"]:
+            print("No file changes planned")
+        for error in preview["errors"]:
+            print(f"⚠️  {error}")
+        
+        print("-" * 50)
+        for entry in preview["files"]:
+            label = "new" if entry["action"] == "create" else "modified"
+            print(f"  {entry['path']} ({label}) | +{entry['insertions']} -{entry['deletions']}")
+        print(f"  {len(preview['files'])} files changed, {preview['insertions']} insertions(+), {preview['deletions']} deletions(-)")
+        print("=" * 50 + "\n")
+    
     def implement_request(self, analysis: dict, args) -> dict:
         """Execute the implementation"""
         print("🚀 IMPLEMENTING REQUEST")
@@ -261,36 +317,7 @@ class PrismAutoComplete:
         try:
             implementation = self.automator.implement_request(analysis)
             self.log_session_event("implementation_complete", implementation)
-            
-            # Show implementation results
-            print("✅ IMPLEMENTATION RESULTS")
-            print("-" * 30)
-            print(f"Status: {implementation['status'].upper()}")
-            
-            if implementation.get('files_created'):
-                print(f"📄 Created {len(implementation['files_created'])} files:")
-                for file_path in implementation['files_created']:
-                    print(f"    ✨ {file_path}")
-            
-            if implementation.get('files_modified'):
-                print(f"✏️  Modified {len(implementation['files_modified'])} files:")
-                for file_path in implementation['files_modified']:
-                    print(f"    📝 {file_path}")
-            
-            if implementation.get('dependencies_installed'):
-                print(f"📦 Installed dependencies: {', '.join(implementation['dependencies_installed'])}")
-            
-            if implementation.get('warnings'):
-                print("⚠️  Warnings:")
-                for warning in implementation['warnings']:
-                    print(f"    - {warning}")
-            
-            if implementation.get('errors'):
-                print("❌ Errors:")
-                for error in implementation['errors']:
-                    print(f"    - {error}")
-            
-            print()
+            self.print_implementation_results(implementation)
             return implementation
             
         except Exception as e:
@@ -300,145 +327,207 @@ class PrismAutoComplete:
             self.log_session_event("implementation_failed", {"error": str(e)})
             return None
     
-    def run_tests(self, implementation: dict, args) -> dict:
-        """Run tests on the implementation"""
-        if args.skip_tests:
-            print("⏭️  Skipping tests (--skip-tests flag)")
-            return {"status": "skipped"}
-        
-        print("🧪 RUNNING TESTS")
+    def scaffold_manifest(self, args) -> dict:
+        """Create every page and component of a manifest in one batched run"""
+        print("🏗️  SCAFFOLDING FROM MANIFEST")
         print("=" * 50)
+        print(f"📋 Manifest: {args.manifest}")
+        print()
         
         try:
-            test_runner = PrismTestRunner(str(self.project_root))
-            test_results = test_runner.run_all_tests(self.automator.config)
-            self.log_session_event("tests_complete", test_results)
+            implementation = self.automator.scaffold_from_manifest(args.manifest, max_workers=args.workers)
+            self.log_session_event("scaffold_complete", implementation)
+            self.print_implementation_results(implementation)
             
-            print("📊 TEST RESULTS")
-            print("-" * 30)
-            print(f"Overall Status: {test_results['overall_status'].upper()}")
-            
-            for test in test_results['tests_run']:
-                test_name = test['name'].replace('_', ' ').title()
-                test_status = test['result']['status']
-                status_icon = "✅" if test_status == "success" else "❌" if test_status == "failed" else "⚠️"
-                print(f"{status_icon} {test_name}: {test_status}")
-            
-            if test_results.get('failures'):
-                print("\n❌ Test Failures:")
-                for failure in test_results['failures']:
-                    print(f"    - {failure}")
-            
-            if test_results.get('warnings'):
-                print("\n⚠️  Test Warnings:")
-                for warning in test_results['warnings']:
-                    print(f"    - {warning}")
-            
-            print()
-            return test_results
+            if implementation.get('files_skipped'):
+                print(f"⏭️  Skipped {len(implementation['files_skipped'])} existing files")
+                print()
+            return implementation
             
         except Exception as e:
-            print(f"❌ Tests failed: {e}")
+            print(f"❌ Scaffolding failed: {e}")
             if args.debug:
                 traceback.print_exc()
-            self.log_session_event("tests_failed", {"error": str(e)})
-            return {"status": "failed", "error": str(e)}
+            self.log_session_event("scaffold_failed", {"error": str(e)})
+            return None
+    
+    def print_implementation_results(self, implementation: dict):
+        """Show the files and messages produced by an implementation"""
+        print("✅ IMPLEMENTATION RESULTS")
+        print("-" * 30)
+        print(f"Status: {implementation['status'].upper()}")
+        
+        if implementation.get('files_created'):
+            print(f"📄 Created {len(implementation['files_created'])} files:")
+            for file_path in implementation['files_created']:
+                print(f"    ✨ {file_path}")
+        
+        if implementation.get('files_modified'):
+            print(f"✏️  Modified {len(implementation['files_modified'])} files:")
+            for file_path in implementation['files_modified']:
+                print(f"    📝 {file_path}")
+        
+        if implementation.get('dependencies_installed'):
+            print(f"📦 Installed dependencies: {', '.join(implementation['dependencies_installed'])}")
+        if implementation.get('dependencies_satisfied'):
+            print(f"📦 Already installed: {', '.join(implementation['dependencies_satisfied'])}")
+        
+        if implementation.get('warnings'):
+            print("⚠️  Warnings:")
+            for warning in implementation['warnings']:
+                print(f"    - {warning}")
+        
+        if implementation.get('errors'):
+            print("❌ Errors:")
+            for error in implementation['errors']:
+                print(f"    - {error}")
+        
+        print()
     
-    def commit_changes(self, implementation: dict, analysis: dict, args) -> dict:
-        """Commit changes to git"""
-        if args.skip_commit:
-            print("⏭️  Skipping git commit (--skip-commit flag)")
-            return {"status": "skipped"}
+    def run_pipeline(self, implementation: dict, analysis: dict, args) -> dict:
+        """Test, commit, deploy and document through the automator's pipeline
         
-        print("📝 COMMITTING CHANGES")
+        Documentation is generated while the tests run; each stage's results
+        are printed as soon as it finishes.
+        """
+        print("🔀 RUNNING PIPELINE")
         print("=" * 50)
         
-        try:
-            commit_result = self.automator.commit_changes(implementation, analysis)
-            self.log_session_event("commit_complete", commit_result)
-            
-            print("✅ GIT COMMIT RESULTS")
-            print("-" * 30)
-            print(f"Status: {commit_result['status'].upper()}")
-            
-            if commit_result.get('commit_hash'):
-                print(f"📝 Commit: {commit_result['commit_hash']}")
-            
-            if commit_result.get('message'):
-                print(f"💬 Message: {commit_result['message']}")
-            
-            if commit_result.get('files_committed'):
-                print(f"📄 Files: {len(commit_result['files_committed'])} committed")
-            
-            print()
-            return commit_result
-            
-        except Exception as e:
-            print(f"❌ Git commit failed: {e}")
-            if args.debug:
-                traceback.print_exc()
-            self.log_session_event("commit_failed", {"error": str(e)})
-            return {"status": "failed", "error": str(e)}
+        options = {
+            "skip_tests": args.skip_tests,
+            "skip_commit": args.skip_commit,
+            "skip_deploy": args.skip_deploy,
+            "full_tests": args.full_tests,
+            "on_progress": self.print_progress
+        }
+        context = {"request": analysis.get("request"), "analysis": analysis, "implementation": implementation}
+        return self.automator.run_pipeline(
+            context, options,
+            on_start=self.print_stage_start,
+            on_complete=self.print_stage_result
+        )
     
-    def deploy_changes(self, args) -> dict:
-        """Deploy changes to production"""
-        if args.skip_deploy:
-            print("⏭️  Skipping deployment (--skip-deploy flag)")
-            return {"status": "skipped"}
+    def print_stage_start(self, stage: str):
+        """Announce a pipeline stage as it starts"""
+        print(f"{PIPELINE_STAGES[stage]['icon']} {PIPELINE_STAGES[stage]['title']} started...", flush=True)
+    
+    def print_stage_result(self, stage: str, step: dict):
+        """Log and print a finished pipeline stage"""
+        info = PIPELINE_STAGES[stage]
+        result = step.get("result")
+        print()
         
-        print("🚀 DEPLOYING TO PRODUCTION")
-        print("=" * 50)
+        if step["status"] == "skipped":
+            reason = (result or {}).get("message") or step.get("error") or "skipped"
+            print(f"⏭️  {info['title']} skipped: {reason}")
+            print()
+            self.log_session_event(f"{info['event']}_skipped", {"reason": reason})
+            return
         
-        try:
-            deploy_result = self.automator.deploy()
-            self.log_session_event("deploy_complete", deploy_result)
-            
-            print("🎉 DEPLOYMENT RESULTS")
-            print("-" * 30)
-            print(f"Status: {deploy_result['status'].upper()}")
-            
-            if deploy_result.get('url'):
-                print(f"🌐 URL: {deploy_result['url']}")
-            
-            if deploy_result.get('deployment_id'):
-                print(f"🆔 Deployment ID: {deploy_result['deployment_id']}")
-            
+        if step["status"] == "failed" and set(result or {}) <= {"status", "error"}:
+            # The stage raised instead of returning its usual result
+            print(f"❌ {info['title']} failed: {step.get('error')}")
             print()
-            return deploy_result
-            
-        except Exception as e:
-            print(f"❌ Deployment failed: {e}")
-            if args.debug:
-                traceback.print_exc()
-            self.log_session_event("deploy_failed", {"error": str(e)})
-            return {"status": "failed", "error": str(e)}
+            self.log_session_event(f"{info['event']}_failed", {"error": step.get("error")})
+            return
+        
+        self.log_session_event(f"{info['event']}_complete", result)
+        getattr(self, info['printer'])(result)
+        print(f"⏱️  {info['title']} took {step.get('duration', 0):.1f}s")
+        print()
     
-    def generate_documentation(self, implementation: dict, analysis: dict, args) -> dict:
-        """Generate documentation for the implementation"""
-        print("📚 GENERATING DOCUMENTATION")
-        print("=" * 50)
+    def print_test_results(self, test_results: dict):
+        """Show the outcome of the test stages"""
+        print("📊 TEST RESULTS")
+        print("-" * 30)
+        print(f"Overall Status: {test_results['overall_status'].upper()}")
+        if test_results.get("mode") == "affected":
+            print(f"Scope: {len(test_results['affected_files'])} affected files (use --full-tests for everything)")
+        elif test_results.get("full_run_reason"):
+            print(f"Scope: all files ({test_results['full_run_reason']})")
+        
+        for test in test_results['tests_run']:
+            test_name = test['name'].replace('_', ' ').title()
+            test_status = test['result']['status']
+            status_icon = "✅" if test_status == "success" else "❌" if test_status == "failed" else "⚠️"
+            duration = test['result'].get('duration')
+            timing = f" ({duration:.1f}s)" if duration else ""
+            print(f"{status_icon} {test_name}: {test_status}{timing}")
+        
+        bundle = test_results.get('bundle')
+        if bundle:
+            print(f"📦 Client JS: {bundle['total_bytes'] / (1024 * 1024):.2f} MB")
+            for route, change in bundle['diff']['routes'].items():
+                sign = "+" if change['delta'] > 0 else "-"
+                print(f"    {route}: {sign}{abs(change['delta']) / 1000:.1f} kB first-load JS")
+        
+        if test_results.get('failures'):
+            print("\n❌ Test Failures:")
+            for failure in test_results['failures']:
+                print(f"    - {failure}")
+        
+        if test_results.get('warnings'):
+            print("\n⚠️  Test Warnings:")
+            for warning in test_results['warnings']:
+                print(f"    - {warning}")
+    
+    def print_progress(self, stage: str, progress: dict):
+        """Show a live progress line from a running test stage"""
+        stage_name = stage.replace('_', ' ').title()
+        percent = f" ({progress['percent']:.0f}%)" if progress.get('percent') is not None else ""
+        print(f"   ⏳ {stage_name}: {progress['message']}{percent}", flush=True)
+    
+    def print_commit_results(self, commit_result: dict):
+        """Show the outcome of the git commit"""
+        print("✅ GIT COMMIT RESULTS")
+        print("-" * 30)
+        print(f"Status: {commit_result['status'].upper()}")
         
-        try:
-            docs_result = self.automator.generate_documentation(implementation, analysis)
-            self.log_session_event("docs_complete", docs_result)
-            
-            print("✅ DOCUMENTATION GENERATED")
-            print("-" * 30)
-            
-            if docs_result.get('files_created'):
-                print("📄 Documentation files:")
-                for doc_file in docs_result['files_created']:
-                    print(f"    📝 {doc_file}")
-            
-            print()
-            return docs_result
-            
-        except Exception as e:
-            print(f"❌ Documentation generation failed: {e}")
-            if args.debug:
-                traceback.print_exc()
-            self.log_session_event("docs_failed", {"error": str(e)})
-            return {"status": "failed", "error": str(e)}
+        if commit_result.get('commit_hash'):
+            print(f"📝 Commit: {commit_result['commit_hash']}")
+        
+        if commit_result.get('message'):
+            print(f"💬 Message: {commit_result['message']}")
+        
+        if commit_result.get('files_committed'):
+            print(f"📄 Files: {len(commit_result['files_committed'])} committed")
+        
+        if commit_result.get('error'):
+            print(f"❌ Error: {commit_result['error']}")
+    
+    def print_deploy_results(self, deploy_result: dict):
+        """Show the outcome of the deployment"""
+        print("🎉 DEPLOYMENT RESULTS")
+        print("-" * 30)
+        print(f"Status: {deploy_result['status'].upper()}")
+        
+        if deploy_result.get('url'):
+            print(f"🌐 URL: {deploy_result['url']}")
+        
+        if deploy_result.get('deployment_id'):
+            print(f"🆔 Deployment ID: {deploy_result['deployment_id']}")
+        
+        if deploy_result.get('duration'):
+            print(f"⏱️  Duration: {deploy_result['duration']:.1f}s")
+        
+        if deploy_result.get('error'):
+            print(f"❌ Error: {deploy_result['error']}")
+        
+        for warning in deploy_result.get('warnings', []):
+            print(f"⚠️  {warning}")
+    
+    def print_documentation_results(self, docs_result: dict):
+        """Show the generated documentation files"""
+        print("✅ DOCUMENTATION GENERATED")
+        print("-" * 30)
+        
+        if docs_result.get('files_created'):
+            print("📄 Documentation files:")
+            for doc_file in docs_result['files_created']:
+                print(f"    📝 {doc_file}")
+        
+        if docs_result.get('error'):
+            print(f"❌ Error: {docs_result['error']}")
     
     def save_session_log(self):
         """Save session log for debugging and analysis"""
@@ -499,7 +588,8 @@ class PrismAutoComplete:
                 else:
                     icon = "⚠️"
                 
-                print(f"{icon} {phase_name}: {status.title()}")
+                timing = f" ({result['duration']:.1f}s)" if result.get("duration") else ""
+                print(f"{icon} {phase_name}: {status.title()}{timing}")
         
         print("\n" + "=" * 70)
         print(f"🕒 Session ID: {self.session_id}")
@@ -517,13 +607,19 @@ Examples:
   python prism_auto_complete.py "create a new about page with team information"
   python prism_auto_complete.py "fix the mobile navigation menu" --skip-deploy
   python prism_auto_complete.py "add a contact form with validation" --analyze-only
+  python prism_auto_complete.py "create a pricing page" --dry-run
   python prism_auto_complete.py "enhance the homepage with animations" --auto-confirm
+  python prism_auto_complete.py --manifest site-pages.yaml --skip-deploy
             """
         )
         
-        parser.add_argument("request", help="Natural language description of what to implement")
+        parser.add_argument("request", nargs="?", help="Natural language description of what to implement")
+        parser.add_argument("--manifest", help="YAML/JSON manifest of pages and components to scaffold in one run")
+        parser.add_argument("--workers", type=int, help="Render threads for --manifest (default: based on CPU count)")
         parser.add_argument("--analyze-only", action="store_true", help="Only analyze the request, don't implement")
+        parser.add_argument("--dry-run", action="store_true", help="Analyze and print a diff of the planned changes without writing anything")
         parser.add_argument("--skip-tests", action="store_true", help="Skip running tests")
+        parser.add_argument("--full-tests", action="store_true", help="Lint, type-check and unit-test the whole project instead of only affected files")
         parser.add_argument("--skip-commit", action="store_true", help="Skip git commit")
         parser.add_argument("--skip-deploy", action="store_true", help="Skip deployment")
         parser.add_argument("--auto-confirm", action="store_true", help="Auto-confirm implementation without user prompt")
@@ -532,6 +628,8 @@ Examples:
         parser.add_argument("--project-root", help="Override project root directory")
         
         args = parser.parse_args()
+        if not args.request and not args.manifest:
+            parser.error("a request or --manifest is required")
         
         # Override project root if specified
         if args.project_root:
@@ -548,45 +646,52 @@ Examples:
         results = {}
         
         try:
-            # Phase 1: Analyze Request
-            analysis = self.analyze_request(args.request, args)
-            if not analysis:
-                sys.exit(1)
-            results["analysis"] = analysis
-            
-            # Stop here if analyze-only
-            if args.analyze_only:
-                print("✅ Analysis complete (--analyze-only flag)")
-                self.save_session_log()
-                return
-            
-            # Phase 2: Confirm Implementation
-            if not self.confirm_implementation(analysis, args):
-                self.save_session_log()
-                return
-            
-            # Phase 3: Implement
-            implementation = self.implement_request(analysis, args)
-            if not implementation:
-                sys.exit(1)
-            results["implementation"] = implementation
-            
-            # Phase 4: Test
-            test_results = self.run_tests(implementation, args)
-            results["testing"] = test_results
-            
-            # Phase 5: Commit
-            commit_results = self.commit_changes(implementation, analysis, args)
-            results["commit"] = commit_results
-            
-            # Phase 6: Deploy
-            deploy_results = self.deploy_changes(args)
-            results["deployment"] = deploy_results
-            
-            # Phase 7: Documentation
-            if self.automator.config.get("automation", {}).get("generate_docs", True):
-                docs_results = self.generate_documentation(implementation, analysis, args)
-                results["documentation"] = docs_results
+            if args.manifest:
+                # Bulk mode: one render/write pass, then a single test, commit and deploy
+                implementation = self.scaffold_manifest(args)
+                if not implementation:
+                    sys.exit(1)
+                analysis = {
+                    "request": implementation["request"],
+                    "type": "bulk_scaffold",
+                    **implementation["manifest"]
+                }
+                results["implementation"] = implementation
+            else:
+                # Phase 1: Analyze Request
+                analysis = self.analyze_request(args.request, args)
+                if not analysis:
+                    sys.exit(1)
+                results["analysis"] = analysis
+                
+                # Stop here if analyze-only
+                if args.analyze_only:
+                    print("✅ Analysis complete (--analyze-only flag)")
+                    self.save_session_log()
+                    return
+                
+                # Stop after the diff preview if dry-run
+                if args.dry_run:
+                    self.print_diff_preview(analysis)
+                    print("✅ Dry run complete (--dry-run flag), no files were written")
+                    self.save_session_log()
+                    return
+                
+                # Phase 2: Confirm Implementation
+                if not self.confirm_implementation(analysis, args):
+                    self.save_session_log()
+                    return
+                
+                # Phase 3: Implement
+                implementation = self.implement_request(analysis, args)
+                if not implementation:
+                    sys.exit(1)
+                results["implementation"] = implementation
+            
+            # Phases 4-7: Test, commit, deploy and document (docs alongside the tests)
+            pipeline_result = self.run_pipeline(implementation, analysis, args)
+            for stage, step in pipeline_result["steps"].items():
+                results[stage] = step
             
             # Final summary
             self.print_summary(results)
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Stage Scheduler for Prism Writing Development Automation
+
+This module runs validation stages (build, type check, lint, tests) as a small
+dependency graph instead of a fixed sequence. Stages whose dependencies are
+done start as soon as their CPU and memory estimates fit in the machine's
+budget, so independent work overlaps and a full validation takes about as
+long as its longest chain. When a blocking stage fails, the remaining stages
+are cancelled and their child processes terminated (fail fast).
+"""
+
+import os
+import signal
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from stream_runner import PrismStreamResult, run_streaming
+
+
+class StageCancelled(BaseException):
+    """Raised inside a stage whose process group has been cancelled
+
+    Derives from BaseException (like asyncio.CancelledError) so the stages'
+    own "except Exception" handlers do not turn it into an ordinary failure.
+    """
+
+
+def available_memory_mb() -> Optional[int]:
+    """Memory that can be used without swapping, or None if unknown"""
+    try:
+        with open('/proc/meminfo', 'r') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError):
+        pass
+
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+class PrismProcessGroup:
+    """Tracks the subprocesses started by stages so they can be cancelled together"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.processes: List[subprocess.Popen] = []
+        self.cancelled = threading.Event()
+
+    def run(self, args: List[str], cwd, timeout: Optional[float] = None, log_file: Optional[Path] = None,
+            on_progress: Optional[Callable[[Dict], None]] = None) -> PrismStreamResult:
+        """subprocess.run equivalent that streams output and honors cancel()
+
+        stdout/stderr of the result hold the tail only; the full output goes
+        to log_file when one is given.
+        """
+        if self.cancelled.is_set():
+            raise StageCancelled(' '.join(args))
+
+        popen_kwargs = {}
+        if os.name == 'posix':
+            # Own process group, so npm/npx children are terminated with their parent
+            popen_kwargs["start_new_session"] = True
+
+        started = []
+
+        def register(process: subprocess.Popen):
+            started.append(process)
+            with self.lock:
+                self.processes.append(process)
+
+        try:
+            result = run_streaming(
+                args, cwd,
+                log_file=log_file,
+                timeout=timeout,
+                on_progress=on_progress,
+                on_start=register,
+                kill=self._terminate,
+                **popen_kwargs
+            )
+        finally:
+            with self.lock:
+                for process in started:
+                    self.processes.remove(process)
+
+        if self.cancelled.is_set():
+            raise StageCancelled(' '.join(args))
+        return result
+
+    def cancel(self):
+        """Terminate every running process and refuse to start new ones"""
+        self.cancelled.set()
+        with self.lock:
+            processes = list(self.processes)
+        for process in processes:
+            self._terminate(process)
+
+    def reset(self):
+        self.cancelled.clear()
+
+    def _terminate(self, process: subprocess.Popen):
+        if process.poll() is not None:
+            return
+        try:
+            if os.name == 'posix':
+                os.killpg(process.pid, signal.SIGTERM)
+            else:
+                process.terminate()
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+class PrismStage:
+    """One unit of scheduled work with its dependencies and resource estimate"""
+
+    def __init__(self, name: str, run: Callable[[], Dict], depends_on: Optional[List[str]] = None,
+                 blocking: bool = True, cpu: int = 1, memory_mb: int = 512):
+        self.name = name
+        self.run = run
+        self.depends_on = list(depends_on or [])
+        self.blocking = blocking
+        self.cpu = cpu
+        self.memory_mb = memory_mb
+
+
+class PrismStageScheduler:
+    """Run stages concurrently within CPU and memory limits, failing fast"""
+
+    def __init__(self, max_cpu: Optional[int] = None, max_memory_mb: Optional[int] = None,
+                 fail_fast: bool = True, on_cancel: Optional[Callable[[], None]] = None,
+                 on_start: Optional[Callable[[str], None]] = None,
+                 on_complete: Optional[Callable[[str, Dict], None]] = None):
+        self.max_cpu = max_cpu or os.cpu_count() or 1
+        self.max_memory_mb = max_memory_mb if max_memory_mb is not None else available_memory_mb()
+        self.fail_fast = fail_fast
+        self.on_cancel = on_cancel
+        # Called from the scheduling thread, so callbacks never run concurrently
+        self.on_start = on_start
+        self.on_complete = on_complete
+
+    def run(self, stages: List[PrismStage]) -> Dict[str, Dict]:
+        """Run all stages and return their results keyed by stage name"""
+        by_name = {stage.name: stage for stage in stages}
+        for stage in stages:
+            missing = [dep for dep in stage.depends_on if dep not in by_name]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {', '.join(missing)}")
+
+        pending = list(stages)
+        running = {}
+        results: Dict[str, Dict] = {}
+        cancelled = False
+        cpu_in_use = 0
+        memory_in_use = 0
+
+        with ThreadPoolExecutor(max_workers=max(1, len(stages))) as executor:
+            while pending or running:
+                for stage in list(pending):
+                    if cancelled:
+                        self._finish(results, stage.name, self._skipped(stage, "cancelled", "Cancelled after a blocking stage failed"))
+                        pending.remove(stage)
+                        continue
+
+                    failed_deps = [dep for dep in stage.depends_on
+                                   if dep in results and results[dep]["status"] != "success"]
+                    if failed_deps:
+                        self._finish(results, stage.name, self._skipped(stage, "skipped", f"Skipped because {', '.join(failed_deps)} did not succeed"))
+                        pending.remove(stage)
+                        continue
+                    if any(dep not in results for dep in stage.depends_on):
+                        continue
+
+                    if running and not self._fits(stage, cpu_in_use, memory_in_use):
+                        continue
+
+                    if self.on_start:
+                        self.on_start(stage.name)
+                    future = executor.submit(self._run_stage, stage)
+                    running[future] = stage
+                    cpu_in_use += stage.cpu
+                    memory_in_use += stage.memory_mb
+                    pending.remove(stage)
+
+                if not running:
+                    if pending:
+                        raise ValueError(f"Stage dependency cycle among: {', '.join(stage.name for stage in pending)}")
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    cpu_in_use -= stage.cpu
+                    memory_in_use -= stage.memory_mb
+                    result = future.result()
+                    if cancelled and result["status"] != "success":
+                        # Terminated by the cancellation, not a failure of its own
+                        result["status"] = "cancelled"
+                    self._finish(results, stage.name, result)
+
+                    if self.fail_fast and stage.blocking and result["status"] == "failed" and not cancelled:
+                        cancelled = True
+                        if self.on_cancel:
+                            self.on_cancel()
+
+        return results
+
+    def _finish(self, results: Dict[str, Dict], name: str, result: Dict):
+        results[name] = result
+        if self.on_complete:
+            self.on_complete(name, result)
+
+    def _fits(self, stage: PrismStage, cpu_in_use: int, memory_in_use: int) -> bool:
+        if cpu_in_use + stage.cpu > self.max_cpu:
+            return False
+        if self.max_memory_mb is not None and memory_in_use + stage.memory_mb > self.max_memory_mb:
+            return False
+        return True
+
+    def _run_stage(self, stage: PrismStage) -> Dict:
+        """Run one stage, turning exceptions into a failed result"""
+        started = datetime.now()
+        try:
+            result = stage.run()
+        except StageCancelled:
+            result = {"status": "cancelled", "output": "", "errors": ["Cancelled after a blocking stage failed"]}
+        except Exception as e:
+            result = {"status": "failed", "output": "", "errors": [str(e)]}
+
+        result.setdefault("duration", (datetime.now() - started).total_seconds())
+        return result
+
+    def _skipped(self, stage: PrismStage, status: str, reason: str) -> Dict:
+        return {"status": status, "output": "", "errors": [reason], "duration": 0}
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Streaming Process Runner for Prism Writing Development Automation
+
+This module runs long commands (builds, type checks, installs, deploys)
+without buffering their whole output. Each line is written to a per-stage log
+file as it arrives, only a bounded tail is kept in memory for the result
+dicts and session logs, and recognizable progress lines (Next.js build steps,
+"(12/40)" counters, percentages) are reported live through a callback. Memory
+use stays flat however verbose the tool is; the complete output is in the log.
+"""
+
+import re
+import subprocess
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+# Lines kept per stream for the in-memory tail
+DEFAULT_TAIL_LINES = 200
+# Longer lines (minified bundles, source maps in stack traces) are cut in the tail
+MAX_TAIL_LINE_LENGTH = 2000
+
+ANSI_ESCAPE = re.compile(r'\x1b\[[0-9;?]*[A-Za-z]')
+FRACTION = re.compile(r'\((\d+)/(\d+)\)')
+PERCENT = re.compile(r'(?<![\d.])(\d{1,3}(?:\.\d+)?)%')
+
+# Milestones printed by `next build` and the tools it drives
+PROGRESS_MARKERS = (
+    "Creating an optimized production build",
+    "Compiling",
+    "Compiled successfully",
+    "Compiled with warnings",
+    "Failed to compile",
+    "Linting and checking validity of types",
+    "Collecting page data",
+    "Generating static pages",
+    "Collecting build traces",
+    "Finalizing page optimization",
+    "added ",
+    "Deploying",
+    "Inspect:",
+    "Production:",
+)
+
+
+def parse_progress(line: str) -> Optional[Dict]:
+    """Recognize a progress line; returns {"message", "percent"} or None"""
+    text = ANSI_ESCAPE.sub('', line).strip()
+    if not text:
+        return None
+
+    fraction = FRACTION.search(text)
+    if fraction and int(fraction.group(2)):
+        return {"message": text, "percent": 100.0 * int(fraction.group(1)) / int(fraction.group(2))}
+
+    if any(marker in text for marker in PROGRESS_MARKERS):
+        percent = PERCENT.search(text)
+        return {"message": text, "percent": float(percent.group(1)) if percent else None}
+    return None
+
+
+class PrismStreamResult(subprocess.CompletedProcess):
+    """CompletedProcess whose stdout/stderr hold only the tail of the output"""
+
+    def __init__(self, args, returncode: int, stdout: str, stderr: str,
+                 log_file: Optional[Path], line_count: int, truncated: bool):
+        super().__init__(args, returncode, stdout, stderr)
+        self.log_file = log_file
+        self.line_count = line_count
+        self.truncated = truncated
+
+
+def run_streaming(args: Union[str, List[str]], cwd, log_file: Optional[Path] = None,
+                  tail_lines: int = DEFAULT_TAIL_LINES, timeout: Optional[float] = None,
+                  on_progress: Optional[Callable[[Dict], None]] = None,
+                  on_start: Optional[Callable[[subprocess.Popen], None]] = None,
+                  kill: Optional[Callable[[subprocess.Popen], None]] = None,
+                  shell: bool = False, **popen_kwargs) -> PrismStreamResult:
+    """Run a command, teeing its output to log_file and keeping a bounded tail
+
+    on_start receives the Popen object (e.g. to register it for cancellation)
+    and kill replaces Popen.kill on timeout (e.g. to kill a process group).
+    Raises subprocess.TimeoutExpired (with the tail as output) after timeout.
+    """
+    if log_file is not None:
+        log_file = Path(log_file)
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+    log = open(log_file, 'w', encoding='utf-8', errors='replace') if log_file else None
+    log_lock = threading.Lock()
+    tails = {"stdout": deque(maxlen=tail_lines), "stderr": deque(maxlen=tail_lines)}
+    counts = {"stdout": 0, "stderr": 0}
+
+    try:
+        process = subprocess.Popen(
+            args,
+            cwd=cwd,
+            shell=shell,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            bufsize=1,
+            **popen_kwargs
+        )
+    except BaseException:
+        if log:
+            log.close()
+        raise
+
+    if on_start:
+        on_start(process)
+
+    def pump(name: str, stream):
+        tail = tails[name]
+        for line in stream:
+            counts[name] += 1
+            if log:
+                with log_lock:
+                    log.write(line)
+            line = line.rstrip('\n')
+            tail.append(line if len(line) <= MAX_TAIL_LINE_LENGTH else line[:MAX_TAIL_LINE_LENGTH] + ' …')
+            if on_progress:
+                progress = parse_progress(line)
+                if progress:
+                    on_progress(progress)
+        stream.close()
+
+    readers = [
+        threading.Thread(target=pump, args=("stdout", process.stdout), daemon=True),
+        threading.Thread(target=pump, args=("stderr", process.stderr), daemon=True)
+    ]
+    for reader in readers:
+        reader.start()
+
+    timed_out = False
+    try:
+        process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        timed_out = True
+        (kill or subprocess.Popen.kill)(process)
+        process.wait()
+    except BaseException:
+        process.kill()
+        process.wait()
+        raise
+    finally:
+        for reader in readers:
+            reader.join()
+        if log:
+            log.close()
+
+    if timed_out:
+        raise subprocess.TimeoutExpired(args, timeout, output='\n'.join(tails["stdout"]), stderr='\n'.join(tails["stderr"]))
+
+    truncated = counts["stdout"] > tail_lines or counts["stderr"] > tail_lines
+
+    def render(name: str) -> str:
+        text = '\n'.join(tails[name])
+        if counts[name] > tail_lines:
+            skipped = counts[name] - tail_lines
+            where = f", see {log_file}" if log_file else ""
+            text = f"[... {skipped} earlier lines omitted{where}]\n" + text
+        return text + '\n' if tails[name] else text
+
+    return PrismStreamResult(
+        args, process.returncode, render("stdout"), render("stderr"),
+        log_file, counts["stdout"] + counts["stderr"], truncated
+    )
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Structured Logging for Prism Writing Development Automation
+
+This module writes automation.log as JSON lines through an in-memory buffer.
+A call to log() only appends a record to a list. A background thread writes
+the buffered records in one batch every flush interval, or sooner once the
+buffer fills, through a file handle that stays open. The log rotates by
+size (automation.log.1, .2, ...).
+
+Each record carries the run id of the process that wrote it. It also
+carries the pipeline stage active on the calling thread and any extra
+fields, such as a duration, so the log can be filtered with query() instead
+of grepped.
+
+Record format:
+    {"ts", "run_id", "level", "stage", "message", "duration"?, ...}
+"""
+
+import os
+import json
+import time
+import atexit
+import threading
+from pathlib import Path
+from datetime import datetime
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+_loggers: Dict[Path, "PrismLogger"] = {}
+_loggers_lock = threading.Lock()
+
+
+class PrismLogger:
+    """Buffered JSONL log with a background flusher and size-based rotation"""
+
+    def __init__(self, path: str, run_id: Optional[str] = None, max_bytes: int = 10 * 1024 * 1024,
+                 backups: int = 3, flush_interval: float = 1.0, buffer_size: int = 1000):
+        self.path = Path(path)
+        self.run_id = run_id or f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        self.buffer: List[str] = []
+        self.lock = threading.Lock()
+        # Serializes writers (flusher thread, explicit flush) so records stay in order
+        self.write_lock = threading.Lock()
+        self.wake = threading.Event()
+        self.local = threading.local()
+        self.stream = None
+        self.closed = False
+        self.flusher = threading.Thread(target=self._flush_loop, name="prism-log-flusher", daemon=True)
+        self.flusher.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def from_config(cls, path: str, config: Dict) -> "PrismLogger":
+        """Logger using the logging section of the automation config"""
+        settings = config.get("logging") or {}
+        return cls(
+            path,
+            max_bytes=int(settings.get("max_size_mb", 10) * 1024 * 1024),
+            backups=settings.get("backups", 3),
+            flush_interval=settings.get("flush_seconds", 1.0)
+        )
+
+    def log(self, message: str, level: str = "INFO", **fields) -> Dict:
+        """Buffer one record; returns it"""
+        record = {
+            "ts": datetime.now().isoformat(),
+            "run_id": self.run_id,
+            "level": level,
+            "stage": getattr(self.local, "stage", None),
+            "message": message
+        }
+        record.update(fields)
+        line = json.dumps(record, default=str)
+        with self.lock:
+            self.buffer.append(line)
+            full = len(self.buffer) >= self.buffer_size
+        if full:
+            self.wake.set()
+        return record
+
+    @contextmanager
+    def stage(self, name: str):
+        """Tag records logged by this thread with a stage; logs the stage's duration at the end"""
+        previous = getattr(self.local, "stage", None)
+        self.local.stage = name
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self.log(f"{name} raised {type(e).__name__}: {e}", "ERROR", duration=round(time.monotonic() - started, 3))
+            raise
+        else:
+            self.log(f"{name} finished", duration=round(time.monotonic() - started, 3))
+        finally:
+            self.local.stage = previous
+
+    def flush(self):
+        """Write every buffered record now"""
+        with self.write_lock:
+            with self.lock:
+                lines, self.buffer = self.buffer, []
+            if not lines:
+                return
+            try:
+                if self.stream is None:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    self.stream = open(self.path, 'a', encoding='utf-8')
+                # Records are ASCII (json.dumps escapes the rest), so characters are bytes
+                size, chunk = self.stream.tell(), []
+                for line in lines:
+                    if self.max_bytes and size > 0 and size + len(line) + 1 > self.max_bytes:
+                        self.stream.write("".join(chunk))
+                        self._rotate()
+                        size, chunk = 0, []
+                    chunk.append(line + "\n")
+                    size += len(line) + 1
+                self.stream.write("".join(chunk))
+                self.stream.flush()
+            except OSError:
+                # Logging must never take the automation down; the records are dropped
+                self._close_stream()
+
+    def close(self):
+        """Stop the flusher and write what is left"""
+        if self.closed:
+            return
+        self.closed = True
+        self.wake.set()
+        self.flusher.join(timeout=5)
+        self.flush()
+        with self.write_lock:
+            self._close_stream()
+
+    def query(self, run_id: Optional[str] = None, stage: Optional[str] = None, level: Optional[str] = None,
+              since: Optional[str] = None, contains: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
+        """Records matching every given filter, oldest first (rotated files included)
+
+        since is an ISO timestamp; contains matches the message
+        case-insensitively; limit keeps the newest records.
+        """
+        self.flush()
+        matches = []
+        for record in read_records(self.path, self.backups):
+            if run_id is not None and record.get("run_id") != run_id:
+                continue
+            if stage is not None and record.get("stage") != stage:
+                continue
+            if level is not None and record.get("level") != level:
+                continue
+            if since is not None and record.get("ts", "") < since:
+                continue
+            if contains is not None and contains.lower() not in str(record.get("message", "")).lower():
+                continue
+            matches.append(record)
+        return matches[-limit:] if limit else matches
+
+    def _flush_loop(self):
+        while not self.closed:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            self.flush()
+
+    def _rotate(self):
+        self._close_stream()
+        for index in range(self.backups - 1, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{index}")
+            if source.exists():
+                os.replace(source, self.path.with_name(f"{self.path.name}.{index + 1}"))
+        if self.backups > 0:
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+        self.stream = open(self.path, 'a', encoding='utf-8')
+
+    def _close_stream(self):
+        if self.stream is not None:
+            try:
+                self.stream.close()
+            except OSError:
+                pass
+            self.stream = None
+
+
+def read_records(path: str, backups: int = 3) -> Iterator[Dict]:
+    """Parse a JSONL log and its rotated files, oldest first (non-JSON lines are skipped)"""
+    path = Path(path)
+    files = [path.with_name(f"{path.name}.{index}") for index in range(backups, 0, -1)] + [path]
+    for file_path in files:
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Plain-text lines written before the log became structured
+                        continue
+                    if isinstance(record, dict):
+                        yield record
+        except FileNotFoundError:
+            continue
+
+
+def get_logger(path: str, config: Optional[Dict] = None) -> PrismLogger:
+    """Session-wide logger for a log file, shared so only one flusher writes to it"""
+    resolved = Path(path).resolve()
+    with _loggers_lock:
+        if resolved not in _loggers or _loggers[resolved].closed:
+            _loggers[resolved] = PrismLogger.from_config(str(resolved), config or {})
+        return _loggers[resolved]
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Template Engine for Prism Writing Development Automation
+
+This module renders the file_templates defined in automation-config.yaml.
+Templates are parsed once into a render plan that is cached by source, so
+rendering is a walk over pre-split literal and variable nodes.
+
+Syntax (chosen so it does not collide with JSX):
+    {{ name }} / {{ item.field|lower }}   variable with optional filters
+    {% for item in items %}...{% endfor %} loop (exposes loop.index/first/last)
+    {% if name %}...{% elif other %}...{% else %}...{% endif %}
+    {ComponentName}                        legacy placeholder, only substituted
+                                           when the name is in the context
+
+A block tag that sits alone on its line does not leave a blank line behind.
+Variables that are not in the context are emitted verbatim, so JSX such as
+{{ color: 'red' }} or {/* comment */} passes through untouched.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+TOKEN_PATTERN = re.compile(
+    r'(?P<indent>[ \t]*)\{%\s*(?P<tag>.*?)\s*%\}(?P<trail>[ \t]*\n)?'
+    r'|(?P<var>\{\{\s*(?P<expr>[A-Za-z_][\w.-]*(?:\s*\|\s*[a-z_]+)*)\s*\}\})'
+    r'|(?P<legacy>\{(?P<legacy_name>[A-Za-z][\w-]*)\})'
+)
+
+
+def _words(value) -> List[str]:
+    """Split a name like 'about-us', 'About Us' or 'AboutUs' into words"""
+    spaced = re.sub(r'(?<=[a-z0-9])(?=[A-Z])', ' ', str(value))
+    return [word for word in re.split(r'[^A-Za-z0-9]+', spaced) if word]
+
+
+def _pascal(value) -> str:
+    return ''.join(word[:1].upper() + word[1:] for word in _words(value))
+
+
+FILTERS = {
+    "lower": lambda value: str(value).lower(),
+    "upper": lambda value: str(value).upper(),
+    "title": lambda value: ' '.join(word[:1].upper() + word[1:] for word in _words(value)),
+    "kebab": lambda value: '-'.join(word.lower() for word in _words(value)),
+    "pascal": _pascal,
+    "camel": lambda value: _pascal(value)[:1].lower() + _pascal(value)[1:],
+}
+
+_MISSING = object()
+
+
+class TemplateSyntaxError(ValueError):
+    """Raised when a template cannot be compiled"""
+
+
+class PrismTemplate:
+    """A compiled template: a tree of literal, variable, loop and condition nodes"""
+
+    def __init__(self, source: str, name: str = "<string>"):
+        self.name = name
+        self.nodes = self._compile(source)
+
+    def render(self, context: Dict) -> str:
+        """Render the template with a context dict"""
+        out: List[str] = []
+        self._render_nodes(self.nodes, [context], out)
+        return ''.join(out)
+
+    def _compile(self, source: str) -> List:
+        """Parse source into a nested node list"""
+        root: List = []
+        stack = [("root", root, None)]
+        position = 0
+
+        for match in TOKEN_PATTERN.finditer(source):
+            text_end = match.start()
+            position_after = match.end()
+
+            if match.group("tag") is not None:
+                # A block tag swallows its whole line only when it stands alone on it
+                standalone = (
+                    (text_end == 0 or source[text_end - 1] == '\n')
+                    and (match.group("trail") is not None or position_after == len(source))
+                )
+                if not standalone:
+                    text_end += len(match.group("indent"))
+                    position_after -= len(match.group("trail") or "")
+
+            if text_end > position:
+                stack[-1][1].append(("text", source[position:text_end]))
+            position = position_after
+
+            if match.group("var"):
+                parts = [part.strip() for part in match.group("expr").split('|')]
+                stack[-1][1].append(("var", parts[0].split('.'), parts[1:], match.group("var")))
+                for filter_name in parts[1:]:
+                    if filter_name not in FILTERS:
+                        raise TemplateSyntaxError(f"{self.name}: unknown filter '{filter_name}'")
+                continue
+
+            if match.group("legacy"):
+                name = match.group("legacy_name")
+                stack[-1][1].append(("var", [name], [], match.group("legacy")))
+                continue
+
+            self._compile_tag(match.group("tag"), stack)
+
+        if position < len(source):
+            stack[-1][1].append(("text", source[position:]))
+        if len(stack) > 1:
+            raise TemplateSyntaxError(f"{self.name}: unclosed '{{% {stack[-1][0]} %}}' block")
+        return root
+
+    def _compile_tag(self, tag: str, stack: List):
+        """Open, continue or close a block"""
+        words = tag.split()
+        keyword = words[0] if words else ""
+
+        if keyword == "for":
+            if len(words) != 4 or words[2] != "in":
+                raise TemplateSyntaxError(f"{self.name}: expected '{{% for item in items %}}', got '{tag}'")
+            body: List = []
+            node = ("for", words[1], words[3].split('.'), body)
+            stack[-1][1].append(node)
+            stack.append(("for", body, node))
+        elif keyword == "if":
+            body = []
+            node = ("if", [(self._condition(words[1:], tag), body)])
+            stack[-1][1].append(node)
+            stack.append(("if", body, node))
+        elif keyword in ("elif", "else"):
+            if stack[-1][0] != "if":
+                raise TemplateSyntaxError(f"{self.name}: '{keyword}' outside of an if block")
+            _, _, node = stack.pop()
+            body = []
+            condition = self._condition(words[1:], tag) if keyword == "elif" else None
+            node[1].append((condition, body))
+            stack.append(("if", body, node))
+        elif keyword in ("endfor", "endif"):
+            if stack[-1][0] != keyword[3:]:
+                raise TemplateSyntaxError(f"{self.name}: unexpected '{{% {keyword} %}}'")
+            stack.pop()
+        else:
+            raise TemplateSyntaxError(f"{self.name}: unknown tag '{tag}'")
+
+    def _condition(self, words: List[str], tag: str):
+        """Compile 'name' or 'not name' into a (negate, path) pair"""
+        negate = bool(words) and words[0] == "not"
+        if negate:
+            words = words[1:]
+        if len(words) != 1:
+            raise TemplateSyntaxError(f"{self.name}: unsupported condition in '{tag}'")
+        return (negate, words[0].split('.'))
+
+    def _render_nodes(self, nodes: List, scopes: List[Dict], out: List[str]):
+        """Append the rendered output of a node list to out"""
+        append = out.append
+        for node in nodes:
+            kind = node[0]
+            if kind == "text":
+                append(node[1])
+            elif kind == "var":
+                value = self._lookup(node[1], scopes)
+                if value is _MISSING:
+                    append(node[3])
+                    continue
+                for filter_name in node[2]:
+                    value = FILTERS[filter_name](value)
+                append(str(value))
+            elif kind == "for":
+                items = self._lookup(node[2], scopes)
+                items = [] if items is _MISSING or items is None else list(items)
+                count = len(items)
+                for index, item in enumerate(items):
+                    loop = {"index": index + 1, "index0": index, "first": index == 0, "last": index == count - 1}
+                    scopes.append({node[1]: item, "loop": loop})
+                    self._render_nodes(node[3], scopes, out)
+                    scopes.pop()
+            elif kind == "if":
+                for condition, body in node[1]:
+                    if condition is None or self._truthy(condition, scopes):
+                        self._render_nodes(body, scopes, out)
+                        break
+
+    def _truthy(self, condition, scopes: List[Dict]) -> bool:
+        negate, path = condition
+        value = self._lookup(path, scopes)
+        result = value is not _MISSING and bool(value)
+        return not result if negate else result
+
+    def _lookup(self, path: List[str], scopes: List[Dict]):
+        """Resolve a dotted name against the scope stack (innermost first)"""
+        for scope in reversed(scopes):
+            if path[0] in scope:
+                value = scope[path[0]]
+                break
+        else:
+            return _MISSING
+
+        for part in path[1:]:
+            if isinstance(value, dict):
+                value = value.get(part, _MISSING)
+            else:
+                value = getattr(value, part, _MISSING)
+            if value is _MISSING:
+                return _MISSING
+        return value
+
+
+@lru_cache(maxsize=256)
+def compile_template(source: str, name: str = "<string>") -> PrismTemplate:
+    """Compile a template source once; repeated calls return the cached plan"""
+    return PrismTemplate(source, name)
+
+
+class PrismTemplateEngine:
+    """Named template registry backed by the file_templates config section"""
+
+    def __init__(self, templates: Optional[Dict[str, str]] = None):
+        self.templates = dict(templates or {})
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "PrismTemplateEngine":
+        """Build an engine from a full automation config"""
+        return cls(config.get("file_templates") or {})
+
+    def has_template(self, name: str) -> bool:
+        return name in self.templates
+
+    def get_template(self, name: str) -> PrismTemplate:
+        """Return the compiled render plan for a named template"""
+        if name not in self.templates:
+            raise KeyError(f"Template not found: {name}")
+        return compile_template(self.templates[name], name)
+
+    def render(self, name: str, context: Dict) -> str:
+        """Render a named template"""
+        return self.get_template(name).render(context)
+
+    def render_string(self, source: str, context: Dict) -> str:
+        """Render an ad-hoc template string"""
+        return compile_template(source).render(context)
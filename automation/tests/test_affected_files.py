@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for affected-file selection in the test runner
+
+Run from the repository root with: python -m unittest discover automation/tests
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from test_runner import PrismTestRunner
+
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "test", "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "test", "GIT_COMMITTER_EMAIL": "test@example.com"
+}
+
+
+class AffectedFilesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.write(".gitignore", ".automation_cache/\n")
+        self.write("package.json", json.dumps({"name": "fixture"}))
+        self.write("package-lock.json", json.dumps({"lockfileVersion": 3, "packages": {}}))
+        self.write(".eslintrc.json", json.dumps({"extends": "next"}))
+        self.write("tsconfig.json", json.dumps({"compilerOptions": {"baseUrl": ".", "paths": {"@/*": ["./src/*"]}}}))
+        self.write("lib/utils.ts", "export const cn = (...names: string[]) => names.join(' ')\n")
+        self.write("src/components/Button.tsx", "import { cn } from '../../lib/utils'\nexport const Button = () => cn('a')\n")
+        self.write("src/components/Card.tsx", "import { cn } from '../../lib/utils'\nexport const Card = () => cn('b')\n")
+        self.write("src/app/page.tsx", "import { Button } from '@/components/Button'\nexport default Button\n")
+        self.write("src/app/about/page.tsx", "export default function About() { return null }\n")
+        self.write("src/types/global.d.ts", "declare interface Window { analytics: unknown }\n")
+        self.write("src/types/api.d.ts", "export interface Post { title: string }\n")
+        self.write("src/app/blog/page.tsx", "import type { Post } from '@/types/api'\nexport default function Blog(p: Post) { return null }\n")
+        self.git("init", "-q")
+        self.git("add", "-A")
+        self.git("commit", "-qm", "fixture")
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def write(self, path: str, content: str):
+        target = self.root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content, encoding='utf-8')
+
+    def git(self, *args: str):
+        subprocess.run(["git", *args], cwd=self.root, check=True, env={**os.environ, **GIT_ENV})
+
+    def test_root_config_changes_fall_back_to_full_run(self):
+        for name in ("tsconfig.json", "package-lock.json", ".eslintrc.json", "next.config.js", ".env.local"):
+            with self.subTest(changed=name):
+                self.write(name, "{}\n")
+                runner = PrismTestRunner(str(self.root))
+                self.assertIsNone(runner.compute_affected_files())
+                self.assertIn(name, runner.full_run_reason(runner.changed_paths()))
+                self.git("checkout", "-q", "--", ".")
+                self.git("clean", "-qfd")
+
+    def test_source_change_stays_affected_only(self):
+        self.write("src/components/Card.tsx", "export const Card = () => null\n")
+        runner = PrismTestRunner(str(self.root))
+        self.assertEqual(runner.compute_affected_files(), ["src/components/Card.tsx"])
+
+    def test_ambient_declaration_change_falls_back_to_full_run(self):
+        self.write("src/types/global.d.ts", "declare interface Window { analytics: string }\n")
+        runner = PrismTestRunner(str(self.root))
+        self.assertIsNone(runner.compute_affected_files())
+        self.assertIn("src/types/global.d.ts", runner.full_run_reason(runner.changed_paths()))
+
+    def test_imported_declaration_change_checks_its_importers(self):
+        self.write("src/types/api.d.ts", "export interface Post { title: string; body: string }\n")
+        runner = PrismTestRunner(str(self.root))
+        self.assertEqual(runner.compute_affected_files(), ["src/app/blog/page.tsx", "src/types/api.d.ts"])
+
+    def test_deleted_module_checks_its_importers(self):
+        # Build the graph cache while the module still exists, as an earlier run would have
+        PrismTestRunner(str(self.root)).compute_affected_files(["src/app/about/page.tsx"])
+        (self.root / "lib/utils.ts").unlink()
+
+        affected = PrismTestRunner(str(self.root)).compute_affected_files()
+        self.assertEqual(affected, ["src/app/page.tsx", "src/components/Button.tsx", "src/components/Card.tsx"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the ordering of the test runner's stages
+
+Run from the repository root with: python -m unittest discover automation/tests
+"""
+
+import sys
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from test_runner import PrismTestRunner
+from stage_scheduler import PrismStageScheduler
+
+
+class BuildStagesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.runner = PrismTestRunner(str(self.root))
+        self.lock = threading.Lock()
+        self.events = []
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def recording(self, name: str, status: str = "success"):
+        def run(*args):
+            with self.lock:
+                self.events.append(("start", name))
+            time.sleep(0.2)
+            with self.lock:
+                self.events.append(("end", name))
+            return {"status": status, "output": "", "errors": []}
+        return run
+
+    def run_stages(self, test_config):
+        stages = self.runner.build_stages(test_config)
+        return PrismStageScheduler(max_cpu=8, max_memory_mb=8192).run(stages)
+
+    def test_type_check_never_overlaps_the_build(self):
+        # Both touch .next: the build rewrites .next/types, which tsc reads
+        self.runner.run_build_test = self.recording("build_test")
+        self.runner.run_type_check = self.recording("type_check")
+        self.runner.run_lint_test = self.recording("lint_test")
+
+        results = self.run_stages({"build_test": True, "type_check": True, "lint_test": True, "bundle_size": False})
+
+        self.assertEqual(results["type_check"]["status"], "success")
+        self.assertLess(self.events.index(("end", "build_test")), self.events.index(("start", "type_check")))
+        # Stages without .next access still run alongside the build
+        self.assertLess(self.events.index(("start", "lint_test")), self.events.index(("end", "build_test")))
+
+    def test_type_check_is_skipped_when_the_build_fails(self):
+        self.runner.run_build_test = self.recording("build_test", status="failed")
+        self.runner.run_type_check = self.recording("type_check")
+
+        results = self.run_stages({"build_test": True, "type_check": True, "lint_test": False, "bundle_size": False})
+
+        self.assertNotIn(("start", "type_check"), self.events)
+        self.assertNotEqual(results["type_check"]["status"], "success")
+
+    def test_type_check_runs_alone_without_a_build_stage(self):
+        self.runner.run_type_check = self.recording("type_check")
+
+        results = self.run_stages({"build_test": False, "type_check": True, "lint_test": False, "bundle_size": False})
+
+        self.assertEqual(results["type_check"]["status"], "success")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for diagnostic cache keys
+
+Run from the repository root with: python -m unittest discover automation/tests
+"""
+
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from diagnostic_cache import PrismDiagnosticCache
+from dependency_graph import PrismDependencyGraph
+from file_index import PrismFileIndex
+
+
+class DiagnosticCacheKeyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.write("tsconfig.json", "{}\n")
+        self.write("src/types/global.d.ts", "declare interface Window { analytics: unknown }\n")
+        self.write("src/app/page.tsx", "export default function Home() { return window.analytics }\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def write(self, path: str, content: str):
+        target = self.root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content, encoding='utf-8')
+
+    def keys(self):
+        index = PrismFileIndex(str(self.root))
+        cache = PrismDiagnosticCache(str(self.root), index, PrismDependencyGraph(str(self.root), index))
+        return {tool: cache.file_key(tool, "src/app/page.tsx") for tool in ("tsc", "eslint")}
+
+    def test_ambient_declaration_change_invalidates_tsc_keys(self):
+        before = self.keys()
+        self.write("src/types/global.d.ts", "declare interface Window { analytics: string }\n")
+        after = self.keys()
+
+        self.assertNotEqual(before["tsc"], after["tsc"])
+        self.assertEqual(before["eslint"], after["eslint"])
+
+    def test_unrelated_source_change_keeps_tsc_key(self):
+        before = self.keys()
+        self.write("src/app/about/page.tsx", "export default function About() { return null }\n")
+
+        self.assertEqual(before["tsc"], self.keys()["tsc"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Timing History for Prism Writing Development Automation
+
+This module keeps a local history of stage durations (build, type check,
+lint, tests, deploy) for every automation run, tagged with the git commit
+they ran against, and turns it into a quality gate. A stage fails the gate
+when it exceeds its configured budget (quality_gates.max_build_time_minutes,
+quality_gates.max_stage_seconds) and is flagged as a regression when it runs
+well above a percentile of its recent durations, so a slow build is caught on
+the commit that introduced it rather than noticed weeks later.
+
+The history is an append-only JSON Lines file, one record per stage run:
+    {"run_id", "timestamp", "commit", "dirty", "mode", "stage",
+     "status", "duration", "cache"}
+"""
+
+import os
+import json
+import math
+import uuid
+import subprocess
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Records kept on disk; older ones are dropped when the file is compacted
+MAX_RECORDS = 5000
+
+DEFAULT_REGRESSION_SETTINGS = {
+    "enabled": True,
+    "window": 20,          # Recent successful runs that form the baseline
+    "percentile": 90,      # Baseline percentile a run is compared against
+    "tolerance": 1.25,     # Allowed factor above the baseline
+    "min_samples": 5,      # No verdict until the baseline has this many runs
+    "min_seconds": 5,      # Ignore slowdowns smaller than this (timer noise)
+    "action": "warn"       # "warn" or "fail"
+}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentile with linear interpolation between the closest ranks"""
+    ordered = sorted(values)
+    if not ordered:
+        raise ValueError("percentile of an empty sequence")
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower, upper = math.floor(rank), math.ceil(rank)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+class PrismTimingHistory:
+    """Per-stage duration history with budget and regression checks"""
+
+    def __init__(self, project_root: str, cache_dir: Optional[str] = None, max_records: int = MAX_RECORDS):
+        self.project_root = Path(project_root).resolve()
+        self.cache_dir = Path(cache_dir) if cache_dir else self.project_root / ".automation_cache"
+        self.history_file = self.cache_dir / "timings.jsonl"
+        self.max_records = max_records
+        self.lock = threading.Lock()
+
+    def git_revision(self) -> Dict:
+        """Current HEAD and whether the working tree has uncommitted changes"""
+        revision = {"commit": None, "dirty": False}
+        try:
+            head = subprocess.run(["git", "rev-parse", "HEAD"], cwd=self.project_root, capture_output=True, text=True)
+            if head.returncode == 0:
+                revision["commit"] = head.stdout.strip()
+            status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                    cwd=self.project_root, capture_output=True, text=True)
+            revision["dirty"] = status.returncode == 0 and bool(status.stdout.strip())
+        except OSError:
+            pass
+        return revision
+
+    def record(self, stage_results: Dict[str, Dict], mode: str = "full", revision: Optional[Dict] = None) -> str:
+        """Append one record per stage result; returns the run id"""
+        revision = revision or self.git_revision()
+        run_id = uuid.uuid4().hex[:12]
+        timestamp = datetime.now().isoformat()
+        lines = []
+        for stage, result in stage_results.items():
+            if "duration" not in result:
+                continue
+            lines.append(json.dumps({
+                "run_id": run_id,
+                "timestamp": timestamp,
+                "commit": revision.get("commit"),
+                "dirty": revision.get("dirty", False),
+                "mode": mode,
+                "stage": stage,
+                "status": result.get("status"),
+                "duration": round(float(result["duration"]), 3),
+                "cache": result.get("cache")
+            }))
+        if not lines:
+            return run_id
+
+        with self.lock:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.history_file, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+            self._compact()
+        return run_id
+
+    def load(self) -> List[Dict]:
+        """Every readable record, oldest first"""
+        records = []
+        try:
+            with open(self.history_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        # A run killed mid-write leaves a partial last line
+                        continue
+        except OSError:
+            pass
+        return records
+
+    def recent(self, stage: str, mode: Optional[str] = None, limit: int = 20,
+               records: Optional[List[Dict]] = None) -> List[float]:
+        """Durations of the last successful, uncached runs of a stage (oldest first)"""
+        durations = [
+            record["duration"] for record in (records if records is not None else self.load())
+            if record.get("stage") == stage
+            and record.get("status") == "success"
+            and record.get("cache") != "hit"
+            and (mode is None or record.get("mode") == mode)
+        ]
+        return durations[-limit:] if limit else durations
+
+    def budgets(self, quality_gates: Dict) -> Dict[str, float]:
+        """Per-stage time budgets in seconds from the quality_gates config"""
+        budgets = {stage: float(seconds) for stage, seconds in (quality_gates.get("max_stage_seconds") or {}).items()
+                   if seconds is not None}
+        if quality_gates.get("max_build_time_minutes") is not None:
+            budgets["build_test"] = float(quality_gates["max_build_time_minutes"]) * 60
+        return budgets
+
+    def check(self, stage_results: Dict[str, Dict], quality_gates: Dict, mode: str = "full",
+              revision: Optional[Dict] = None, labels: Optional[Dict[str, str]] = None) -> Dict:
+        """Compare stage durations against budgets and the recent baseline
+
+        Must run before the results are recorded, so a run is never its own
+        baseline. Returns {"failures": [...], "warnings": [...], "baselines":
+        {stage: {"percentile", "samples"}}}.
+        """
+        settings = dict(DEFAULT_REGRESSION_SETTINGS)
+        settings.update(quality_gates.get("timing_regression") or {})
+        budgets = self.budgets(quality_gates)
+        records = self.load()
+        revision = revision or {}
+        where = ""
+        if revision.get("commit"):
+            where = f" at {revision['commit'][:12]}" + (" with uncommitted changes" if revision.get("dirty") else "")
+
+        gate = {"failures": [], "warnings": [], "baselines": {}}
+        for stage, result in stage_results.items():
+            # Cancelled, skipped and failed runs say nothing about how long the stage takes
+            if result.get("status") != "success" or result.get("cache") == "hit" or "duration" not in result:
+                continue
+            label = (labels or {}).get(stage, stage)
+            duration = float(result["duration"])
+
+            budget = budgets.get(stage)
+            if budget is not None and duration > budget:
+                gate["failures"].append(f"{label} took {duration:.1f}s, over its {budget:.0f}s budget{where}")
+
+            if not settings["enabled"]:
+                continue
+            baseline = self.recent(stage, mode, settings["window"], records)
+            if len(baseline) < settings["min_samples"]:
+                continue
+            threshold = percentile(baseline, settings["percentile"])
+            gate["baselines"][stage] = {"percentile": round(threshold, 3), "samples": len(baseline)}
+            if duration > threshold * settings["tolerance"] and duration - threshold >= settings["min_seconds"]:
+                message = (
+                    f"{label} regressed{where}: {duration:.1f}s vs p{settings['percentile']:g} "
+                    f"{threshold:.1f}s of the last {len(baseline)} {mode} runs (+{(duration / threshold - 1) * 100:.0f}%)"
+                    if threshold > 0 else
+                    f"{label} regressed{where}: {duration:.1f}s vs ~0s in the last {len(baseline)} {mode} runs"
+                )
+                gate["failures" if settings["action"] == "fail" else "warnings"].append(message)
+        return gate
+
+    def check_and_record(self, stage_results: Dict[str, Dict], quality_gates: Dict, mode: str = "full",
+                         labels: Optional[Dict[str, str]] = None) -> Dict:
+        """Gate a run against history, then add it to the history"""
+        revision = self.git_revision()
+        gate = self.check(stage_results, quality_gates, mode, revision, labels)
+        gate["run_id"] = self.record(stage_results, mode, revision)
+        return gate
+
+    def _compact(self):
+        """Rewrite the file with the newest max_records records once it grows past 1.5x that"""
+        try:
+            with open(self.history_file, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except OSError:
+            return
+        if len(lines) <= self.max_records * 3 // 2:
+            return
+        tmp_path = self.history_file.with_name(self.history_file.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(lines[-self.max_records:])
+        os.replace(tmp_path, self.history_file)
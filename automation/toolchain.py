@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Toolchain Resolution for Prism Writing Development Automation
+
+This module finds the project's Node tool executables (tsc, eslint, vercel,
+...) once per session instead of going through `npx` on every call. npx
+re-resolves the package and starts an extra Node process each time, and for
+a tool that is not installed it may download it. Paths are looked up in
+node_modules/.bin first, then on PATH, and cached. `npx` is used only as the
+fallback for tools that are found in neither place. Commands run as argv
+without a shell, so npm and npx themselves are resolved on PATH too: on
+Windows they are npm.cmd and npx.cmd, which cannot be started by bare name.
+"""
+
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+_toolchains: Dict[Path, "PrismToolchain"] = {}
+_toolchains_lock = threading.Lock()
+
+
+class PrismToolchain:
+    """Cached node_modules/.bin (then PATH) lookups for Node tools"""
+
+    def __init__(self, project_root: str):
+        self.project_root = Path(project_root).resolve()
+        self.bin_dir = self.project_root / "node_modules" / ".bin"
+        self.lock = threading.Lock()
+        self.paths: Dict[str, Optional[str]] = {}
+        self.programs: Dict[str, str] = {}
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Absolute path of a tool's executable, or None if it is not installed"""
+        with self.lock:
+            if name not in self.paths:
+                self.paths[name] = self._find(name)
+            return self.paths[name]
+
+    def program(self, name: str) -> str:
+        """PATH lookup for a program such as npm or npx (.cmd on Windows); the bare name if not found"""
+        with self.lock:
+            if name not in self.programs:
+                self.programs[name] = shutil.which(name) or name
+            return self.programs[name]
+
+    def command(self, name: str, *args: str) -> List[str]:
+        """argv for running a tool (npx only when it is not installed)"""
+        path = self.resolve(name)
+        return [path, *args] if path else [self.program("npx"), name, *args]
+
+    def npm(self, *args: str) -> List[str]:
+        """argv for an npm command"""
+        return [self.program("npm"), *args]
+
+    def invalidate(self):
+        """Forget resolved paths (after npm install adds or removes tools)"""
+        with self.lock:
+            self.paths.clear()
+
+    def _find(self, name: str) -> Optional[str]:
+        suffixes = [".cmd", ".exe", ""] if os.name == 'nt' else [""]
+        for suffix in suffixes:
+            candidate = self.bin_dir / f"{name}{suffix}"
+            if candidate.is_file():
+                return str(candidate)
+        return shutil.which(name)
+
+
+def get_toolchain(project_root: str) -> PrismToolchain:
+    """Session-wide toolchain for a project, shared by the runner and the automator"""
+    root = Path(project_root).resolve()
+    with _toolchains_lock:
+        if root not in _toolchains:
+            _toolchains[root] = PrismToolchain(str(root))
+        return _toolchains[root]
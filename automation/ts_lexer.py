@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+TypeScript/TSX Lexer for Prism Writing Development Automation
+
+This module provides a pure-Python, single-pass lexer for TS/TSX/JS/JSX
+sources. It tracks string, template literal, regex, comment and JSX states so
+that brackets inside them are not miscounted, and reports real bracket
+mismatches, unterminated literals and mismatched JSX closing tags with line
+and column. It is meant as a fast structural check for freshly generated
+files; full type checking is still left to tsc. It can also report the spans
+of comments and literal text, so callers can blank them out before matching
+code with regexes.
+"""
+
+import re
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+CODE_TOKEN = re.compile(r'''
+    (?P<ws>\s+)
+  | (?P<word>[A-Za-z_$][\w$]*)
+  | (?P<num>\d[\w.]*|\.\d[\w]*)
+  | (?P<line_comment>//)
+  | (?P<block_comment>/\*)
+  | (?P<quote>['"])
+  | (?P<template>`)
+  | (?P<open>[(\[{])
+  | (?P<close>[)\]}])
+  | (?P<lt><)
+  | (?P<slash>/)
+  | (?P<arrow>=>)
+  | (?P<punct>.)
+''', re.VERBOSE | re.DOTALL)
+
+STRING_BODY = {
+    "'": re.compile(r"(?:\\.|[^'\\\n])*'"),
+    '"': re.compile(r'(?:\\.|[^"\\\n])*"'),
+}
+TEMPLATE_BODY = re.compile(r'(?:\\[\s\S]|[^`\\$]|\$(?!\{))*')
+REGEX_BODY = re.compile(r'(?:\\.|\[(?:\\.|[^\]\\\n])*\]|[^/\\\n\[])+/[A-Za-z]*')
+JSX_NAME = re.compile(r'[A-Za-z_$][\w$.:-]*')
+JSX_TAG_TOKEN = re.compile(r'''
+    (?P<ws>\s+)
+  | (?P<self_close>/>)
+  | (?P<end>>)
+  | (?P<open>\{)
+  | (?P<quote>["'])
+  | (?P<name>[A-Za-z_$][\w$.:-]*)
+  | (?P<equals>=)
+  | (?P<other>.)
+''', re.VERBOSE | re.DOTALL)
+JSX_TEXT = re.compile(r'[^{<]*')
+GENERIC_ARROW = re.compile(r'<\s*[A-Za-z_$][\w$]*\s*(?:,|extends\b)')
+
+# Keywords after which an expression (and so a regex or JSX element) may start
+EXPRESSION_KEYWORDS = {
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'case', 'do', 'else', 'yield', 'await', 'default', 'export'
+}
+
+CLOSERS = {')': '(', ']': '[', '}': '{'}
+BRACE_FRAMES = {'{', 'template_expr', 'jsx_attr_expr', 'jsx_child_expr'}
+
+
+class PrismTSLexer:
+    """Single-pass structural lexer for TS/TSX sources"""
+
+    def __init__(self, jsx: bool = True, record_literals: bool = False):
+        self.jsx = jsx
+        self.record_literals = record_literals
+
+    def scan(self, content: str) -> Dict:
+        """Scan source text and report structural errors"""
+        self.content = content
+        self.newlines = [match.start() for match in re.finditer('\n', content)]
+        self.errors: List[Dict] = []
+        self.stack: List[Dict] = []
+        self.expression_allowed = True
+        self.token_count = 0
+        self.literals: List[Tuple[int, int, str]] = []
+
+        position = 0
+        length = len(content)
+        while position < length:
+            frame = self.stack[-1]["kind"] if self.stack else None
+            if frame == "template":
+                position = self._scan_template(position)
+            elif frame == "jsx_tag":
+                position = self._scan_jsx_tag(position)
+            elif frame == "jsx_children":
+                position = self._scan_jsx_children(position)
+            else:
+                position = self._scan_code(position)
+
+        for frame in reversed(self.stack):
+            self._error(frame["position"], self._unclosed_message(frame))
+
+        result = {
+            "valid": not self.errors,
+            "errors": sorted(self.errors, key=lambda error: (error["line"], error["column"])),
+            "tokens": self.token_count
+        }
+        if self.record_literals:
+            result["literals"] = self.literals
+        return result
+
+    def _scan_code(self, position: int) -> int:
+        """Consume one token in code mode"""
+        match = CODE_TOKEN.match(self.content, position)
+        kind = match.lastgroup
+        end = match.end()
+        self.token_count += 1
+
+        if kind == "ws":
+            return end
+
+        if kind == "word":
+            self.expression_allowed = match.group() in EXPRESSION_KEYWORDS
+        elif kind == "num":
+            self.expression_allowed = False
+        elif kind == "line_comment":
+            newline = self.content.find('\n', end)
+            newline = len(self.content) if newline == -1 else newline
+            self._literal(position, newline, "comment")
+            return newline
+        elif kind == "block_comment":
+            close = self.content.find('*/', end)
+            if close == -1:
+                self._error(position, "Unterminated comment")
+                self._literal(position, len(self.content), "comment")
+                return len(self.content)
+            self._literal(position, close + 2, "comment")
+            return close + 2
+        elif kind == "quote":
+            body = STRING_BODY[match.group()].match(self.content, end)
+            if body is None:
+                self._error(position, "Unterminated string literal")
+                newline = self.content.find('\n', end)
+                return len(self.content) if newline == -1 else newline
+            self._literal(end, body.end() - 1, "string")
+            self.expression_allowed = False
+            return body.end()
+        elif kind == "template":
+            self.stack.append({"kind": "template", "position": position})
+        elif kind == "open":
+            self.stack.append({"kind": match.group(), "position": position})
+            self.expression_allowed = True
+        elif kind == "close":
+            self._close_bracket(match.group(), position)
+        elif kind == "lt":
+            if self.jsx and self.expression_allowed and self._starts_jsx(position):
+                return self._open_jsx_tag(position)
+            self.expression_allowed = True
+        elif kind == "slash":
+            if self.expression_allowed:
+                body = REGEX_BODY.match(self.content, end)
+                if body is not None:
+                    self.expression_allowed = False
+                    return body.end()
+            self.expression_allowed = True
+        else:
+            self.expression_allowed = True
+
+        return end
+
+    def _close_bracket(self, closer: str, position: int):
+        """Pop the frame closed by a bracket, reporting mismatches"""
+        opener = CLOSERS[closer]
+        top = self.stack[-1] if self.stack else None
+
+        if top is not None and (top["kind"] == opener or (closer == '}' and top["kind"] in BRACE_FRAMES)):
+            self.stack.pop()
+            # A closed block may be followed by a statement; a closed (...) or [...] is a value
+            self.expression_allowed = top["kind"] == '{'
+            return
+
+        # Look for a matching opener further down, within the current code context
+        for depth in range(len(self.stack) - 1, -1, -1):
+            kind = self.stack[depth]["kind"]
+            if kind == opener or (closer == '}' and kind in BRACE_FRAMES):
+                for frame in self.stack[depth + 1:]:
+                    self._error(frame["position"], self._unclosed_message(frame))
+                del self.stack[depth:]
+                self.expression_allowed = False
+                return
+            if kind not in ('(', '[', '{'):
+                break
+
+        self._error(position, f"Unexpected '{closer}'")
+
+    def _scan_template(self, position: int) -> int:
+        """Consume template literal text up to the closing backtick or a ${"""
+        body = TEMPLATE_BODY.match(self.content, position)
+        end = body.end()
+        self._literal(position, end, "template")
+        if end >= len(self.content):
+            return end
+        if self.content[end] == '`':
+            self.stack.pop()
+            self.expression_allowed = False
+            return end + 1
+        # "${" opens an embedded expression
+        self.stack.append({"kind": "template_expr", "position": end})
+        self.expression_allowed = True
+        return end + 2
+
+    def _starts_jsx(self, position: int) -> bool:
+        """Decide whether a '<' in expression position opens a JSX element"""
+        following = self.content[position + 1:position + 2]
+        if not following or not (following.isalpha() or following in '_$>'):
+            return False
+        # <T,>() => ... and <T extends X>() => ... are generic arrow functions
+        return GENERIC_ARROW.match(self.content, position) is None
+
+    def _open_jsx_tag(self, position: int) -> int:
+        """Start a JSX opening tag at '<'"""
+        name = JSX_NAME.match(self.content, position + 1)
+        tag = name.group() if name else ""
+        self.stack.append({"kind": "jsx_tag", "position": position, "name": tag})
+        self.token_count += 1
+        return name.end() if name else position + 1
+
+    def _scan_jsx_tag(self, position: int) -> int:
+        """Consume one token inside a JSX opening tag"""
+        match = JSX_TAG_TOKEN.match(self.content, position)
+        kind = match.lastgroup
+        self.token_count += 1
+
+        if kind == "self_close":
+            self._finish_jsx_element()
+        elif kind == "end":
+            frame = self.stack.pop()
+            self.stack.append({"kind": "jsx_children", "position": frame["position"], "name": frame["name"]})
+        elif kind == "open":
+            self.stack.append({"kind": "jsx_attr_expr", "position": position})
+            self.expression_allowed = True
+        elif kind == "quote":
+            close = self.content.find(match.group(), match.end())
+            if close == -1:
+                self._error(position, "Unterminated JSX attribute string")
+                return len(self.content)
+            self._literal(match.end(), close, "string")
+            return close + 1
+        elif kind == "other":
+            self._error(position, f"Unexpected '{match.group()}' in JSX tag <{self.stack[-1]['name']}>")
+
+        return match.end()
+
+    def _scan_jsx_children(self, position: int) -> int:
+        """Consume JSX text, a child expression, or a nested/closing tag"""
+        text = JSX_TEXT.match(self.content, position)
+        end = text.end()
+        self._literal(position, end, "jsx_text")
+        if end >= len(self.content):
+            return end
+        if end > position:
+            return end
+
+        if self.content[position] == '{':
+            self.stack.append({"kind": "jsx_child_expr", "position": position})
+            self.expression_allowed = True
+            return position + 1
+
+        # '<' starts a closing tag, a nested element, or is a stray character
+        if self.content.startswith('</', position):
+            name = JSX_NAME.match(self.content, position + 2)
+            tag = name.group() if name else ""
+            close = self.content.find('>', position)
+            if close == -1:
+                self._error(position, "Unterminated JSX closing tag")
+                return len(self.content)
+
+            frame = self.stack[-1]
+            if tag != frame["name"]:
+                expected = f"</{frame['name']}>" if frame["name"] else "</>"
+                found = f"</{tag}>" if tag else "</>"
+                self._error(position, f"Mismatched JSX closing tag {found}, expected {expected}")
+            self._finish_jsx_element()
+            return close + 1
+
+        if self._starts_jsx(position):
+            return self._open_jsx_tag(position)
+
+        self._error(position, "Unexpected '<' in JSX text")
+        return position + 1
+
+    def _finish_jsx_element(self):
+        """Pop a completed JSX element"""
+        self.stack.pop()
+        # A root element is a complete expression value
+        self.expression_allowed = False
+
+    def _unclosed_message(self, frame: Dict) -> str:
+        """Describe a frame that was never closed"""
+        kind = frame["kind"]
+        if kind in ('(', '[', '{'):
+            return f"Unclosed '{kind}'"
+        if kind == "template":
+            return "Unterminated template literal"
+        if kind == "template_expr":
+            return "Unclosed '${' in template literal"
+        if kind in ("jsx_tag", "jsx_children"):
+            name = frame.get("name") or ""
+            return f"Unclosed JSX element <{name}>"
+        return "Unclosed '{' in JSX expression"
+
+    def _literal(self, start: int, end: int, kind: str):
+        """Remember the span of a comment or of literal text"""
+        if self.record_literals and end > start:
+            self.literals.append((start, end, kind))
+
+    def _error(self, position: int, message: str):
+        """Record an error with 1-based line and column"""
+        line_index = bisect_right(self.newlines, position - 1)
+        line_start = self.newlines[line_index - 1] + 1 if line_index else 0
+        self.errors.append({
+            "line": line_index + 1,
+            "column": position - line_start + 1,
+            "message": message
+        })
+
+
+def scan_source(content: str, file_path: Optional[str] = None, record_literals: bool = False) -> Dict:
+    """Scan a source file; JSX is disabled only for plain .ts and module-script files"""
+    jsx = file_path is None or not file_path.endswith(('.ts', '.mts', '.cts', '.mjs', '.cjs'))
+    return PrismTSLexer(jsx=jsx, record_literals=record_literals).scan(content)
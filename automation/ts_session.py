@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+TypeScript Session for Prism Writing Development Automation
+
+This module keeps one type-checking session alive for the whole automation
+run instead of spawning `npx tsc` per file. When the project's TypeScript is
+installed, a tsserver process is driven over its stdio protocol: files are
+opened once, reloaded from disk when they are checked again, and diagnostics
+come from the already-built program, so a re-check only pays for what
+changed. Without tsserver the session falls back to `tsc --incremental` with
+its .tsbuildinfo persisted under .automation_cache/. Both paths honor
+tsconfig.json.
+"""
+
+import re
+import json
+import atexit
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from toolchain import get_toolchain
+
+TSC_DIAGNOSTIC = re.compile(r'^(?P<file>.+?)\((?P<line>\d+),(?P<column>\d+)\): (?P<category>error|warning) (?P<code>TS\d+): (?P<message>.*)$')
+
+
+class TypeScriptSessionError(RuntimeError):
+    """Raised when the tsserver process fails or stops answering"""
+
+
+class PrismTypeScriptSession:
+    """Long-lived tsserver (or incremental tsc) session for per-file checks"""
+
+    def __init__(self, project_root: str, timeout: float = 60, cache_dir: Optional[str] = None):
+        self.project_root = Path(project_root).resolve()
+        self.timeout = timeout
+        self.cache_dir = Path(cache_dir) if cache_dir else self.project_root / ".automation_cache"
+        self.tsserver_path = self.project_root / "node_modules" / "typescript" / "lib" / "tsserver.js"
+        self.process: Optional[subprocess.Popen] = None
+        self.reader: Optional[threading.Thread] = None
+        self.condition = threading.Condition()
+        self.responses: Dict[int, Dict] = {}
+        self.open_files = set()
+        self.seq = 0
+        self.broken = False
+        atexit.register(self.close)
+
+    @property
+    def mode(self) -> str:
+        """"tsserver" when a server can be used, otherwise "tsc" """
+        if not self.broken and self.tsserver_path.exists() and shutil.which("node"):
+            return "tsserver"
+        return "tsc"
+
+    def check_files(self, file_paths: List[str]) -> Dict[str, Dict[str, List[str]]]:
+        """Type-check project-relative files; returns {path: {"errors": [...], "warnings": [...]}}"""
+        if not file_paths:
+            return {}
+
+        if self.mode == "tsserver":
+            try:
+                return self._check_with_tsserver(file_paths)
+            except TypeScriptSessionError:
+                # A dead or hung server is not retried; incremental tsc still gives correct answers
+                self.broken = True
+                self.close()
+        return self._check_with_tsc(file_paths)
+
+    def close(self):
+        """Shut the tsserver process down"""
+        process, self.process = self.process, None
+        self.open_files.clear()
+        if process is None or process.poll() is not None:
+            return
+        try:
+            self._write(process, {"seq": 0, "type": "request", "command": "exit"})
+            process.wait(timeout=5)
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            process.kill()
+
+    def _check_with_tsserver(self, file_paths: List[str]) -> Dict[str, Dict[str, List[str]]]:
+        self._ensure_server()
+        results = {}
+
+        for file_path in file_paths:
+            full_path = str(self.project_root / file_path)
+            if full_path in self.open_files:
+                # Open files are owned by the client; make the server re-read the disk copy
+                self._request("reload", {"file": full_path, "tmpfile": full_path})
+            else:
+                self._send("open", {"file": full_path, "projectRootPath": str(self.project_root)})
+                self.open_files.add(full_path)
+
+            diagnostics = []
+            for command in ("syntacticDiagnosticsSync", "semanticDiagnosticsSync"):
+                response = self._request(command, {"file": full_path})
+                diagnostics.extend(response.get("body") or [])
+
+            file_result = {"errors": [], "warnings": []}
+            for diagnostic in diagnostics:
+                category = diagnostic.get("category", "error")
+                start = diagnostic.get("start", {})
+                message = (
+                    f"{file_path}({start.get('line', 0)},{start.get('offset', 0)}): "
+                    f"{category} TS{diagnostic.get('code', '')}: {diagnostic.get('text', '')}"
+                )
+                if category == "error":
+                    file_result["errors"].append(message)
+                elif category == "warning":
+                    file_result["warnings"].append(message)
+            results[file_path] = file_result
+
+        return results
+
+    def _check_with_tsc(self, file_paths: List[str]) -> Dict[str, Dict[str, List[str]]]:
+        """One incremental whole-project tsc run, diagnostics filtered to the requested files"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        command = get_toolchain(str(self.project_root)).command(
+            "tsc",
+            "--noEmit", "--pretty", "false",
+            "--incremental", "--tsBuildInfoFile", str(self.cache_dir / "tsc.tsbuildinfo")
+        )
+        if (self.project_root / "tsconfig.json").exists():
+            command += ["-p", "tsconfig.json"]
+
+        process = subprocess.run(command, cwd=self.project_root, capture_output=True, text=True)
+
+        results = {file_path: {"errors": [], "warnings": []} for file_path in file_paths}
+        by_posix_path = {Path(file_path).as_posix(): file_path for file_path in file_paths}
+        matched = False
+        for line in process.stdout.splitlines():
+            match = TSC_DIAGNOSTIC.match(line.strip())
+            if not match:
+                continue
+            matched = True
+            path = by_posix_path.get(Path(match.group("file")).as_posix())
+            if path is not None:
+                results[path][f"{match.group('category')}s"].append(line.strip())
+
+        if process.returncode != 0 and not matched:
+            # tsc itself failed (missing compiler, bad tsconfig): report it against every file
+            message = process.stderr.strip() or process.stdout.strip() or f"tsc exited with {process.returncode}"
+            for file_result in results.values():
+                file_result["errors"].append(message)
+        return results
+
+    def _ensure_server(self):
+        if self.process is not None and self.process.poll() is None:
+            return
+
+        self.open_files.clear()
+        self.responses.clear()
+        try:
+            self.process = subprocess.Popen(
+                ["node", str(self.tsserver_path), "--disableAutomaticTypingAcquisition", "--suppressDiagnosticEvents"],
+                cwd=self.project_root,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+        except OSError as e:
+            raise TypeScriptSessionError(f"Could not start tsserver: {e}")
+
+        self.reader = threading.Thread(target=self._read_messages, args=(self.process,), daemon=True)
+        self.reader.start()
+        self._send("configure", {"preferences": {}, "hostInfo": "prism-automation"})
+
+    def _read_messages(self, process: subprocess.Popen):
+        """Parse Content-Length framed messages and hand responses to waiting requests"""
+        stream = process.stdout
+        while True:
+            header = stream.readline()
+            if not header:
+                break
+            if not header.startswith(b"Content-Length:"):
+                continue
+            length = int(header.split(b":", 1)[1])
+            stream.readline()  # blank line between header and body
+            body = stream.read(length)
+            try:
+                message = json.loads(body)
+            except ValueError:
+                continue
+            if message.get("type") == "response":
+                with self.condition:
+                    self.responses[message.get("request_seq")] = message
+                    self.condition.notify_all()
+
+        with self.condition:
+            self.condition.notify_all()
+
+    def _send(self, command: str, arguments: Dict) -> int:
+        self.seq += 1
+        try:
+            self._write(self.process, {"seq": self.seq, "type": "request", "command": command, "arguments": arguments})
+        except (OSError, ValueError) as e:
+            raise TypeScriptSessionError(f"tsserver is not accepting requests: {e}")
+        return self.seq
+
+    def _request(self, command: str, arguments: Dict) -> Dict:
+        """Send a request and wait for its response"""
+        seq = self._send(command, arguments)
+        with self.condition:
+            answered = self.condition.wait_for(
+                lambda: seq in self.responses or self.process is None or self.process.poll() is not None,
+                timeout=self.timeout
+            )
+            response = self.responses.pop(seq, None)
+
+        if response is None:
+            raise TypeScriptSessionError(f"tsserver did not answer '{command}'" if answered else f"tsserver timed out on '{command}'")
+        if not response.get("success", False):
+            raise TypeScriptSessionError(f"tsserver '{command}' failed: {response.get('message', 'unknown error')}")
+        return response
+
+    def _write(self, process: subprocess.Popen, message: Dict):
+        process.stdin.write((json.dumps(message) + "\n").encode('utf-8'))
+        process.stdin.flush()